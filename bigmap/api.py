@@ -8,6 +8,8 @@ well-documented interface for programmatic access to all features.
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union, Any
 import logging
+import os
+import re
 
 import numpy as np
 import xarray as xr
@@ -23,6 +25,21 @@ from .core.calculations import registry
 
 logger = logging.getLogger(__name__)
 
+_SPECIES_CODE_RE = re.compile(r'(\d{4})')
+
+
+def _parse_species_filename(filename: str) -> Tuple[str, str]:
+    """Parse the species code and display name from a raster filename stem."""
+    # Look for 4-digit species code
+    match = _SPECIES_CODE_RE.search(filename)
+    if match is None:
+        return filename[:4], filename.title()
+    
+    code = match.group(1)
+    # Name follows the code
+    name = filename.split(code)[1].strip('_- ').replace('_', ' ')
+    return code, name.title()
+
 
 class CalculationResult(BaseModel):
     """Result from a calculation operation."""
@@ -84,6 +101,7 @@ class BigMapAPI:
             self.settings = load_settings(Path(config))
         else:
             self.settings = config
+        self.settings.ensure_directories()
             
         self._rest_client = None
         self._processor = None
@@ -236,8 +254,8 @@ class BigMapAPI:
         output_path: Union[str, Path],
         species_codes: Optional[List[str]] = None,
         chunk_size: Tuple[int, int, int] = (1, 1000, 1000),
-        compression: str = "lz4",
-        compression_level: int = 5,
+        compression: str = "zstd",
+        compression_level: int = 3,
         include_total: bool = True
     ) -> Path:
         """
@@ -253,9 +271,9 @@ class BigMapAPI:
             Specific species codes to include.
         chunk_size : Tuple[int, int, int], default=(1, 1000, 1000)
             Chunk dimensions (species, height, width).
-        compression : str, default="lz4"
-            Compression algorithm.
-        compression_level : int, default=5
+        compression : str, default="zstd"
+            Blosc compression algorithm (bitshuffled).
+        compression_level : int, default=3
             Compression level (1-9).
         include_total : bool, default=True
             Whether to include or calculate total biomass.
@@ -281,8 +299,11 @@ class BigMapAPI:
         if not input_dir.exists():
             raise ValueError(f"Input directory does not exist: {input_dir}")
         
-        # Find GeoTIFF files
-        tiff_files = list(input_dir.glob("*.tif")) + list(input_dir.glob("*.tiff"))
+        # Find GeoTIFF files in a single directory scan
+        tiff_files = [
+            Path(entry.path) for entry in os.scandir(input_dir)
+            if entry.name.endswith(('.tif', '.tiff')) and entry.is_file()
+        ]
         
         if not tiff_files:
             raise ValueError(f"No GeoTIFF files found in {input_dir}")
@@ -306,26 +327,13 @@ class BigMapAPI:
         tiff_files.sort()
         
         # Extract species information from filenames
-        import re
         file_species_codes = []
         file_species_names = []
         
         for f in tiff_files:
-            filename = f.stem
-            code = None
-            name = filename
-            
-            # Look for 4-digit species code
-            match = re.search(r'(\d{4})', filename)
-            if match:
-                code = match.group(1)
-                # Try to extract name after code
-                parts = filename.split(code)
-                if len(parts) > 1:
-                    name = parts[1].strip('_- ').replace('_', ' ')
-            
-            file_species_codes.append(code or filename[:4])
-            file_species_names.append(name.title())
+            code, name = _parse_species_filename(f.stem)
+            file_species_codes.append(code)
+            file_species_names.append(name)
         
         # Create the Zarr store
         create_zarr_from_geotiffs(
@@ -8,6 +8,7 @@ for the BigMap package, demonstrating best practices with Pydantic.
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 
+import numpy as np
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -29,7 +30,7 @@ class VisualizationConfig(BaseModel):
         description="Default figure size in inches (width, height)"
     )
     color_maps: dict = Field(
-        default={
+        default_factory=lambda: {
             "biomass": "viridis",
             "diversity": "plasma",
             "richness": "Spectral_r"
@@ -49,7 +50,7 @@ class ProcessingConfig(BaseModel):
     
     max_workers: Optional[int] = Field(
         default=None,
-        description="Maximum number of worker processes (None = auto-detect)"
+        description="Maximum number of parallel workers (None = auto-detect)"
     )
     memory_limit_gb: float = Field(
         default=8.0,
@@ -92,6 +93,36 @@ class CalculationConfig(BaseModel):
         default=None,
         description="Custom output filename (if None, uses calculation name)"
     )
+    output_dtype: Optional[str] = Field(
+        default=None,
+        description="Integer dtype to quantize GeoTIFF/NetCDF output to, e.g. 'int16' (None = native dtype)"
+    )
+    scale_factor: float = Field(
+        default=1.0,
+        gt=0,
+        description="Quantization step: value = stored * scale_factor + add_offset"
+    )
+    add_offset: float = Field(
+        default=0.0,
+        description="Quantization offset: value = stored * scale_factor + add_offset"
+    )
+    nodata: Optional[float] = Field(
+        default=None,
+        description="Stored value for missing data when quantized (None = dtype min for signed, max for unsigned)"
+    )
+    
+    @field_validator('output_dtype')
+    @classmethod
+    def validate_output_dtype(cls, v):
+        """Ensure the quantized dtype is an integer type."""
+        if v is not None:
+            try:
+                dtype = np.dtype(v)
+            except TypeError:
+                raise ValueError(f"Unknown output dtype: {v}")
+            if dtype.kind not in 'iu':
+                raise ValueError(f"Output dtype must be an integer type, got {v}")
+        return v
 
 
 
@@ -154,21 +185,25 @@ class BigMapSettings(BaseSettings):
         extra="ignore"             # Ignore extra fields in config files
     )
     
-    @field_validator('data_dir', 'output_dir', 'cache_dir')
-    @classmethod
-    def ensure_directories_exist(cls, v):
-        """Ensure directories exist."""
-        v = Path(v)
-        v.mkdir(parents=True, exist_ok=True)
-        return v
+    def ensure_directories(self) -> None:
+        """
+        Create the data, output and cache directories.
+        
+        Directories are not created on construction, so importing BigMap
+        (which builds the module-level ``settings``) does not touch the
+        filesystem; ``load_settings`` and ``BigMapAPI`` call this instead.
+        """
+        for directory in (self.data_dir, self.output_dir, self.cache_dir):
+            directory.mkdir(parents=True, exist_ok=True)
     
     def get_output_path(self, filename: str) -> Path:
         """Get full output path for a filename."""
         return self.output_dir / filename
     
     def get_temp_path(self, filename: str) -> Path:
-        """Get temporary file path."""
+        """Get temporary file path, creating its directory if needed."""
         temp_dir = self.processing.temp_dir or self.cache_dir
+        temp_dir.mkdir(parents=True, exist_ok=True)
         return temp_dir / filename
 
 
@@ -198,10 +233,13 @@ def load_settings(config_file: Optional[Path] = None) -> BigMapSettings:
                 config_data = yaml.safe_load(f)
             else:
                 config_data = json.load(f)
-        return BigMapSettings(**config_data)
+        settings_obj = BigMapSettings(**config_data)
     else:
         # Load from environment/defaults
-        return BigMapSettings()
+        settings_obj = BigMapSettings()
+    
+    settings_obj.ensure_directories()
+    return settings_obj
 
 
 def save_settings(settings_obj: BigMapSettings, config_file: Path) -> None:
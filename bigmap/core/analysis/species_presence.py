@@ -71,91 +71,89 @@ def analyze_species_presence(
         return
     
     zarr_array = zarr.open_array(zarr_path, mode='r')
-    species_codes = zarr_array.attrs['species_codes']
-    species_names = zarr_array.attrs['species_names']
+    attrs = dict(zarr_array.attrs)
+    species_codes = attrs['species_codes']
+    species_names = attrs['species_names']
     
     print(f"📊 Total species in zarr: {len(species_codes)}")
     print(f"📊 Zarr shape: {zarr_array.shape}")
     print(f"📊 Total pixels per species: {zarr_array.shape[1] * zarr_array.shape[2]:,}")
     print()
     
-    # Analyze each species
-    species_with_data = []
-    species_without_data = []
+    # Per-species reductions, filled one layer at a time
+    n_species = len(species_codes)
+    total_pixels = zarr_array.shape[1] * zarr_array.shape[2]
+    pixel_counts = np.zeros(n_species, dtype=np.int64)
+    positive_counts = np.zeros(n_species, dtype=np.int64)
+    biomass_sums = np.zeros(n_species, dtype=np.float64)
+    biomass_maxes = np.zeros(n_species, dtype=np.float64)
     
     print("🔍 Analyzing each species layer...")
-    print("="*80)
+    print()
     
-    for i, (code, name) in enumerate(zip(species_codes, species_names)):
-        print(f"Processing {i+1}/{len(species_codes)}: {code}", end=" ... ")
-        
-        # Load species data
-        data = zarr_array[i]
-        
-        # Calculate statistics
-        nonzero_pixels = np.count_nonzero(data > biomass_threshold)
-        total_pixels = data.size
-        coverage_pct = (nonzero_pixels / total_pixels) * 100
-        
-        if nonzero_pixels > 0:
-            # Calculate additional stats for species with data
-            nonzero_data = data[data > 0]
-            mean_biomass = nonzero_data.mean()
-            max_biomass = nonzero_data.max()
+    # Stream each layer in chunk-aligned row bands so memory stays bounded
+    # by one band rather than a full layer
+    band_height = zarr_array.chunks[1]
+    for i in range(n_species):
+        for r0 in range(0, zarr_array.shape[1], band_height):
+            data = zarr_array[i, r0:r0 + band_height]
+            positive = data > 0
+            n_positive = np.count_nonzero(positive)
             
-            species_with_data.append({
-                'index': i,
-                'code': code,
-                'name': name,
-                'pixels': nonzero_pixels,
-                'coverage_pct': coverage_pct,
-                'mean_biomass': mean_biomass,
-                'max_biomass': max_biomass
-            })
-            print(f"✅ {nonzero_pixels:,} pixels ({coverage_pct:.3f}%)")
-        else:
-            species_without_data.append({
-                'index': i,
-                'code': code,
-                'name': name
-            })
-            print("❌ No data")
-    
-    print("="*80)
-    print()
+            # The default zero threshold is the positive mask already counted
+            if biomass_threshold == 0:
+                pixel_counts[i] += n_positive
+            else:
+                pixel_counts[i] += np.count_nonzero(data > biomass_threshold)
+            if n_positive > 0:
+                positive_counts[i] += n_positive
+                biomass_sums[i] += np.sum(data, where=positive, dtype=np.float64)
+                biomass_maxes[i] = max(biomass_maxes[i], data.max())
+    
+    # Rank species with data by coverage (stable, so ties keep zarr order)
+    codes_np = np.asarray(species_codes)
+    names_np = np.asarray(species_names)
+    coverage_pct = pixel_counts / total_pixels * 100
+    mean_biomass = np.divide(biomass_sums, positive_counts,
+                             out=np.zeros(n_species), where=positive_counts > 0)
+    has_data = pixel_counts > 0
+    order = np.argsort(-coverage_pct, kind='stable')
+    ranked = order[has_data[order]]
+    missing = np.flatnonzero(~has_data)
     
     # Summary statistics
     print("📈 SUMMARY STATISTICS")
     print("="*50)
-    print(f"Species with biomass data: {len(species_with_data):2d} ({len(species_with_data)/len(species_codes)*100:.1f}%)")
-    print(f"Species without data:      {len(species_without_data):2d} ({len(species_without_data)/len(species_codes)*100:.1f}%)")
+    print(f"Species with biomass data: {len(ranked):2d} ({len(ranked)/n_species*100:.1f}%)")
+    print(f"Species without data:      {len(missing):2d} ({len(missing)/n_species*100:.1f}%)")
     print()
     
     # Species WITH data (sorted by coverage)
-    if species_with_data:
+    if len(ranked):
         print("🌲 SPECIES WITH BIOMASS DATA IN NORTH CAROLINA")
         print("="*80)
-        species_with_data.sort(key=lambda x: x['coverage_pct'], reverse=True)
         
         print(f"{'#':>2} {'Code':>8} {'Coverage':>10} {'Pixels':>12} {'Mean':>8} {'Max':>8} Species Name")
         print("-" * 80)
-        
-        for i, species in enumerate(species_with_data, 1):
-            print(f"{i:2d} {species['code']:>8} {species['coverage_pct']:>9.3f}% "
-                  f"{species['pixels']:>11,} {species['mean_biomass']:>7.1f} "
-                  f"{species['max_biomass']:>7.1f} {species['name']}")
+        print("\n".join(
+            f"{rank:2d} {codes_np[i]:>8} {coverage_pct[i]:>9.3f}% "
+            f"{pixel_counts[i]:>11,} {mean_biomass[i]:>7.1f} "
+            f"{biomass_maxes[i]:>7.1f} {names_np[i]}"
+            for rank, i in enumerate(ranked, 1)
+        ))
     
     print()
     
     # Species WITHOUT data
-    if species_without_data:
+    if len(missing):
         print("🚫 SPECIES WITHOUT BIOMASS DATA IN NORTH CAROLINA")
         print("="*80)
         print("These species likely don't naturally occur in North Carolina:")
         print()
-        
-        for i, species in enumerate(species_without_data, 1):
-            print(f"{i:2d}. {species['code']}: {species['name']}")
+        print("\n".join(
+            f"{rank:2d}. {codes_np[i]}: {names_np[i]}"
+            for rank, i in enumerate(missing, 1)
+        ))
     
     print()
     
@@ -164,53 +162,54 @@ def analyze_species_presence(
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Save species with data to CSV
-    if species_with_data:
+    if len(ranked):
         import csv
         csv_path = output_path / "species_presence_analysis.csv"
         
         with open(csv_path, 'w', newline='') as csvfile:
-            fieldnames = ['rank', 'species_code', 'species_name', 'coverage_pct', 
-                         'pixels_with_biomass', 'mean_biomass', 'max_biomass']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for i, species in enumerate(species_with_data, 1):
-                writer.writerow({
-                    'rank': i,
-                    'species_code': species['code'],
-                    'species_name': species['name'],
-                    'coverage_pct': species['coverage_pct'],
-                    'pixels_with_biomass': species['pixels'],
-                    'mean_biomass': species['mean_biomass'],
-                    'max_biomass': species['max_biomass']
-                })
+            writer = csv.writer(csvfile)
+            writer.writerow(['rank', 'species_code', 'species_name', 'coverage_pct',
+                             'pixels_with_biomass', 'mean_biomass', 'max_biomass'])
+            writer.writerows(
+                (rank, codes_np[i], names_np[i], coverage_pct[i],
+                 pixel_counts[i], mean_biomass[i], biomass_maxes[i])
+                for rank, i in enumerate(ranked, 1)
+            )
         
         print(f"💾 Results saved to: {csv_path}")
     
     # Top species by coverage
-    if len(species_with_data) > 0:
+    if len(ranked) > 0:
         print("🏆 TOP 10 SPECIES BY COVERAGE")
         print("="*50)
-        for i, species in enumerate(species_with_data[:10], 1):
-            print(f"{i:2d}. {species['name']} ({species['code']}) - {species['coverage_pct']:.3f}%")
+        print("\n".join(
+            f"{rank:2d}. {names_np[i]} ({codes_np[i]}) - {coverage_pct[i]:.3f}%"
+            for rank, i in enumerate(ranked[:10], 1)
+        ))
     
     # Summary for next steps
     print()
     print("🎯 NEXT STEPS")
     print("="*30)
-    print(f"• Use species indices 0-{len(species_with_data)-1} for analysis of NC forest species")
-    print(f"• Total forest coverage: {species_with_data[0]['coverage_pct']:.1f}% of NC land area")
-    print(f"• Most common species: {species_with_data[1]['name']} ({species_with_data[1]['coverage_pct']:.3f}%)")
+    print(f"• Use species indices 0-{len(ranked)-1} for analysis of NC forest species")
+    print(f"• Total forest coverage: {coverage_pct[ranked[0]]:.1f}% of NC land area")
+    print(f"• Most common species: {names_np[ranked[1]]} ({coverage_pct[ranked[1]]:.3f}%)")
     print(f"• Zarr file size: {get_folder_size(zarr_path):.1f} MB")
 
 def get_folder_size(folder_path):
     """Calculate total size of folder in MB."""
     import os
     total_size = 0
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        for filename in filenames:
-            filepath = os.path.join(dirpath, filename)
-            total_size += os.path.getsize(filepath)
+    stack = [folder_path]
+    # scandir entries carry cached stat data, avoiding a path join and extra
+    # syscall per chunk file
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total_size += entry.stat(follow_symlinks=False).st_size
     return total_size / (1024 * 1024)
 
 if __name__ == "__main__":
@@ -42,6 +42,9 @@ from .registry import (
     list_calculations
 )
 
+# Ahead-of-time compilation of the optional Numba kernels
+from ._kernels import precompile
+
 __all__ = [
     # Base class
     'ForestCalculation',
@@ -73,4 +76,7 @@ __all__ = [
     'register_calculation',
     'get_calculation',
     'list_calculations',
+    
+    # Kernels
+    'precompile',
 ]
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""
+Compiled per-pixel reduction kernels for forest calculations.
+
+These kernels implement the hot reductions (total biomass, species count,
+Shannon and Simpson indices) as explicit loops compiled with Numba. Each
+kernel writes into a caller-provided 2D ``out`` array without NumPy
+temporaries and releases the GIL, so the processor's tile threads run them
+concurrently. ``fused_reductions`` computes any combination of them in a
+single pass so a chunk is swept once rather than once per calculation.
+
+The kernels are serial on purpose and never use ``parallel=True`` or
+``prange``. Callers run them from ``ThreadPoolExecutor`` workers (the
+processor's tiles, the statistics chunks in ``bigmap.examples``), and nested
+Numba parallel regions entered from several threads can deadlock under the
+TBB threading layer. Concurrency comes from those threads, which is why every
+kernel is compiled with ``nogil=True``. ``fastmath`` is also left off so
+results match the NumPy fallbacks.
+
+Numba is optional (``pip install bigmap[fast]``). When it is not installed
+``HAS_NUMBA`` is False and calculations fall back to their NumPy code paths.
+
+Kernels are cached on disk after their first compilation. ``precompile``
+(exported as ``bigmap.core.calculations.precompile``) fills that cache ahead
+of time for the signatures the processor dispatches, so a container or
+deployment image built with::
+
+    python -c "from bigmap.core.calculations import precompile; precompile()"
+
+starts processing without a JIT stall on the first chunk. Set
+``NUMBA_CACHE_DIR`` when the installed package directory is read-only.
+"""
+
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.debug("numba not available, using NumPy calculation kernels")
+
+
+if HAS_NUMBA:
+
+    @njit(nogil=True, cache=True)
+    def total_biomass(species_data, out):
+        """Sum biomass across the species axis."""
+        n_species, height, width = species_data.shape
+        for i in range(height):
+            for j in range(width):
+                total = 0.0
+                for s in range(n_species):
+                    total += species_data[s, i, j]
+                out[i, j] = total
+        return out
+
+    @njit(nogil=True, cache=True)
+    def species_count(species_data, threshold, out):
+        """Count species with biomass above ``threshold``."""
+        n_species, height, width = species_data.shape
+        for i in range(height):
+            for j in range(width):
+                count = 0
+                for s in range(n_species):
+                    if species_data[s, i, j] > threshold:
+                        count += 1
+                out[i, j] = count
+        return out
+
+    @njit(nogil=True, cache=True)
+    def shannon(species_data, log_scale, out):
+        """
+        Shannon index -sum(p * log(p)) per pixel.
+
+        ``log_scale`` converts the natural log to another base
+        (1 / ln(2) for bits).
+        """
+        n_species, height, width = species_data.shape
+        for i in range(height):
+            for j in range(width):
+                total = 0.0
+                for s in range(n_species):
+                    total += species_data[s, i, j]
+                h = 0.0
+                if total > 0:
+                    for s in range(n_species):
+                        value = species_data[s, i, j]
+                        if value > 0:
+                            p = value / total
+                            h -= p * math.log(p)
+                out[i, j] = h * log_scale
+        return out
+
+    @njit(nogil=True, cache=True)
+    def simpson(species_data, inverse, out):
+        """Simpson index sum(p^2) per pixel, or its inverse."""
+        n_species, height, width = species_data.shape
+        for i in range(height):
+            for j in range(width):
+                total = 0.0
+                for s in range(n_species):
+                    total += species_data[s, i, j]
+                d = 0.0
+                if total > 0:
+                    for s in range(n_species):
+                        p = species_data[s, i, j] / total
+                        d += p * p
+                if inverse:
+                    out[i, j] = 1.0 / d if d > 0 else 1.0
+                else:
+                    out[i, j] = d
+        return out
+
+    @njit(nogil=True, cache=True)
+    def fused_reductions(species_data, threshold, log_scale, inverse,
+                         total_out, count_out, shannon_out, simpson_out, evenness_out):
+        """
+        Compute every requested reduction in one pass over the chunk.
+
+        Outputs that are not wanted are passed as empty (0, 0) arrays.
+        Evenness uses the natural-log Shannon index and a zero presence
+        threshold, matching ``Evenness.calculate``.
+        """
+        n_species, height, width = species_data.shape
+        want_total = total_out.size > 0
+        want_count = count_out.size > 0
+        want_shannon = shannon_out.size > 0
+        want_simpson = simpson_out.size > 0
+        want_evenness = evenness_out.size > 0
+        for i in range(height):
+            for j in range(width):
+                total = 0.0
+                for s in range(n_species):
+                    total += species_data[s, i, j]
+                count = 0
+                present = 0
+                h = 0.0
+                d = 0.0
+                for s in range(n_species):
+                    value = species_data[s, i, j]
+                    if value > threshold:
+                        count += 1
+                    if value > 0:
+                        present += 1
+                    if total > 0:
+                        p = value / total
+                        d += p * p
+                        if value > 0:
+                            h -= p * math.log(p)
+                if want_total:
+                    total_out[i, j] = total
+                if want_count:
+                    count_out[i, j] = count
+                if want_shannon:
+                    shannon_out[i, j] = h * log_scale
+                if want_simpson:
+                    if inverse:
+                        simpson_out[i, j] = 1.0 / d if d > 0 else 1.0
+                    else:
+                        simpson_out[i, j] = d
+                if want_evenness:
+                    evenness_out[i, j] = h / math.log(present) if present > 1 else 0.0
+        return total_out
+
+    @njit(nogil=True, cache=True)
+    def block_stats(block):
+        """
+        Summarize a (layers, y, x) block with total biomass in layer 0.
+
+        Returns forest pixel count, forest biomass sum, total biomass sum,
+        maximum biomass, forest richness sum and maximum richness, from one
+        pass over the block without mask temporaries.
+        """
+        n_layers, height, width = block.shape
+        n_forest = 0
+        forest_sum = 0.0
+        total_sum = 0.0
+        max_biomass = -np.inf
+        richness_sum = 0
+        max_richness = 0
+        for i in range(height):
+            for j in range(width):
+                value = block[0, i, j]
+                total_sum += value
+                if value > max_biomass:
+                    max_biomass = value
+                richness = 0
+                for s in range(1, n_layers):
+                    if block[s, i, j] > 0:
+                        richness += 1
+                if richness > max_richness:
+                    max_richness = richness
+                if value > 0:
+                    n_forest += 1
+                    forest_sum += value
+                    richness_sum += richness
+        return n_forest, forest_sum, total_sum, max_biomass, richness_sum, max_richness
+
+
+def precompile(dtypes=(np.float32, np.float64)) -> bool:
+    """
+    Compile every kernel for the signatures the processor dispatches.
+    
+    The processor casts chunks to at least float32, so inputs are C-ordered
+    float32 or float64 arrays. The single-calculation kernels write into
+    float32/uint8 tile views of the result arrays, which are contiguous
+    only for full-width tiles, so both layouts are compiled; the fused
+    kernel always gets contiguous outputs. Compiled code is written to
+    Numba's on-disk cache, so later processes load native code instead of
+    compiling it.
+    
+    Parameters
+    ----------
+    dtypes : tuple of numpy dtypes, default=(float32, float64)
+        Input dtypes to compile for
+    
+    Returns
+    -------
+    bool
+        True if the kernels were compiled, False if numba is not installed
+    """
+    if not HAS_NUMBA:
+        return False
+    
+    # (2, 2) outputs sliced from wider arrays are strided ('A' layout)
+    biomass_outs = (np.empty((2, 2), dtype=np.float32), np.empty((2, 4), dtype=np.float32)[:, :2])
+    count_outs = (np.empty((2, 2), dtype=np.uint8), np.empty((2, 4), dtype=np.uint8)[:, :2])
+    
+    for dtype in dtypes:
+        species_data = np.zeros((2, 2, 2), dtype=dtype)
+        for biomass_out, count_out in zip(biomass_outs, count_outs):
+            total_biomass(species_data, biomass_out)
+            species_count(species_data, 0.0, count_out)
+            shannon(species_data, 1.0, biomass_out)
+            simpson(species_data, True, biomass_out)
+        # Unwanted fused outputs are empty arrays, which are also C-ordered
+        biomass_out, count_out = biomass_outs[0], count_outs[0]
+        fused_reductions(species_data, 0.0, 1.0, True,
+                         biomass_out, count_out, biomass_out, biomass_out, biomass_out)
+        block_stats(species_data)
+    return True
@@ -6,7 +6,7 @@ for all forest metric calculations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Hashable, Optional
 import numpy as np
 import logging
 
@@ -46,7 +46,9 @@ class ForestCalculation(ABC):
         biomass_data : np.ndarray
             3D array (species, height, width) of biomass values
         **kwargs : dict
-            Additional calculation parameters
+            Additional calculation parameters. ``out`` may carry a
+            preallocated 2D array of ``get_output_dtype()``; calculations
+            that support it write their result there and return it.
             
         Returns
         -------
@@ -86,6 +88,16 @@ class ForestCalculation(ABC):
         """Get appropriate numpy dtype for output."""
         return np.float32
     
+    def get_input_dtype(self) -> Optional[np.dtype]:
+        """
+        Get the minimum numpy dtype this calculation wants its input in.
+        
+        The processor casts each chunk once to a dtype that satisfies every
+        calculation, rather than each calculation casting on its own.
+        None means any input dtype is fine.
+        """
+        return None
+    
     def preprocess_data(self, biomass_data: np.ndarray) -> np.ndarray:
         """
         Preprocess data before calculation.
@@ -94,6 +106,20 @@ class ForestCalculation(ABC):
         """
         return biomass_data
     
+    def get_preprocessing_key(self) -> Optional[Hashable]:
+        """
+        Get a key identifying what ``preprocess_data`` does to a chunk.
+        
+        Calculations returning the same key share one preprocessed copy of
+        each chunk. Subclasses overriding ``preprocess_data`` should return a
+        descriptive key (e.g. ``'float32_nan_to_zero'``) to opt in; the
+        default of None for overridden preprocessing means it always runs
+        separately.
+        """
+        if type(self).preprocess_data is ForestCalculation.preprocess_data:
+            return 'identity'
+        return None
+    
     def postprocess_result(self, result: np.ndarray) -> np.ndarray:
         """
         Postprocess calculation result.
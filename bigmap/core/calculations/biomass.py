@@ -9,6 +9,7 @@ import numpy as np
 import logging
 from typing import Optional, List, Dict, Any
 
+from . import _kernels
 from .base import ForestCalculation
 
 logger = logging.getLogger(__name__)
@@ -40,15 +41,26 @@ class TotalBiomass(ForestCalculation):
         
         if exclude_total and biomass_data.shape[0] > 1:
             # Sum only individual species layers (exclude pre-calculated total)
-            return np.sum(biomass_data[1:], axis=0)
+            species_data = biomass_data[1:]
         else:
             # Sum all layers or use single layer
             if biomass_data.shape[0] == 1:
                 return biomass_data[0]
-            return np.sum(biomass_data, axis=0)
+            species_data = biomass_data
+        
+        out = kwargs.get('out')
+        if _kernels.HAS_NUMBA and species_data.dtype.kind == 'f':
+            if out is None:
+                out = np.empty(species_data.shape[1:], dtype=species_data.dtype)
+            return _kernels.total_biomass(species_data, out)
+        
+        return np.sum(species_data, axis=0, out=out)
     
     def validate_data(self, biomass_data: np.ndarray) -> bool:
         return biomass_data.ndim == 3 and biomass_data.shape[0] > 0
+    
+    def get_input_dtype(self) -> np.dtype:
+        return np.float32
 
 
 class TotalBiomassComparison(ForestCalculation):
@@ -133,8 +145,8 @@ class SpeciesProportion(ForestCalculation):
         
         # Calculate proportion
         proportion = np.zeros_like(species_biomass)
-        mask = total_biomass > 0
-        proportion[mask] = species_biomass[mask] / total_biomass[mask]
+        np.divide(species_biomass, total_biomass, out=proportion,
+                  where=total_biomass > 0, casting='unsafe')
         
         return proportion
     
@@ -211,8 +223,8 @@ class SpeciesGroupProportion(ForestCalculation):
         
         # Calculate proportion
         proportion = np.zeros_like(group_biomass)
-        mask = total_biomass > 0
-        proportion[mask] = group_biomass[mask] / total_biomass[mask]
+        np.divide(group_biomass, total_biomass, out=proportion,
+                  where=total_biomass > 0, casting='unsafe')
         
         return proportion
     
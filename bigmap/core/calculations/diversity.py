@@ -9,6 +9,7 @@ import numpy as np
 import logging
 from typing import Optional
 
+from . import _kernels
 from .base import ForestCalculation
 
 logger = logging.getLogger(__name__)
@@ -44,10 +45,20 @@ class SpeciesRichness(ForestCalculation):
         
         if exclude_total and biomass_data.shape[0] > 1:
             # Exclude first layer (pre-calculated total) and count individual species
-            return np.count_nonzero(biomass_data[1:] > threshold, axis=0)
+            species_data = biomass_data[1:]
         else:
             # Count all layers
-            return np.count_nonzero(biomass_data > threshold, axis=0)
+            species_data = biomass_data
+
+        out = kwargs.get('out')
+        if out is None:
+            out = np.empty(species_data.shape[1:], dtype=np.uint8)
+        
+        if _kernels.HAS_NUMBA:
+            return _kernels.species_count(species_data, threshold, out)
+
+        # Accumulate straight into uint8 rather than an intp count array
+        return np.add.reduce(species_data > threshold, axis=0, dtype=np.uint8, out=out)
     
     def validate_data(self, biomass_data: np.ndarray) -> bool:
         return biomass_data.ndim == 3 and biomass_data.shape[0] > 0
@@ -94,6 +105,13 @@ class ShannonDiversity(ForestCalculation):
         else:
             species_data = biomass_data
         
+        if _kernels.HAS_NUMBA:
+            log_scale = 1.0 / np.log(2.0) if base == '2' else 1.0
+            out = kwargs.get('out')
+            if out is None:
+                out = np.empty(species_data.shape[1:], dtype=np.float32)
+            return _kernels.shannon(species_data, log_scale, out)
+        
         # Calculate total biomass per pixel
         total_biomass = np.sum(species_data, axis=0)
         
@@ -105,9 +123,11 @@ class ShannonDiversity(ForestCalculation):
         valid_mask = total_biomass > 0
         
         if np.any(valid_mask):
-            # Calculate proportions for valid pixels
+            # Calculate proportions in one pass, broadcasting the pixel mask
+            # across the species axis
             proportions = np.zeros_like(species_data, dtype=np.float32)
-            proportions[:, valid_mask] = species_data[:, valid_mask] / total_biomass[valid_mask]
+            np.divide(species_data, total_biomass, out=proportions,
+                      where=valid_mask[np.newaxis, :, :])
             
             # Calculate Shannon index
             if base == '2':
@@ -116,17 +136,21 @@ class ShannonDiversity(ForestCalculation):
                 log_func = np.log
 
             # Only calculate for non-zero proportions to avoid log(0)
-            mask = proportions > 0
             shannon_contrib = np.zeros_like(proportions)
-            shannon_contrib[mask] = -proportions[mask] * log_func(proportions[mask])
+            log_func(proportions, out=shannon_contrib, where=proportions > 0)
+            np.multiply(shannon_contrib, proportions, out=shannon_contrib)
 
-            # Sum across species
-            shannon = np.sum(shannon_contrib, axis=0)
+            # Sum across species; subtracting from zero rather than negating
+            # keeps empty and single-species pixels at +0.0, like the kernel
+            shannon = np.subtract(0, np.sum(shannon_contrib, axis=0))
         
         return shannon
     
     def validate_data(self, biomass_data: np.ndarray) -> bool:
         return biomass_data.ndim == 3 and biomass_data.shape[0] > 0
+    
+    def get_input_dtype(self) -> np.dtype:
+        return np.float32
 
 
 class SimpsonDiversity(ForestCalculation):
@@ -168,6 +192,12 @@ class SimpsonDiversity(ForestCalculation):
         else:
             species_data = biomass_data
         
+        if _kernels.HAS_NUMBA:
+            out = kwargs.get('out')
+            if out is None:
+                out = np.empty(species_data.shape[1:], dtype=np.float32)
+            return _kernels.simpson(species_data, inverse, out)
+        
         # Calculate total biomass per pixel
         total_biomass = np.sum(species_data, axis=0)
         
@@ -181,7 +211,8 @@ class SimpsonDiversity(ForestCalculation):
         if np.any(valid_mask):
             # Calculate proportions for valid pixels
             proportions = np.zeros_like(species_data, dtype=np.float32)
-            proportions[:, valid_mask] = species_data[:, valid_mask] / total_biomass[valid_mask]
+            np.divide(species_data, total_biomass, out=proportions,
+                      where=valid_mask[np.newaxis, :, :])
             
             # Calculate Simpson index (sum of squared proportions)
             simpson = np.sum(proportions ** 2, axis=0)
@@ -189,15 +220,17 @@ class SimpsonDiversity(ForestCalculation):
             # Apply inverse if requested
             if inverse:
                 # Avoid division by zero
-                mask = simpson > 0
                 result = np.ones_like(simpson)
-                result[mask] = 1.0 / simpson[mask]
+                np.divide(1.0, simpson, out=result, where=simpson > 0)
                 simpson = result
         
         return simpson
     
     def validate_data(self, biomass_data: np.ndarray) -> bool:
         return biomass_data.ndim == 3 and biomass_data.shape[0] > 0
+    
+    def get_input_dtype(self) -> np.dtype:
+        return np.float32
 
 
 class Evenness(ForestCalculation):
@@ -244,10 +277,14 @@ class Evenness(ForestCalculation):
         mask = richness > 1
         if np.any(mask):
             # Maximum possible Shannon diversity = ln(richness)
-            h_max = np.log(richness[mask])
-            evenness[mask] = shannon[mask] / h_max
+            h_max = np.ones(richness.shape, dtype=np.float32)
+            np.log(richness, out=h_max, where=mask, dtype=np.float32)
+            np.divide(shannon, h_max, out=evenness, where=mask)
         
         return evenness
     
     def validate_data(self, biomass_data: np.ndarray) -> bool:
-        return biomass_data.ndim == 3 and biomass_data.shape[0] > 0
\ No newline at end of file
+        return biomass_data.ndim == 3 and biomass_data.shape[0] > 0
+    
+    def get_input_dtype(self) -> np.dtype:
+        return np.float32
\ No newline at end of file
@@ -58,7 +58,7 @@ class DominantSpecies(ForestCalculation):
         # Apply minimum biomass threshold
         mask = max_biomass > min_biomass
         result = np.zeros(dominant.shape, dtype=np.uint8)
-        result[mask] = dominant[mask] + index_offset
+        np.add(dominant, index_offset, out=result, where=mask, casting='unsafe')
         
         return result
     
@@ -111,7 +111,8 @@ class SpeciesPresence(ForestCalculation):
             raise ValueError(f"Species index {species_index} out of range")
         
         species_biomass = biomass_data[species_index]
-        return (species_biomass > threshold).astype(np.uint8)
+        # Booleans are stored as 0/1 bytes, so reinterpret rather than copy
+        return (species_biomass > threshold).view(np.uint8)
     
     def validate_data(self, biomass_data: np.ndarray) -> bool:
         return (biomass_data.ndim == 3 and 
@@ -7,6 +7,12 @@ forest metrics on large-scale biomass data efficiently.
 """
 
 import logging
+import math
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import warnings
@@ -15,15 +21,41 @@ import numpy as np
 import zarr
 import rasterio
 from rasterio.transform import from_bounds, Affine
+from rasterio.windows import Window
 import xarray as xr
 from tqdm import tqdm
 
 from ...config import BigMapSettings, load_settings, CalculationConfig
-from ..calculations import registry
+from ..calculations import (
+    registry,
+    TotalBiomass,
+    SpeciesRichness,
+    ShannonDiversity,
+    SimpsonDiversity,
+    Evenness,
+)
+from ..calculations import _kernels
 from ..calculations.base import ForestCalculation
 
 logger = logging.getLogger(__name__)
 
+# The HDF5 library behind netCDF4 is not thread-safe
+_NETCDF_LOCK = threading.Lock()
+
+GEOTIFF_FORMATS = ("geotiff", "tif", "tiff")
+
+# TIFF tile dimensions must be multiples of 16
+TIFF_BLOCK_MULTIPLE = 16
+
+# Calculations the fused kernel can compute in one pass, by output role
+FUSED_CALCULATIONS = {
+    TotalBiomass: 'total',
+    SpeciesRichness: 'count',
+    ShannonDiversity: 'shannon',
+    SimpsonDiversity: 'simpson',
+    Evenness: 'evenness',
+}
+
 
 class ForestMetricsProcessor:
     """
@@ -47,7 +79,12 @@ class ForestMetricsProcessor:
         """
         self.settings = settings or BigMapSettings()
         self.chunk_size = (1, 1000, 1000)  # Default chunk size for processing
+        self.prefetch_tiles = 4  # Tiles read ahead when processing serially
         self.zarr_group = None  # Will store the parent group if available
+        self._meta_cache: Dict[Tuple[str, int], Dict[str, Tuple[str, ...]]] = {}
+        self._calc_index: Dict[str, CalculationConfig] = {}
+        self._calc_index_source: Optional[List[CalculationConfig]] = None
+        self._calc_index_size = 0
         
         logger.info(f"Initialized ForestMetricsProcessor with output dir: {self.settings.output_dir}")
     
@@ -85,10 +122,40 @@ class ForestMetricsProcessor:
         
         # Process data in chunks
         logger.info(f"Processing {len(calc_instances)} calculations on array shape {zarr_array.shape}")
-        results = self._process_in_chunks(zarr_array, calc_instances)
+        output_dir = Path(self.settings.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        streamed = self._get_streamed_calculations(zarr_array, calc_instances)
+        output_paths = {}
+        
+        with ExitStack() as stack:
+            # Results too large to hold in memory go straight to GeoTIFF
+            writers = {}
+            height, width = zarr_array.shape[1:]
+            block_shape = self._get_block_shape(self._get_tile_shape(zarr_array, TIFF_BLOCK_MULTIPLE))
+            for calc in streamed:
+                _, output_name = self._get_output_config(calc.name)
+                output_path = output_dir / f"{output_name}.tif"
+                quantization = self._get_quantization(calc.name)
+                dtype = quantization['dtype'] if quantization else np.dtype(calc.get_output_dtype())
+                profile = self._get_geotiff_profile(height, width, dtype, metadata, block_shape)
+                if quantization is not None:
+                    profile['nodata'] = quantization['nodata']
+                self._apply_nbits(profile, metadata, quantization)
+                dst = stack.enter_context(rasterio.open(output_path, 'w', **profile))
+                if quantization is not None:
+                    dst.scales = (quantization['scale'],)
+                    dst.offsets = (quantization['offset'],)
+                dst.update_tags(
+                    SOFTWARE='BigMap Forest Metrics Processor',
+                    PROCESSED_BY='bigmap.core.processors.forest_metrics'
+                )
+                writers[calc.name] = dst
+                output_paths[calc.name] = str(output_path)
+            
+            results = self._process_in_chunks(zarr_array, calc_instances, writers=writers)
         
         # Save results
-        output_paths = self._save_results(results, metadata, self.settings.output_dir)
+        output_paths.update(self._save_results(results, metadata, output_dir))
         
         logger.info(f"Completed {len(output_paths)} calculations successfully")
         return output_paths
@@ -120,9 +187,14 @@ class ForestMetricsProcessor:
                 self.ndim = array.ndim
                 self.dtype = array.dtype
                 self.chunks = array.chunks if hasattr(array, 'chunks') else None
+                # Bind hot attributes so reads never fall through __getattr__
+                self.store = getattr(array, 'store', None)
+                self.order = getattr(array, 'order', 'C')
+                self.fill_value = getattr(array, 'fill_value', None)
+                self._getitem = array.__getitem__
                 
             def __getitem__(self, key):
-                return self._array[key]
+                return self._getitem(key)
                 
             def __getattr__(self, name):
                 return getattr(self._array, name)
@@ -138,13 +210,19 @@ class ForestMetricsProcessor:
                 combined_attrs = dict(array.attrs)
                 if hasattr(root, 'attrs'):
                     combined_attrs.update(root.attrs)
-                # Add species arrays as attributes if they exist
-                if 'species_codes' in root:
-                    species_codes = root['species_codes'][:]
-                    combined_attrs['species_codes'] = list(species_codes) if hasattr(species_codes, '__iter__') else []
-                if 'species_names' in root:
-                    species_names = root['species_names'][:]
-                    combined_attrs['species_names'] = list(species_names) if hasattr(species_names, '__iter__') else []
+                # Add species arrays as attributes if they exist; they are
+                # read once per store and species count
+                cache_key = (str(zarr_path), array.shape[0])
+                species_meta = self._meta_cache.get(cache_key)
+                if species_meta is None:
+                    species_meta = {
+                        name: tuple(np.asarray(root[name][:]).tolist())
+                        for name in ('species_codes', 'species_names')
+                        if name in root
+                    }
+                    self._meta_cache[cache_key] = species_meta
+                for name, values in species_meta.items():
+                    combined_attrs[name] = list(values)
                 # Return wrapped array with combined attributes
                 return ArrayWrapper(array, combined_attrs), root
                 
@@ -221,6 +299,7 @@ class ForestMetricsProcessor:
             'species_codes': zarr_array.attrs.get('species_codes', []),
             'species_names': zarr_array.attrs.get('species_names', []),
             'shape': zarr_array.shape[1:],  # Spatial dimensions only
+            'num_layers': zarr_array.shape[0],
             'dtype': zarr_array.dtype
         }
         
@@ -241,6 +320,10 @@ class ForestMetricsProcessor:
             logger.warning("No spatial reference found, using default transform")
             metadata['transform'] = Affine(1, 0, 0, 0, -1, zarr_array.shape[1])
         
+        # Plain (a, b, c, d, e, f) floats for coordinate math; the Affine
+        # object is only needed at the rasterio boundary
+        metadata['affine_coeffs'] = tuple(float(v) for v in metadata['transform'][:6])
+        
         return metadata
     
     def _initialize_calculations(self, calc_configs: List[CalculationConfig]) -> List[ForestCalculation]:
@@ -279,7 +362,8 @@ class ForestMetricsProcessor:
     def _process_in_chunks(
         self, 
         zarr_array: zarr.Array, 
-        calculations: List[ForestCalculation]
+        calculations: List[ForestCalculation],
+        writers: Optional[Dict[str, Any]] = None
     ) -> Dict[str, np.ndarray]:
         """
         Process array in memory-efficient chunks.
@@ -290,55 +374,417 @@ class ForestMetricsProcessor:
             Input array
         calculations : List[ForestCalculation]
             Calculations to run
+        writers : Dict[str, rasterio.io.DatasetWriter], optional
+            Open single-band datasets for calculations whose tiles should be
+            written as they are computed instead of kept in memory
             
         Returns
         -------
         Dict[str, np.ndarray]
-            Results for each calculation
+            Results for each calculation not streamed to a writer
         """
-        # Initialize result arrays
+        writers = writers or {}
+        writer_locks = {name: threading.Lock() for name in writers}
+        quantizations = {name: self._get_quantization(name) for name in writers}
+        dtypes = {calc.name: calc.get_output_dtype() for calc in calculations}
+        
+        # Initialize result arrays as views into one (n, height, width)
+        # buffer per output dtype
         height, width = zarr_array.shape[1:]
-        results = {}
+        groups: Dict[np.dtype, List[str]] = {}
         for calc in calculations:
-            dtype = calc.get_output_dtype()
-            results[calc.name] = np.zeros((height, width), dtype=dtype)
-        
-        # Calculate chunk parameters
-        chunk_height, chunk_width = self.chunk_size[1:]
-        n_chunks_y = (height + chunk_height - 1) // chunk_height
-        n_chunks_x = (width + chunk_width - 1) // chunk_width
-        total_chunks = n_chunks_y * n_chunks_x
-        
-        logger.info(f"Processing in {total_chunks} chunks of size {self.chunk_size}")
-        
-        # Process each chunk
-        with tqdm(total=total_chunks, desc="Processing chunks") as pbar:
-            for i in range(n_chunks_y):
-                for j in range(n_chunks_x):
-                    # Calculate chunk boundaries
-                    y_start = i * chunk_height
-                    y_end = min((i + 1) * chunk_height, height)
-                    x_start = j * chunk_width
-                    x_end = min((j + 1) * chunk_width, width)
-                    
-                    # Load chunk data
-                    chunk_data = zarr_array[:, y_start:y_end, x_start:x_end]
-                    
-                    # Run calculations on chunk
-                    chunk_results = self._process_chunk(chunk_data, calculations)
-                    
-                    # Store results
-                    for calc_name, result in chunk_results.items():
-                        results[calc_name][y_start:y_end, x_start:x_end] = result
-                    
+            if calc.name not in writers:
+                names = groups.setdefault(np.dtype(dtypes[calc.name]), [])
+                if calc.name not in names:
+                    names.append(calc.name)
+        views = {}
+        for dtype, names in groups.items():
+            buffer = np.zeros((len(names), height, width), dtype=dtype)
+            views.update((name, buffer[i]) for i, name in enumerate(names))
+        results = {calc.name: views[calc.name] for calc in calculations if calc.name in views}
+        
+        def write_tile(name: str, tile: Tuple[int, int, int, int], data: np.ndarray) -> None:
+            y_start, y_end, x_start, x_end = tile
+            window = Window(x_start, y_start, x_end - x_start, y_end - y_start)
+            if quantizations[name] is not None:
+                data = self._quantize(data, quantizations[name])
+            with writer_locks[name]:
+                writers[name].write(data, 1, window=window)
+        
+        # Calculate chunk parameters; streamed tiles must cover whole
+        # GeoTIFF blocks
+        chunk_height, chunk_width = self._get_tile_shape(
+            zarr_array, TIFF_BLOCK_MULTIPLE if writers else 1
+        )
+        tiles = [
+            (y_start, min(y_start + chunk_height, height), x_start, min(x_start + chunk_width, width))
+            for y_start in range(0, height, chunk_height)
+            for x_start in range(0, width, chunk_width)
+        ]
+        
+        # Tiles whose on-disk chunks were never written hold only the fill
+        # value; compute that result once instead of reading them
+        empty_tiles = self._find_empty_tiles(zarr_array, tiles)
+        if empty_tiles:
+            fill_block = np.full(
+                (zarr_array.shape[0], 1, 1), zarr_array.fill_value or 0, dtype=zarr_array.dtype
+            )
+            fill_results = self._process_chunk(fill_block, calculations)
+            for tile in empty_tiles:
+                y_start, y_end, x_start, x_end = tile
+                for calc_name, value in fill_results.items():
+                    if calc_name in writers:
+                        write_tile(calc_name, tile, np.full(
+                            (y_end - y_start, x_end - x_start), value[0, 0], dtype=dtypes[calc_name]
+                        ))
+                    else:
+                        results[calc_name][y_start:y_end, x_start:x_end] = value[0, 0]
+            tiles = [tile for tile in tiles if tile not in empty_tiles]
+            logger.info(f"Skipping {len(empty_tiles)} tiles with no stored chunks")
+        
+        total_chunks = len(tiles)
+        tile_bytes = zarr_array.shape[0] * chunk_height * chunk_width * np.dtype(zarr_array.dtype).itemsize
+        max_workers = self._get_max_workers(total_chunks, tile_bytes)
+        tile_mb = tile_bytes / 1e6
+        
+        logger.info(
+            f"Processing in {total_chunks} chunks of size {(zarr_array.shape[0], chunk_height, chunk_width)} "
+            f"(~{tile_mb:.1f} MB each, store chunks {zarr_array.chunks}) "
+            f"using {max_workers} worker thread(s)"
+        )
+        
+        # Bind the underlying array's __getitem__ once for the read loop
+        get = getattr(zarr_array, '_array', zarr_array).__getitem__
+        
+        def read_tile(tile: Tuple[int, int, int, int]) -> np.ndarray:
+            y_start, y_end, x_start, x_end = tile
+            return get((slice(None), slice(y_start, y_end), slice(x_start, x_end)))
+        
+        def compute_tile(tile: Tuple[int, int, int, int], chunk_data: np.ndarray) -> None:
+            y_start, y_end, x_start, x_end = tile
+            
+            # Run calculations straight into views of the result arrays
+            # (tiles are disjoint, so concurrent writes never overlap)
+            out = {
+                name: result[y_start:y_end, x_start:x_end]
+                for name, result in results.items()
+            }
+            for name in writers:
+                out[name] = np.empty((y_end - y_start, x_end - x_start), dtype=dtypes[name])
+            self._process_chunk(chunk_data, calculations, out=out)
+            
+            for name in writers:
+                write_tile(name, tile, out[name])
+        
+        def process_tile(tile: Tuple[int, int, int, int]) -> None:
+            compute_tile(tile, read_tile(tile))
+        
+        # Process each chunk; zarr decompression and NumPy reductions release
+        # the GIL, so a thread pool overlaps I/O and compute across tiles.
+        # The compiled kernels stay serial under these threads (see _kernels)
+        with tqdm(total=total_chunks, desc="Processing chunks", mininterval=1.0,
+                  miniters=max(1, total_chunks // 200), smoothing=0.05) as pbar:
+            if max_workers == 1:
+                # Single worker: a reader thread still keeps the next tiles
+                # decompressed while the current one is computed
+                depth = self._get_prefetch_depth(tile_bytes)
+                for tile, chunk_data in self._prefetch_tiles(tiles, read_tile, depth):
+                    compute_tile(tile, chunk_data)
                     pbar.update(1)
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for _ in executor.map(process_tile, tiles):
+                        pbar.update(1)
         
         return results
     
+    def _prefetch_tiles(
+        self,
+        tiles: List[Tuple[int, int, int, int]],
+        read_tile,
+        depth: Optional[int] = None
+    ):
+        """
+        Yield ``(tile, data)`` pairs read ahead on a background thread.
+        
+        At most ``depth`` tiles are queued ahead of the consumer. Errors
+        raised while reading are re-raised in the consuming thread.
+        
+        Parameters
+        ----------
+        tiles : List[Tuple[int, int, int, int]]
+            Tile bounds as (y_start, y_end, x_start, x_end)
+        read_tile : callable
+            Function returning the data for a tile
+        depth : int, optional
+            Read-ahead depth; defaults to ``self.prefetch_tiles``
+        """
+        depth = self.prefetch_tiles if depth is None else depth
+        if depth < 1 or len(tiles) < 2:
+            for tile in tiles:
+                yield tile, read_tile(tile)
+            return
+        
+        tile_queue = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        done = object()
+        
+        def reader() -> None:
+            try:
+                for tile in tiles:
+                    if stop.is_set():
+                        return
+                    tile_queue.put((tile, read_tile(tile)))
+            except Exception as e:
+                tile_queue.put(e)
+                return
+            tile_queue.put(done)
+        
+        thread = threading.Thread(target=reader, name="zarr-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = tile_queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Unblock the reader if the consumer stopped early
+            stop.set()
+            while thread.is_alive():
+                try:
+                    tile_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    
+    def _find_empty_tiles(
+        self,
+        zarr_array: zarr.Array,
+        tiles: List[Tuple[int, int, int, int]]
+    ) -> set:
+        """
+        Find tiles for which no chunk of any species exists in the store.
+        
+        Zarr does not write chunks that were never assigned, and reads
+        return the fill value for them, so such tiles can be skipped.
+        Detection needs a listable, unsharded store; otherwise nothing is
+        reported empty.
+        
+        Listing goes through zarr's synchronous bridge to the async store
+        API, which is internal to zarr, so ``pyproject.toml`` keeps zarr
+        below 4. If a release within that range moves it, the failure falls
+        back to processing every tile with a warning.
+        
+        Parameters
+        ----------
+        zarr_array : zarr.Array
+            Input array (or wrapper around one)
+        tiles : List[Tuple[int, int, int, int]]
+            Tile bounds as (y_start, y_end, x_start, x_end)
+            
+        Returns
+        -------
+        set
+            Tiles that contain only the fill value
+        """
+        array = getattr(zarr_array, '_array', zarr_array)
+        if not isinstance(array, zarr.Array):
+            return set()
+        if array.shards is not None or not array.store.supports_listing:
+            return set()
+        
+        try:
+            from zarr.core.sync import sync
+            
+            prefix = array.path
+            
+            async def list_chunk_keys():
+                return [key async for key in array.store.list_prefix(prefix)]
+            
+            stored = {
+                key[len(prefix):].lstrip('/') for key in sync(list_chunk_keys())
+            }
+            encode_key = array.metadata.encode_chunk_key
+        except Exception as e:
+            logger.warning(f"Cannot list stored chunks, processing all tiles: {e}")
+            return set()
+        
+        n_species = array.shape[0]
+        _, chunk_y, chunk_x = array.chunks
+        empty = set()
+        for tile in tiles:
+            y_start, y_end, x_start, x_end = tile
+            if not any(
+                encode_key((s, iy, ix)) in stored
+                for s in range(n_species)
+                for iy in range(y_start // chunk_y, (y_end - 1) // chunk_y + 1)
+                for ix in range(x_start // chunk_x, (x_end - 1) // chunk_x + 1)
+            ):
+                empty.add(tile)
+        return empty
+    
+    def _get_tile_shape(self, zarr_array: zarr.Array, multiple: int = 1) -> Tuple[int, int]:
+        """
+        Get the processing tile shape, snapped to the zarr chunk grid.
+        
+        ``self.chunk_size`` is treated as a target; each spatial dimension is
+        rounded down to a whole multiple of the store's chunk size (but at
+        least one chunk) so every tile read decompresses each on-disk chunk
+        exactly once. With ``multiple``, the tile is also a multiple of that
+        size, e.g. ``TIFF_BLOCK_MULTIPLE`` so GeoTIFF blocks can divide it.
+        
+        Parameters
+        ----------
+        zarr_array : zarr.Array
+            Input array
+        multiple : int, default=1
+            Additional size each tile dimension must be a multiple of
+            
+        Returns
+        -------
+        Tuple[int, int]
+            Tile (height, width) in pixels
+        """
+        target_y, target_x = self.chunk_size[1:]
+        store_chunks = getattr(zarr_array, 'chunks', None)
+        if store_chunks and len(store_chunks) == 3:
+            _, chunk_y, chunk_x = store_chunks
+        else:
+            chunk_y = chunk_x = 1
+        
+        unit_y = math.lcm(chunk_y, multiple)
+        unit_x = math.lcm(chunk_x, multiple)
+        tile_y = max(unit_y, (target_y // unit_y) * unit_y)
+        tile_x = max(unit_x, (target_x // unit_x) * unit_x)
+        return tile_y, tile_x
+    
+    def _get_max_workers(self, n_tasks: int, task_bytes: Optional[int] = None) -> int:
+        """
+        Get the number of worker threads for chunk processing and saving.
+        
+        Uses ``settings.processing.max_workers`` when set, otherwise twice
+        the CPU count (chunk work is a mix of I/O and compute), never more
+        than the number of tasks. When ``task_bytes`` is given, each worker
+        is assumed to hold that much data and the count is also capped so
+        all workers fit within ``settings.processing.memory_limit_gb``.
+        """
+        max_workers = self.settings.processing.max_workers or (os.cpu_count() or 1) * 2
+        if task_bytes:
+            max_workers = min(max_workers, self._get_tile_budget(task_bytes))
+        return max(1, min(max_workers, n_tasks))
+    
+    def _get_tile_budget(self, tile_bytes: int) -> int:
+        """Get how many tiles of ``tile_bytes`` fit within the memory limit."""
+        limit_bytes = self.settings.processing.memory_limit_gb * 1024 ** 3
+        return int(limit_bytes // max(1, tile_bytes))
+    
+    def _get_prefetch_depth(self, tile_bytes: int) -> int:
+        """
+        Get the serial read-ahead depth for tiles of ``tile_bytes``.
+        
+        The consumer's tile and the one being read count against the memory
+        limit along with the queued tiles, so ``self.prefetch_tiles`` is
+        reduced (down to no read-ahead) when they would not fit.
+        """
+        return max(0, min(self.prefetch_tiles, self._get_tile_budget(tile_bytes) - 2))
+    
+    def _get_fused_plan(
+        self,
+        calculations: List[ForestCalculation]
+    ) -> Optional[Dict[str, ForestCalculation]]:
+        """
+        Map fused-kernel roles to calculations, if all of them can be fused.
+        
+        Fusion needs numba, every calculation to be exactly one of
+        ``FUSED_CALCULATIONS`` (subclasses may change behaviour), at most one
+        calculation per role, and a shared ``exclude_total_layer`` setting.
+        
+        Returns
+        -------
+        Dict[str, ForestCalculation] or None
+            Calculations by role, or None to use the generic path
+        """
+        if not _kernels.HAS_NUMBA or not calculations:
+            return None
+        
+        plan = {}
+        for calc in calculations:
+            role = FUSED_CALCULATIONS.get(type(calc))
+            if role is None or role in plan:
+                return None
+            plan[role] = calc
+        
+        if len({calc.config['exclude_total_layer'] for calc in plan.values()}) != 1:
+            return None
+        return plan
+    
+    def _process_chunk_fused(
+        self,
+        chunk_data: np.ndarray,
+        plan: Dict[str, ForestCalculation],
+        out: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run the calculations in ``plan`` with a single fused kernel call.
+        
+        Parameters
+        ----------
+        chunk_data : np.ndarray
+            Chunk of biomass data (species, y, x)
+        plan : Dict[str, ForestCalculation]
+            Calculations by fused role, from ``_get_fused_plan``
+        out : Dict[str, np.ndarray], optional
+            Preallocated 2D output per calculation name
+            
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Results for each calculation
+        """
+        exclude_total = next(iter(plan.values())).config['exclude_total_layer']
+        species_data = chunk_data[1:] if exclude_total and chunk_data.shape[0] > 1 else chunk_data
+        
+        outputs = {}
+        for role, dtype in (('total', np.float32), ('count', np.uint8), ('shannon', np.float32),
+                            ('simpson', np.float32), ('evenness', np.float32)):
+            calc = plan.get(role)
+            if calc is None:
+                outputs[role] = np.empty((0, 0), dtype=dtype)
+                continue
+            target = out.get(calc.name) if out is not None else None
+            # Contiguous outputs keep to the one precompiled kernel signature;
+            # strided tile views are filled from a temporary below
+            if target is None or target.dtype != dtype or not target.flags.c_contiguous:
+                target = np.empty(chunk_data.shape[1:], dtype=dtype)
+            outputs[role] = target
+        
+        threshold = plan['count'].config['biomass_threshold'] if 'count' in plan else 0.0
+        log_scale = 1.0 / np.log(2.0) if 'shannon' in plan and plan['shannon'].config['base'] == '2' else 1.0
+        inverse = plan['simpson'].config['inverse'] if 'simpson' in plan else True
+        
+        _kernels.fused_reductions(
+            species_data, threshold, log_scale, inverse,
+            outputs['total'], outputs['count'], outputs['shannon'],
+            outputs['simpson'], outputs['evenness']
+        )
+        
+        chunk_results = {}
+        for role, calc in plan.items():
+            result = outputs[role]
+            calc_out = out.get(calc.name) if out is not None else None
+            if calc_out is not None and result is not calc_out:
+                calc_out[...] = result
+                result = calc_out
+            chunk_results[calc.name] = result
+        return chunk_results
+    
     def _process_chunk(
         self, 
         chunk_data: np.ndarray, 
-        calculations: List[ForestCalculation]
+        calculations: List[ForestCalculation],
+        out: Optional[Dict[str, np.ndarray]] = None
     ) -> Dict[str, np.ndarray]:
         """
         Process a single chunk of data.
@@ -349,6 +795,10 @@ class ForestMetricsProcessor:
             Chunk of biomass data (species, y, x)
         calculations : List[ForestCalculation]
             Calculations to run
+        out : Dict[str, np.ndarray], optional
+            Preallocated 2D output per calculation name. Calculations that
+            support ``out=`` write into it directly; other results are
+            copied in.
             
         Returns
         -------
@@ -356,30 +806,67 @@ class ForestMetricsProcessor:
             Results for each calculation
         """
         chunk_results = {}
+        preprocessed = {}  # Shared preprocessing results by key
+        
+        # Cast once to a dtype that satisfies every calculation
+        required = [
+            calc.get_input_dtype() for calc in calculations
+            if isinstance(calc, ForestCalculation)
+        ]
+        required = [dtype for dtype in required if dtype is not None]
+        if required:
+            try:
+                target = np.result_type(chunk_data.dtype, *(np.dtype(dtype) for dtype in required))
+            except Exception as e:
+                logger.debug(f"Cannot resolve common input dtype, leaving chunk as is: {e}")
+            else:
+                chunk_data = chunk_data.astype(target, copy=False)
+        
+        # Built-in reductions share one pass over the chunk when possible
+        fused_plan = self._get_fused_plan(calculations)
+        if fused_plan is not None and chunk_data.ndim == 3 and chunk_data.shape[0] > 0:
+            try:
+                return self._process_chunk_fused(chunk_data, fused_plan, out)
+            except Exception as e:
+                logger.warning(f"Fused kernel failed, running calculations separately: {e}")
         
         for calc in calculations:
+            calc_out = out.get(calc.name) if out is not None else None
             try:
                 # Validate data for this calculation
                 if calc.validate_data(chunk_data):
-                    # Preprocess if needed
-                    processed_data = calc.preprocess_data(chunk_data)
+                    # Preprocess if needed, once per distinct preprocessing key
+                    key = calc.get_preprocessing_key()
+                    if key is not None and key in preprocessed:
+                        processed_data = preprocessed[key]
+                    else:
+                        processed_data = calc.preprocess_data(chunk_data)
+                        if key is not None:
+                            preprocessed[key] = processed_data
                     
                     # Run calculation
-                    result = calc.calculate(processed_data)
+                    if calc_out is not None:
+                        result = calc.calculate(processed_data, out=calc_out)
+                    else:
+                        result = calc.calculate(processed_data)
                     
                     # Postprocess if needed
                     result = calc.postprocess_result(result)
-                    
-                    chunk_results[calc.name] = result
                 else:
                     # Return zeros if validation fails
                     logger.warning(f"Validation failed for {calc.name} on chunk")
-                    chunk_results[calc.name] = np.zeros(chunk_data.shape[1:], dtype=calc.get_output_dtype())
+                    result = np.zeros(chunk_data.shape[1:], dtype=calc.get_output_dtype())
                     
             except Exception as e:
                 logger.error(f"Error in calculation {calc.name}: {e}")
                 # Return zeros on error
-                chunk_results[calc.name] = np.zeros(chunk_data.shape[1:], dtype=calc.get_output_dtype())
+                result = np.zeros(chunk_data.shape[1:], dtype=calc.get_output_dtype())
+            
+            if calc_out is not None:
+                if result is not calc_out:
+                    calc_out[...] = result
+                result = calc_out
+            chunk_results[calc.name] = result
         
         return chunk_results
     
@@ -409,57 +896,254 @@ class ForestMetricsProcessor:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        output_paths = {}
-        
-        for calc_name, result_array in results.items():
+        def save_one(item: Tuple[str, np.ndarray]) -> Optional[Tuple[str, str]]:
+            calc_name, result_array = item
             try:
-                # Get output format from calculation config
-                calc_config = next(
-                    (c for c in self.settings.calculations if c.name == calc_name),
-                    None
-                )
-                output_format = calc_config.output_format if calc_config else "geotiff"
-                output_name = calc_config.output_name if (calc_config and calc_config.output_name) else calc_name
+                output_format, output_name = self._get_output_config(calc_name)
                 
                 # Save based on format
-                if output_format.lower() in ["geotiff", "tif", "tiff"]:
+                if output_format in GEOTIFF_FORMATS:
                     output_path = output_dir / f"{output_name}.tif"
-                    self._save_geotiff(result_array, output_path, metadata)
-                elif output_format.lower() == "zarr":
+                    self._save_geotiff(result_array, output_path, metadata,
+                                       self._get_quantization(calc_name))
+                elif output_format == "zarr":
                     output_path = output_dir / f"{output_name}.zarr"
                     self._save_zarr(result_array, output_path, metadata, calc_name)
-                elif output_format.lower() in ["netcdf", "nc"]:
+                elif output_format in ["netcdf", "nc"]:
                     output_path = output_dir / f"{output_name}.nc"
-                    self._save_netcdf(result_array, output_path, metadata, calc_name)
+                    self._save_netcdf(result_array, output_path, metadata, calc_name,
+                                      self._get_quantization(calc_name))
                 else:
                     logger.warning(f"Unknown format '{output_format}', defaulting to GeoTIFF")
                     output_path = output_dir / f"{output_name}.tif"
-                    self._save_geotiff(result_array, output_path, metadata)
+                    self._save_geotiff(result_array, output_path, metadata,
+                                       self._get_quantization(calc_name))
                 
-                output_paths[calc_name] = str(output_path)
                 logger.info(f"Saved {calc_name} to {output_path}")
+                return calc_name, str(output_path)
                 
             except Exception as e:
                 logger.error(f"Failed to save {calc_name}: {e}")
-                continue
+                return None
         
-        return output_paths
+        # Compression runs in GDAL/zarr codecs without the GIL, so outputs
+        # are written concurrently
+        max_workers = self._get_max_workers(len(results))
+        if max_workers == 1:
+            saved = [save_one(item) for item in results.items()]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                saved = list(executor.map(save_one, results.items()))
+        
+        return dict(item for item in saved if item is not None)
     
-    def _save_geotiff(self, data: np.ndarray, output_path: Path, metadata: Dict[str, Any]) -> None:
-        """Save data as GeoTIFF."""
-        with rasterio.open(
-            output_path,
-            'w',
-            driver='GTiff',
-            height=data.shape[0],
-            width=data.shape[1],
-            count=1,
-            dtype=data.dtype,
-            crs=metadata.get('crs', 'ESRI:102039'),
-            transform=metadata.get('transform'),
-            compress='lzw'
-        ) as dst:
+    def _get_calc_config(self, calc_name: str) -> Optional[CalculationConfig]:
+        """
+        Get the configuration entry for a calculation, if any.
+        
+        Entries are looked up in a name index that is rebuilt whenever
+        ``settings.calculations`` is replaced or resized; the first entry
+        wins for duplicate names.
+        """
+        calculations = self.settings.calculations
+        if self._calc_index_source is not calculations or self._calc_index_size != len(calculations):
+            index = {}
+            for calc_config in calculations:
+                index.setdefault(calc_config.name, calc_config)
+            # Publish the finished index in one assignment; save threads read it
+            self._calc_index = index
+            self._calc_index_source = calculations
+            self._calc_index_size = len(calculations)
+        return self._calc_index.get(calc_name)
+    
+    def _get_output_config(self, calc_name: str) -> Tuple[str, str]:
+        """Get the (lower-cased output format, output file stem) for a calculation."""
+        calc_config = self._get_calc_config(calc_name)
+        output_format = calc_config.output_format if calc_config else "geotiff"
+        output_name = calc_config.output_name if (calc_config and calc_config.output_name) else calc_name
+        return output_format.lower(), output_name
+    
+    def _get_quantization(self, calc_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get integer quantization parameters for a calculation's output.
+        
+        Returns
+        -------
+        Dict[str, Any] or None
+            ``dtype``, ``scale``, ``offset`` and ``nodata``, or None when the
+            output keeps its native dtype
+        """
+        calc_config = self._get_calc_config(calc_name)
+        if calc_config is None or calc_config.output_dtype is None:
+            return None
+        
+        dtype = np.dtype(calc_config.output_dtype)
+        nodata = calc_config.nodata
+        if nodata is None:
+            info = np.iinfo(dtype)
+            nodata = info.min if dtype.kind == 'i' else info.max
+        return {
+            'dtype': dtype,
+            'scale': calc_config.scale_factor,
+            'offset': calc_config.add_offset,
+            'nodata': nodata,
+        }
+    
+    def _quantize(self, data: np.ndarray, quantization: Dict[str, Any]) -> np.ndarray:
+        """
+        Quantize data to integers as ``round((data - offset) / scale)``.
+        
+        Values are clipped to the dtype range (excluding the nodata value)
+        and non-finite values are stored as nodata.
+        """
+        dtype = quantization['dtype']
+        nodata = quantization['nodata']
+        info = np.iinfo(dtype)
+        low = info.min + 1 if nodata == info.min else info.min
+        high = info.max - 1 if nodata == info.max else info.max
+        
+        scaled = (data.astype(np.float64, copy=False) - quantization['offset']) / quantization['scale']
+        invalid = ~np.isfinite(scaled)
+        np.round(scaled, out=scaled)
+        np.clip(scaled, low, high, out=scaled)
+        np.copyto(scaled, nodata, where=invalid)
+        return scaled.astype(dtype)
+    
+    def _get_streamed_calculations(
+        self,
+        zarr_array: zarr.Array,
+        calculations: List[ForestCalculation]
+    ) -> List[ForestCalculation]:
+        """
+        Get calculations whose GeoTIFF output should be written tile by tile.
+        
+        Full-size result arrays are only kept in memory while their combined
+        size fits within ``settings.processing.memory_limit_gb``; beyond that,
+        GeoTIFF outputs are streamed. Other formats are always buffered.
+        """
+        height, width = zarr_array.shape[1:]
+        result_bytes = sum(
+            height * width * np.dtype(calc.get_output_dtype()).itemsize
+            for calc in calculations
+        )
+        limit_bytes = self.settings.processing.memory_limit_gb * 1024 ** 3
+        if result_bytes <= limit_bytes:
+            return []
+        
+        streamed = [
+            calc for calc in calculations
+            if self._get_output_config(calc.name)[0] in GEOTIFF_FORMATS
+        ]
+        logger.info(
+            f"Results need {result_bytes / 1024 ** 3:.1f} GB (limit "
+            f"{self.settings.processing.memory_limit_gb} GB); streaming "
+            f"{len(streamed)} GeoTIFF output(s) per tile"
+        )
+        return streamed
+    
+    def _get_block_shape(
+        self,
+        tile_shape: Tuple[int, int],
+        max_block: int = 1024
+    ) -> Tuple[int, int]:
+        """
+        Get a GeoTIFF block shape that evenly divides the processing tile.
+        
+        Each dimension is the largest multiple of ``TIFF_BLOCK_MULTIPLE`` up
+        to ``max_block`` that divides the tile, so windowed tile writes cover
+        whole blocks and GDAL never has to read back a partial block. Tiles
+        come from ``_get_tile_shape(..., TIFF_BLOCK_MULTIPLE)``, so such a
+        size always exists.
+        
+        Raises
+        ------
+        ValueError
+            If a tile dimension is not a multiple of ``TIFF_BLOCK_MULTIPLE``
+        """
+        def block_size(tile: int) -> int:
+            step = TIFF_BLOCK_MULTIPLE
+            for size in range(min(tile, max_block) // step * step, 0, -step):
+                if tile % size == 0:
+                    return size
+            raise ValueError(f"Tile size {tile} is not a multiple of {step}")
+        
+        return block_size(tile_shape[0]), block_size(tile_shape[1])
+    
+    def _get_geotiff_profile(
+        self,
+        height: int,
+        width: int,
+        dtype: np.dtype,
+        metadata: Dict[str, Any],
+        block_shape: Tuple[int, int] = (512, 512)
+    ) -> Dict[str, Any]:
+        """Get the rasterio creation profile for a single-band tiled GeoTIFF."""
+        profile = {
+            'driver': 'GTiff',
+            'height': height,
+            'width': width,
+            'count': 1,
+            'dtype': dtype,
+            'crs': metadata.get('crs', 'ESRI:102039'),
+            'transform': metadata.get('transform'),
+            'compress': 'zstd',
+            'tiled': True,
+            'blockxsize': block_shape[1],
+            'blockysize': block_shape[0],
+            'num_threads': 'ALL_CPUS',
+            'BIGTIFF': 'IF_SAFER'
+        }
+        if dtype.kind == 'f':
+            profile['predictor'] = 3  # Floating-point predictor
+        elif dtype.kind in 'iu':
+            profile['predictor'] = 2  # Horizontal differencing
+        return profile
+    
+    def _apply_nbits(
+        self,
+        profile: Dict[str, Any],
+        metadata: Dict[str, Any],
+        quantization: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Bitpack unquantized uint8 count outputs to 4 bits when they must fit.
+        
+        Count and index outputs (richness, dominant species, presence) never
+        exceed the number of input layers, so with at most 15 layers they fit
+        in a nibble. GDAL bitpacks them on disk and still hands uint8 back to
+        readers. The decision depends only on the input array, never on the
+        values of a particular run, so in-memory and streamed outputs of the
+        same metric share one layout.
+        """
+        num_layers = metadata.get('num_layers')
+        nodata = profile.get('nodata')
+        if (quantization is None
+                and np.dtype(profile['dtype']) == np.uint8
+                and num_layers is not None and num_layers <= 15
+                and (nodata is None or 0 <= nodata <= 15)):
+            profile['nbits'] = 4
+            profile.pop('predictor', None)
+    
+    def _save_geotiff(
+        self,
+        data: np.ndarray,
+        output_path: Path,
+        metadata: Dict[str, Any],
+        quantization: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Save data as GeoTIFF, optionally quantized to integers."""
+        if quantization is not None:
+            data = self._quantize(data, quantization)
+        profile = self._get_geotiff_profile(data.shape[0], data.shape[1], data.dtype, metadata)
+        if quantization is not None:
+            profile['nodata'] = quantization['nodata']
+        self._apply_nbits(profile, metadata, quantization)
+
+        with rasterio.open(output_path, 'w', **profile) as dst:
             dst.write(data, 1)
+            if quantization is not None:
+                dst.scales = (quantization['scale'],)
+                dst.offsets = (quantization['offset'],)
             
             # Add metadata tags
             dst.update_tags(
@@ -501,18 +1185,20 @@ class ForestMetricsProcessor:
         data: np.ndarray, 
         output_path: Path, 
         metadata: Dict[str, Any],
-        var_name: str
+        var_name: str,
+        quantization: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Save data as NetCDF using xarray."""
+        """Save data as NetCDF using xarray, optionally packed to integers."""
         # Create coordinates
-        transform = metadata.get('transform', Affine.identity())
+        coeffs = metadata.get('affine_coeffs')
+        if coeffs is None:
+            coeffs = tuple(metadata.get('transform', Affine.identity()))[:6]
+        a, _, c, _, e, f = coeffs
         height, width = data.shape
         
-        # Calculate coordinate arrays
-        cols = np.arange(width)
-        rows = np.arange(height)
-        xs, _ = transform * (cols, np.zeros_like(cols))
-        _, ys = transform * (np.zeros_like(rows), rows)
+        # Calculate coordinate arrays (x along row 0, y along column 0)
+        xs = c + a * np.arange(width)
+        ys = f + e * np.arange(height)
         
         # Create xarray dataset
         ds = xr.Dataset(
@@ -527,10 +1213,17 @@ class ForestMetricsProcessor:
         ds.attrs['crs'] = metadata.get('crs', 'ESRI:102039')
         ds[var_name].attrs['units'] = 'varies'
         
-        # Save to NetCDF
-        ds.to_netcdf(output_path, engine='netcdf4', encoding={
-            var_name: {'zlib': True, 'complevel': 5}
-        })
+        # Save to NetCDF; xarray packs floats using the CF scale/offset
+        encoding = {'zlib': True, 'complevel': 5}
+        if quantization is not None:
+            encoding.update({
+                'dtype': quantization['dtype'].name,
+                'scale_factor': quantization['scale'],
+                'add_offset': quantization['offset'],
+                '_FillValue': quantization['nodata'],
+            })
+        with _NETCDF_LOCK:
+            ds.to_netcdf(output_path, engine='netcdf4', encoding={var_name: encoding})
 
 
 def run_forest_analysis(
@@ -6,16 +6,25 @@ This module contains common functions used across multiple examples
 to avoid code duplication and provide consistent functionality.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+import os
+import weakref
 from pathlib import Path
 import numpy as np
+import psutil
 import zarr
 import rasterio
+from rasterio.windows import Window
 import shutil
 from typing import List, Optional, Dict, Any, Tuple
 from rich.console import Console
 from dataclasses import dataclass
 from typing import Any
 
+from bigmap.core.calculations import _kernels
+from bigmap.utils.zarr_utils import gdal_read_env
+
 console = Console()
 
 
@@ -55,15 +64,29 @@ def _validate_bbox(bbox: Tuple[float, float, float, float], crs: str) -> None:
 
 @dataclass
 class AnalysisConfig:
-    """Configuration for analysis parameters to avoid magic numbers."""
+    """
+    Configuration for analysis parameters to avoid magic numbers.
+
+    ``chunk_size`` is (species, height, width). The default stores one species
+    per ~16 MB float32 chunk, which suits per-species maps and whole-layer
+    scans and lets layers be written concurrently. Use a deeper species axis,
+    e.g. (4, 1024, 1024), when analyses mostly read all species for small
+    areas, at the cost of serializing layer writes during ingestion.
+    """
     biomass_threshold: float = 1.0
     diversity_percentile: int = 90
     richness_threshold: float = 0.5
-    chunk_size: Tuple[int, int, int] = (1, 1000, 1000)
+    chunk_size: Tuple[int, int, int] = (1, 2048, 2048)
     max_pixels: int = 1_000_000  # Maximum pixels to load in memory
     sample_ratio: float = 0.1  # Default sampling ratio for large arrays
     nodata_value: float = -9999.0
     presence_threshold: float = 1.0
+    max_workers: int = 8  # Thread pool size for raster ingestion and chunked statistics
+    viz_dtype: Optional[str] = None  # e.g. 'float16' to halve memory of arrays loaded for plotting
+    compression: str = 'zstd'  # Blosc compressor for zarr arrays
+    compression_level: int = 3
+    shuffle: str = 'bitshuffle'  # Bitshuffle suits sparse float32 biomass
+    storage_scale: Optional[float] = None  # e.g. 10 stores biomass as uint16 in 0.1 Mg/ha steps
 
 
 def cleanup_example_outputs(directories: Optional[List[str]] = None) -> None:
@@ -192,11 +215,55 @@ def safe_open_zarr_biomass(zarr_path: Path) -> Tuple[zarr.Group, zarr.Array]:
             raise ValueError(f"Cannot open zarr store {zarr_path}: {e}")
 
 
+def _block_mean_downsample(z: zarr.Array, factor: int, dtype: Any = np.float32) -> np.ndarray:
+    """
+    Downsample the spatial axes of a 3D zarr array by block averaging.
+
+    Each output pixel is the mean of a ``factor`` x ``factor`` block (partial
+    blocks at the right and bottom edges average the pixels they cover).
+    Tiles are read close to the store's chunk shape and rounded to whole
+    blocks, so each compressed chunk is fetched about once.
+
+    Args:
+        z: Zarr array with shape (layers, height, width)
+        factor: Downsampling factor along each spatial axis
+        dtype: Output data type
+
+    Returns:
+        Array of shape (layers, ceil(height / factor), ceil(width / factor))
+    """
+    n_layers, height, width = z.shape
+    tile_h = max(factor, z.chunks[1] // factor * factor)
+    tile_w = max(factor, z.chunks[2] // factor * factor)
+
+    out_h = -(-height // factor)
+    out_w = -(-width // factor)
+    result = np.empty((n_layers, out_h, out_w), dtype=dtype)
+
+    for y0 in range(0, height, tile_h):
+        for x0 in range(0, width, tile_w):
+            tile = z[:, y0:y0 + tile_h, x0:x0 + tile_w]
+            rows = np.arange(0, tile.shape[1], factor)
+            cols = np.arange(0, tile.shape[2], factor)
+
+            sums = np.add.reduceat(np.add.reduceat(tile, rows, axis=1, dtype=np.float64), cols, axis=2)
+            counts = np.outer(np.diff(rows, append=tile.shape[1]), np.diff(cols, append=tile.shape[2]))
+
+            oy, ox = y0 // factor, x0 // factor
+            result[:, oy:oy + len(rows), ox:ox + len(cols)] = sums / counts
+
+    return result
+
+
 def safe_load_zarr_with_memory_check(zarr_path: Path,
                                     config: Optional[AnalysisConfig] = None) -> np.ndarray:
     """
     Load zarr array with memory management.
 
+    When ``config.viz_dtype`` is set (e.g. ``'float16'``) the array is returned
+    in that type, halving its footprint for plotting. Reduced precision is not
+    suitable for accumulating statistics; sum such arrays with ``dtype=np.float32``.
+
     Args:
         zarr_path: Path to zarr array
         config: Analysis configuration
@@ -220,13 +287,12 @@ def safe_load_zarr_with_memory_check(zarr_path: Path,
             w = int(z.shape[2] * sample_ratio)
 
             console.print(f"[yellow]Large array detected ({total_pixels:,} pixels)[/yellow]")
-            console.print(f"[yellow]Downsampling to {h}x{w} for memory safety[/yellow]")
+            console.print(f"[yellow]Downsampling to {h}x{w} by block averaging for memory safety[/yellow]")
 
-            # Sample the array
-            sample = z[:, ::int(1/sample_ratio), ::int(1/sample_ratio)]
-            return sample
+            return _block_mean_downsample(z, int(1 / sample_ratio), config.viz_dtype or np.float32)
         else:
-            return z[:]
+            data = z[:]
+            return data.astype(config.viz_dtype, copy=False) if config.viz_dtype else data
 
     except Exception as e:
         console.print(f"[red]Error loading zarr array: {e}[/red]")
@@ -241,6 +307,14 @@ def create_zarr_from_rasters(
     """
     Create a zarr array from species raster files with error handling.
 
+    With ``config.storage_scale`` set, values are stored on disk as uint16
+    multiples of ``1 / storage_scale`` (saturating at the uint16 maximum),
+    halving the raw chunk size; the array still reads back as float32.
+
+    Rasters that cannot be opened, do not match the first raster's shape
+    and transform, or fail on their first band are skipped with a warning
+    and their layers left at ``config.nodata_value``.
+
     Args:
         raster_dir: Directory containing GeoTIFF files
         output_path: Output path for zarr array
@@ -251,60 +325,144 @@ def create_zarr_from_rasters(
 
     Raises:
         ValueError: If no raster files found
-        IOError: If raster reading fails
+        IOError: If a raster fails to read after some of its rows were written
     """
     if config is None:
         config = AnalysisConfig()
 
-    raster_files = sorted(Path(raster_dir).glob("*.tif"))
+    # One directory scan; scandir entries carry their file type, so no
+    # extra stat per entry
+    with os.scandir(raster_dir) as entries:
+        raster_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.endswith('.tif') and entry.is_file()
+        )
     console.print(f"Found {len(raster_files)} species rasters")
 
     if not raster_files:
         raise ValueError(f"No .tif files found in {raster_dir}")
 
+    n_workers = max(1, min(config.max_workers, len(raster_files)))
+    failed = set()
+    # Each raster is opened once and its handle reused for every band.
+    # Within a band every raster is read by a single task and bands run one
+    # after another, so no handle is ever used by two threads at once.
+    datasets = ExitStack()
     try:
-        # Read first raster for dimensions and metadata
-        with rasterio.open(raster_files[0]) as src:
-            height, width = src.shape
-            transform = src.transform
-            crs = src.crs
-            bounds = src.bounds
+        with gdal_read_env(n_workers):
+            # The first raster defines the grid, so failing to open it is fatal
+            reference = datasets.enter_context(rasterio.open(raster_files[0]))
+            handles = {raster_files[0]: reference}
+            for raster_file in raster_files[1:]:
+                try:
+                    src = datasets.enter_context(rasterio.open(raster_file))
+                    # Band windows would silently crop a mismatched raster
+                    if src.shape != reference.shape:
+                        raise ValueError(f"dimensions {src.shape} differ from {reference.shape}")
+                    if not np.allclose(src.transform, reference.transform, rtol=1e-5):
+                        raise ValueError("transform differs from the first raster")
+                    handles[raster_file] = src
+                except Exception as e:
+                    console.print(f"[yellow]Warning: Failed to read {raster_file.name}: {e}[/yellow]")
+                    failed.add(raster_file)
+
+        height, width = reference.shape
+        transform = reference.transform
+        crs = reference.crs
+        bounds = reference.bounds
+
+        # Optionally store values as scaled uint16; readers still see float32
+        filters = []
+        max_value = None
+        if config.storage_scale:
+            from zarr.codecs.numcodecs import FixedScaleOffset
+
+            filters = [FixedScaleOffset(offset=0, scale=config.storage_scale,
+                                        dtype='<f4', astype='<u2')]
+            max_value = np.iinfo(np.uint16).max / config.storage_scale
 
         # Create zarr array with total + species layers
         n_layers = len(raster_files) + 1  # +1 for total biomass
-        z = zarr.open_array(
+        z = zarr.create_array(
             str(output_path),
-            mode='w',
+            overwrite=True,
             shape=(n_layers, height, width),
             chunks=config.chunk_size,
             dtype='float32',
             fill_value=config.nodata_value,
-            compressor=zarr.Blosc(cname='lz4', clevel=5, shuffle=2)
+            filters=filters,
+            compressors=[zarr.codecs.BloscCodec(
+                cname=config.compression, clevel=config.compression_level, shuffle=config.shuffle
+            )]
         )
 
-        # Store metadata
-        z.attrs['crs'] = str(crs)
-        z.attrs['transform'] = transform.to_gdal()
-        z.attrs['bounds'] = bounds
-        z.attrs['layer_names'] = ['total_biomass'] + [f.stem for f in raster_files]
-        z.attrs['nodata'] = config.nodata_value
-
-        # Load species data
-        total = np.zeros((height, width), dtype='float32')
-        for i, raster_file in enumerate(raster_files, start=1):
-            console.print(f"Processing {raster_file.name}...")
-            try:
-                with rasterio.open(raster_file) as src:
-                    data = src.read(1).astype('float32')
-                    data[data < 0] = 0  # Clean nodata
-                    z[i, :, :] = data
-                    total += data
-            except Exception as e:
-                console.print(f"[yellow]Warning: Failed to read {raster_file.name}: {e}[/yellow]")
-                continue
-
-        # Store total biomass in first layer
-        z[0, :, :] = total
+        # Store metadata in one attribute write; each item assignment
+        # rewrites the array metadata document
+        metadata = {
+            'crs': str(crs),
+            'transform': transform.to_gdal(),
+            'bounds': bounds,
+            'layer_names': ['total_biomass'] + [f.stem for f in raster_files],
+            'nodata': config.nodata_value,
+        }
+        if config.storage_scale:
+            metadata['storage_scale'] = config.storage_scale
+        z.attrs.update(metadata)
+
+        # Layers only map to disjoint chunks when chunked one layer deep,
+        # otherwise concurrent writes could race on a shared chunk
+        write_in_worker = config.chunk_size[0] == 1
+
+        def _load(i: int, raster_file: Path, window: Window) -> np.ndarray:
+            out = np.empty((window.height, width), dtype='float32')
+            # GDAL releases the GIL while reading
+            with gdal_read_env(n_workers):
+                data = handles[raster_file].read(1, window=window, out=out)  # Converted to float32 by GDAL
+            np.fmax(data, 0, out=data)  # Zero negative and NaN nodata in place, without a mask
+            if max_value is not None:
+                np.minimum(data, max_value, out=data)  # Saturate instead of wrapping uint16
+            if write_in_worker:
+                z[i, window.row_off:window.row_off + window.height, :] = data
+            return data
+
+        # Stream row bands aligned to the zarr chunks so only one band of
+        # each in-flight raster and of the total is held in memory
+        band_height = config.chunk_size[1]
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            for r0 in range(0, height, band_height):
+                r1 = min(r0 + band_height, height)
+                window = Window(0, r0, width, r1 - r0)
+                strip_total = np.zeros((r1 - r0, width), dtype='float32')
+                futures = [
+                    (i, raster_file, executor.submit(_load, i, raster_file, window))
+                    for i, raster_file in enumerate(raster_files, start=1)
+                    if raster_file not in failed
+                ]
+                # Results are taken in raster order so the float total is
+                # summed in the same order on every run
+                for i, raster_file, future in futures:
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        if r0 > 0:
+                            # Earlier bands of this layer are already stored
+                            # and summed into the total, so it cannot be
+                            # dropped cleanly
+                            raise IOError(
+                                f"Failed to read rows {r0}-{r1} of {raster_file.name}: {e}"
+                            ) from e
+                        console.print(f"[yellow]Warning: Failed to read {raster_file.name}: {e}[/yellow]")
+                        failed.add(raster_file)
+                        continue
+                    if not write_in_worker:
+                        z[i, r0:r1, :] = data
+                    strip_total += data
+
+                # Store total biomass for this band in the first layer
+                if max_value is not None:
+                    np.minimum(strip_total, max_value, out=strip_total)
+                z[0, r0:r1, :] = strip_total
+                console.print(f"Processed rows {r0}-{r1} of {height}")
 
         console.print(f"[green]Created zarr array:[/green] {output_path}")
         return output_path
@@ -312,6 +470,8 @@ def create_zarr_from_rasters(
     except Exception as e:
         console.print(f"[red]Error creating zarr array: {e}[/red]")
         raise
+    finally:
+        datasets.close()
 
 
 def create_sample_zarr(output_path: Path, n_species: int = 3) -> Path:
@@ -338,31 +498,22 @@ def create_sample_zarr(output_path: Path, n_species: int = 3) -> Path:
             dtype='float32'
         )
 
-        # Generate sample data
-        np.random.seed(42)
-        total_biomass = np.zeros((shape[1], shape[2]), dtype='float32')
-
-        for i in range(shape[0]):
-            # Create species distribution with spatial pattern
-            x = np.linspace(0, 10, shape[1])
-            y = np.linspace(0, 10, shape[2])
-            X, Y = np.meshgrid(x, y)
-
-            # Different pattern for each species
-            if i == 0:  # Skip total for now
-                continue
-            else:
-                freq = i * 0.5
-                data = np.abs(np.sin(X * freq) * np.cos(Y * freq) * 50)
-                biomass_array[i, :, :] = data
-                total_biomass += data
-
+        # Create species distributions with spatial patterns, one frequency
+        # per species. The pattern is separable, so sin runs once per column
+        # and cos once per row, and only their broadcast product is full size
+        x = np.linspace(0, 10, shape[1])
+        y = np.linspace(0, 10, shape[2])
+        freq = (np.arange(1, n_species + 1) * 0.5)[:, None, None]
+        sin_x = np.sin(x[None, None, :] * freq)  # (species, 1, width)
+        cos_y = np.cos(y[None, :, None] * freq)  # (species, height, 1)
+        species = np.abs(sin_x * cos_y * 50).astype('float32')
+
+        biomass_array[1:, :, :] = species
         # Store total biomass in first layer
-        biomass_array[0, :, :] = total_biomass
+        biomass_array[0, :, :] = species.sum(axis=0)
 
         # Add metadata to the group
-        root.attrs['crs'] = 'EPSG:32617'
-        root.attrs['num_species'] = n_species + 1
+        root.attrs.update({'crs': 'EPSG:32617', 'num_species': n_species + 1})
 
         # Create species metadata arrays
         species_codes = ['0000'] + [f'{i:04d}' for i in range(1, n_species + 1)]
@@ -382,7 +533,7 @@ def create_sample_zarr(output_path: Path, n_species: int = 3) -> Path:
 def print_zarr_info(zarr_path: Path) -> None:
     """Print information about a zarr store with error handling."""
     try:
-        store = zarr.storage.LocalStore(str(zarr_path))
+        store = zarr.storage.LocalStore(str(zarr_path), read_only=True)
         root = zarr.open_group(store=store, mode='r')
         biomass_array = root['biomass']
         console.print(f"\n[cyan]Zarr Store Info:[/cyan]")
@@ -396,60 +547,129 @@ def print_zarr_info(zarr_path: Path) -> None:
             num_species = root.attrs.get('num_species', 0)
             console.print(f"  Species: {num_species}")
             if num_species > 0:
-                species_list = []
-                for i in range(min(3, num_species)):  # Show first 3
-                    code = root['species_codes'][i]
-                    name = root['species_names'][i]
-                    if code:
-                        species_list.append(f"{code} ({name})")
+                # Show first 3, read with one slice per array rather than
+                # fetching and decoding the chunk once per element
+                n_shown = min(3, num_species)
+                codes = root['species_codes'][:n_shown]
+                names = root['species_names'][:n_shown]
+                species_list = [f"{code} ({name})" for code, name in zip(codes, names) if code]
                 if species_list:
                     console.print(f"    {', '.join(species_list)}{'...' if num_species > 3 else ''}")
     except Exception as e:
         console.print(f"[red]Error reading zarr store: {e}[/red]")
 
 
-def calculate_basic_stats(zarr_path: Path, sample_size: Optional[int] = 1000) -> Dict[str, Any]:
+def _summarize_block(block: np.ndarray) -> Tuple[int, float, float, float, int, int]:
+    """
+    Summarize a (layers, y, x) block with total biomass in layer 0.
+
+    Args:
+        block: Biomass block
+
+    Returns:
+        Forest pixel count, forest biomass sum, total biomass sum, maximum
+        biomass, forest richness sum and maximum richness
+    """
+    if _kernels.HAS_NUMBA:
+        # One fused pass, no mask or per-species temporaries
+        return _kernels.block_stats(block)
+
+    total_biomass = block[0]
+    forest_mask = total_biomass > 0
+    n_forest = int(np.count_nonzero(forest_mask))
+    forest_sum = float(total_biomass.sum(where=forest_mask, dtype=np.float64))
+    total_sum = float(total_biomass.sum(dtype=np.float64))
+    max_biomass = float(total_biomass.max())
+
+    richness_sum = max_richness = 0
+    if block.shape[0] > 1:
+        # Count layer by layer (skipping TOTAL) so only a 2D mask is live at a
+        # time rather than a boolean cube of every species
+        species_present = np.zeros(total_biomass.shape, dtype=np.int32)
+        for layer in block[1:]:
+            np.add(species_present, layer > 0, out=species_present)
+        richness_sum = int(species_present.sum(where=forest_mask))
+        max_richness = int(species_present.max())
+
+    return n_forest, forest_sum, total_sum, max_biomass, richness_sum, max_richness
+
+
+def calculate_basic_stats(
+    zarr_path: Path,
+    sample_size: Optional[int] = 1000,
+    config: Optional[AnalysisConfig] = None
+) -> Dict[str, Any]:
     """
     Calculate basic statistics from a zarr store.
 
+    Statistics are accumulated one spatial chunk at a time, with chunks
+    summarized concurrently. Each worker holds one chunk column (every
+    layer of one spatial chunk), so the number of workers is also limited
+    to the columns that fit in half the available memory, and never
+    exceeds ``config.max_workers``.
+
     Args:
         zarr_path: Path to zarr store group
         sample_size: Size of sample to use (None for full array)
+        config: Analysis configuration
 
     Returns:
         Dictionary of statistics
     """
+    if config is None:
+        config = AnalysisConfig()
+
     try:
-        store = zarr.storage.LocalStore(str(zarr_path))
+        store = zarr.storage.LocalStore(str(zarr_path), read_only=True)
         root = zarr.open_group(store=store, mode='r')
         z = root['biomass']
 
+        n_layers, height, width = z.shape
+        chunk_h, chunk_w = z.chunks[1:]
+
         # Sample data if specified
-        if sample_size and z.shape[1] > sample_size:
-            data = z[:, :sample_size, :sample_size]
+        if sample_size and height > sample_size:
+            height, width = sample_size, min(sample_size, width)
             console.print(f"Sampling {sample_size}x{sample_size} pixels for statistics")
-        else:
-            data = z[:]
 
-        # Calculate stats
-        total_biomass = data[0]
-        forest_mask = total_biomass > 0
-        forest_pixels = np.sum(forest_mask)
+        def summarize(origin: Tuple[int, int]) -> Tuple[int, float, float, float, int, int]:
+            y0, x0 = origin
+            return _summarize_block(z[:, y0:min(y0 + chunk_h, height), x0:min(x0 + chunk_w, width)])
+
+        # Chunks are read and summarized concurrently; the reductions
+        # release the GIL, so only one chunk column per worker is resident.
+        # The kernels stay serial under these threads (see _kernels)
+        origins = [(y0, x0) for y0 in range(0, height, chunk_h) for x0 in range(0, width, chunk_w)]
+        column_bytes = n_layers * min(chunk_h, height) * min(chunk_w, width) * z.dtype.itemsize
+        memory_workers = int(psutil.virtual_memory().available * 0.5 // max(1, column_bytes))
+        n_workers = max(1, min(config.max_workers, os.cpu_count() or 1,
+                               memory_workers, len(origins)))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            summaries = list(executor.map(summarize, origins))
+
+        forest_pixels = sum(summary[0] for summary in summaries)
+        forest_biomass = sum(summary[1] for summary in summaries)
+        total_sum = sum(summary[2] for summary in summaries)
+        max_biomass = max(summary[3] for summary in summaries)
+        richness_sum = sum(summary[4] for summary in summaries)
+        max_richness = max(summary[5] for summary in summaries)
+
+        total_pixels = height * width
+        has_forest = forest_pixels > 0
 
         stats = {
-            'total_pixels': total_biomass.size,
-            'forest_pixels': int(forest_pixels),
-            'forest_coverage_pct': 100 * forest_pixels / total_biomass.size,
-            'mean_biomass': float(np.mean(total_biomass[forest_mask])) if forest_pixels > 0 else 0,
-            'max_biomass': float(np.max(total_biomass)) if forest_pixels > 0 else 0,
-            'total_biomass_mg': float(np.sum(total_biomass))
+            'total_pixels': total_pixels,
+            'forest_pixels': forest_pixels,
+            'forest_coverage_pct': 100 * forest_pixels / total_pixels,
+            'mean_biomass': forest_biomass / forest_pixels if has_forest else 0,
+            'max_biomass': max_biomass if has_forest else 0,
+            'total_biomass_mg': total_sum
         }
 
         # Species richness
-        if data.shape[0] > 1:
-            species_present = np.sum(data[1:] > 0, axis=0)  # Skip TOTAL layer
-            stats['mean_richness'] = float(np.mean(species_present[forest_mask])) if forest_pixels > 0 else 0
-            stats['max_richness'] = int(np.max(species_present)) if forest_pixels > 0 else 0
+        if n_layers > 1:
+            stats['mean_richness'] = richness_sum / forest_pixels if has_forest else 0
+            stats['max_richness'] = max_richness if has_forest else 0
         else:
             stats['mean_richness'] = 0
             stats['max_richness'] = 0
@@ -459,7 +679,7 @@ def calculate_basic_stats(zarr_path: Path, sample_size: Optional[int] = 1000) ->
         console.print(f"  Forest coverage: {stats['forest_coverage_pct']:.1f}%")
         console.print(f"  Mean biomass: {stats['mean_biomass']:.2f} Mg/ha")
         console.print(f"  Max biomass: {stats['max_biomass']:.2f} Mg/ha")
-        if data.shape[0] > 1:
+        if n_layers > 1:
             console.print(f"  Mean species richness: {stats['mean_richness']:.2f}")
             console.print(f"  Max species richness: {stats['max_richness']}")
 
@@ -488,26 +708,45 @@ def add_zarr_metadata(
         transform: Affine transform
         bounds: Bounding box
     """
-    zarr_array.attrs.update({
+    metadata = {
         'species_codes': species_codes,
         'species_names': species_names,
-    })
+    }
 
     if crs is not None:
-        zarr_array.attrs['crs'] = str(crs)
+        metadata['crs'] = str(crs)
     if transform is not None:
-        zarr_array.attrs['transform'] = list(transform) if hasattr(transform, '__iter__') else transform
+        metadata['transform'] = list(transform) if hasattr(transform, '__iter__') else transform
     if bounds is not None:
-        zarr_array.attrs['bounds'] = list(bounds) if hasattr(bounds, '__iter__') else bounds
+        metadata['bounds'] = list(bounds) if hasattr(bounds, '__iter__') else bounds
 
-    zarr_array.attrs['description'] = 'Forest biomass by species'
-    zarr_array.attrs['units'] = 'Mg/ha'
+    metadata['description'] = 'Forest biomass by species'
+    metadata['units'] = 'Mg/ha'
+
+    # One attribute write instead of one metadata rewrite per key
+    zarr_array.attrs.update(metadata)
+
+
+# Available species codes per API instance, dropped with the instance
+_species_code_cache: "weakref.WeakKeyDictionary[Any, frozenset]" = weakref.WeakKeyDictionary()
+
+
+def _available_species_codes(api) -> frozenset:
+    """Get the set of species codes offered by an API instance, cached per instance."""
+    codes = _species_code_cache.get(api)
+    if codes is None:
+        codes = frozenset(s.species_code for s in api.list_species())
+        _species_code_cache[api] = codes
+    return codes
 
 
 def validate_species_codes(api, species_codes: List[str]) -> List[str]:
     """
     Validate species codes against available species.
 
+    The species list is fetched once per API instance and reused by later
+    validations.
+
     Args:
         api: BigMapAPI instance
         species_codes: List of species codes to validate
@@ -516,8 +755,7 @@ def validate_species_codes(api, species_codes: List[str]) -> List[str]:
         List of valid species codes
     """
     try:
-        all_species = api.list_species()
-        valid_codes = {s.species_code for s in all_species}
+        valid_codes = _available_species_codes(api)
 
         validated = []
         for code in species_codes:
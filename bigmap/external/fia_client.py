@@ -2,7 +2,11 @@
 REST API client for FIA BIGMAP ImageServer access.
 """
 
+import hashlib
 import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -19,12 +23,18 @@ from ..console import print_info, print_success, print_error, print_warning
 
 console = Console()
 
+# The species catalog only changes with a new BIGMAP release, so the raster
+# function list is kept on disk between runs and refreshed after this age
+SERVICE_CACHE_DIR = Path.home() / ".bigmap" / "service"
+SERVICE_CACHE_TTL = 30 * 24 * 3600  # seconds
+
 
 class BigMapRestClient:
     """Client for accessing FIA BIGMAP ImageServer REST API with proper retry and rate limiting."""
     
     def __init__(self, max_retries: int = 3, backoff_factor: float = 1.0, 
-                 timeout: int = 30, rate_limit_delay: float = 0.5):
+                 timeout: int = 30, rate_limit_delay: float = 0.5,
+                 max_workers: int = 4):
         """
         Initialize the REST client with retry and rate limiting configuration.
         
@@ -32,12 +42,18 @@ class BigMapRestClient:
             max_retries: Maximum number of retries for failed requests
             backoff_factor: Backoff factor for retry delays
             timeout: Request timeout in seconds
-            rate_limit_delay: Delay between requests in seconds
+            rate_limit_delay: Delay between request starts in seconds
+            max_workers: Number of concurrent exports in batch downloads
         """
         self.base_url = "https://di-usfsdata.img.arcgis.com/arcgis/rest/services/FIA_BIGMAP_2018_Tree_Species_Aboveground_Biomass/ImageServer"
         self.timeout = timeout
         self.rate_limit_delay = rate_limit_delay
+        self.max_workers = max(1, max_workers)
         self._last_request_time = 0
+        # Guards the rate limiter and the lazily fetched function list, which
+        # are shared by concurrent batch exports
+        self._rate_lock = threading.Lock()
+        self._functions_lock = threading.Lock()
         
         # Configure session with retry strategy
         self.session = requests.Session()
@@ -51,8 +67,10 @@ class BigMapRestClient:
             raise_on_status=False  # Don't raise on HTTP errors, let us handle them
         )
         
-        # Configure adapter with retry strategy
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Configure adapter with retry strategy; the pool keeps one reusable
+        # connection per concurrent export so each avoids a new TLS handshake
+        adapter = HTTPAdapter(max_retries=retry_strategy,
+                              pool_maxsize=max(10, self.max_workers))
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -66,11 +84,14 @@ class BigMapRestClient:
         
     def _rate_limited_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make a rate-limited request with proper error handling."""
-        # Implement rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
+        # Implement rate limiting: each request reserves the next start slot
+        # under the lock, so concurrent callers are spaced rate_limit_delay
+        # apart while their responses overlap
+        with self._rate_lock:
+            current_time = time.time()
+            sleep_time = self._last_request_time + self.rate_limit_delay - current_time
+            self._last_request_time = current_time + max(0.0, sleep_time)
+        if sleep_time > 0:
             print_info(f"Rate limiting: sleeping for {sleep_time:.2f}s")
             time.sleep(sleep_time)
         
@@ -80,7 +101,6 @@ class BigMapRestClient:
             
         try:
             response = self.session.request(method, url, **kwargs)
-            self._last_request_time = time.time()
             
             # Handle rate limiting responses
             if response.status_code == 429:
@@ -91,7 +111,6 @@ class BigMapRestClient:
                     time.sleep(sleep_time)
                     # Retry once after rate limit
                     response = self.session.request(method, url, **kwargs)
-                    self._last_request_time = time.time()
             
             return response
             
@@ -120,16 +139,50 @@ class BigMapRestClient:
     
     def get_species_functions(self) -> List[Dict]:
         """Get all available species raster functions."""
-        if self._species_functions is None:
-            info = self.get_service_info()
-            if 'rasterFunctionInfos' in info:
-                self._species_functions = info['rasterFunctionInfos']
-                print_success(f"Found {len(self._species_functions)} raster functions")
-            else:
-                self._species_functions = []
-                print_warning("No raster functions found in service info")
+        with self._functions_lock:
+            if self._species_functions is None:
+                functions = self._read_cached_functions()
+                if functions is None:
+                    info = self.get_service_info()
+                    if 'rasterFunctionInfos' in info:
+                        functions = info['rasterFunctionInfos']
+                        print_success(f"Found {len(functions)} raster functions")
+                        self._write_cached_functions(functions)
+                    else:
+                        functions = []
+                        print_warning("No raster functions found in service info")
+                self._species_functions = functions
         return self._species_functions
     
+    def _functions_cache_path(self) -> Path:
+        """Get the disk cache file for this service's raster functions."""
+        key = hashlib.sha256(self.base_url.encode()).hexdigest()[:16]
+        return SERVICE_CACHE_DIR / f"functions_{key}.json"
+    
+    def _read_cached_functions(self) -> Optional[List[Dict]]:
+        """Read the raster functions from disk if cached within the TTL."""
+        cache_path = self._functions_cache_path()
+        try:
+            if time.time() - cache_path.stat().st_mtime > SERVICE_CACHE_TTL:
+                return None
+            with open(cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_cached_functions(self, functions: List[Dict]) -> None:
+        """Write the raster functions to the disk cache, ignoring failures."""
+        cache_path = self._functions_cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a concurrent reader never sees a partial file
+            with tempfile.NamedTemporaryFile('w', dir=cache_path.parent,
+                                             suffix='.tmp', delete=False) as f:
+                json.dump(functions, f)
+            Path(f.name).replace(cache_path)
+        except OSError as e:
+            print_warning(f"Could not cache raster functions: {e}")
+    
     def list_available_species(self) -> List[Dict]:
         """Get list of all available species with codes and names."""
         functions = self.get_species_functions()
@@ -383,6 +436,11 @@ class BigMapRestClient:
         """
         Batch export multiple species for any geographic location.
         
+        Species are exported concurrently on ``max_workers`` threads sharing
+        the client's pooled session and rate limiter. The export service is
+        high-latency, so overlapping requests cuts wall time roughly by the
+        worker count. Files are returned in species code order.
+        
         Args:
             bbox: Bounding box in the specified CRS
             output_dir: Directory to save raster files
@@ -400,31 +458,39 @@ class BigMapRestClient:
             species_codes = [s['species_code'] for s in all_species]
         
         output_dir.mkdir(parents=True, exist_ok=True)
-        exported_files = []
+        results = {}
+        
+        def export(species_code: str) -> Optional[Path]:
+            return self.export_species_raster(
+                species_code=species_code,
+                bbox=bbox,
+                output_path=output_dir / f"{location_name}_species_{species_code}.tif",
+                bbox_srs=bbox_srs,
+                output_srs=output_srs
+            )
         
-        with Progress() as progress:
+        n_workers = max(1, min(self.max_workers, len(species_codes)))
+        with Progress() as progress, ThreadPoolExecutor(max_workers=n_workers) as executor:
             task = progress.add_task("Exporting species...", total=len(species_codes))
             
-            for species_code in species_codes:
-                output_file = output_dir / f"{location_name}_species_{species_code}.tif"
-                
+            futures = {
+                executor.submit(export, species_code): i
+                for i, species_code in enumerate(species_codes)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
                 try:
-                    result = self.export_species_raster(
-                        species_code=species_code,
-                        bbox=bbox,
-                        output_path=output_file,
-                        bbox_srs=bbox_srs,
-                        output_srs=output_srs
-                    )
+                    result = future.result()
                     
                     if result:
-                        exported_files.append(result)
+                        results[i] = result
                         
                 except Exception as e:
-                    print_warning(f"Failed to export species {species_code}: {e}")
+                    print_warning(f"Failed to export species {species_codes[i]}: {e}")
                 
                 progress.update(task, advance=1)
         
+        exported_files = [results[i] for i in sorted(results)]
         print_success(f"Exported {len(exported_files)} species rasters to {output_dir}")
         return exported_files
     
@@ -257,15 +257,18 @@ class LocationConfig:
         
         original_crs = gdf.crs
         
-        gdf_wgs84 = gdf.to_crs("EPSG:4326")
-        bounds_wgs84 = gdf_wgs84.total_bounds
+        if original_crs is None:
+            raise ValueError("Cannot set up bounding boxes for a GeoDataFrame without a CRS")
+        
+        # Only the extent is needed, so transform the (densified) bounding
+        # box rather than reprojecting every boundary vertex
+        bounds_wgs84 = transform_bounds(original_crs, "EPSG:4326", *bounds)
         self._config['bounding_boxes']['wgs84'] = {
             'xmin': float(bounds_wgs84[0]), 'ymin': float(bounds_wgs84[1]),
             'xmax': float(bounds_wgs84[2]), 'ymax': float(bounds_wgs84[3])
         }
         
-        gdf_mercator = gdf.to_crs("EPSG:3857")
-        bounds_mercator = gdf_mercator.total_bounds
+        bounds_mercator = transform_bounds(original_crs, "EPSG:3857", *bounds)
         self._config['bounding_boxes']['web_mercator'] = {
             'xmin': float(bounds_mercator[0]), 'ymin': float(bounds_mercator[1]),
             'xmax': float(bounds_mercator[2]), 'ymax': float(bounds_mercator[3])
@@ -3,30 +3,50 @@ Utilities for creating and managing Zarr stores for forest species data.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import zarr
 import zarr.storage
 import zarr.codecs
-import numcodecs
 import rasterio
 from rasterio.transform import Affine
 from rasterio.crs import CRS
+from rasterio.windows import Window
 import xarray as xr
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 
 console = Console()
 
+def _blosc_codec(compression: str, compression_level: int) -> zarr.codecs.BloscCodec:
+    """
+    Build the Blosc codec used for biomass arrays.
+    
+    Bitshuffle packs the mostly-zero float32 biomass into long runs of
+    identical bits, which zstd compresses far better than byte shuffle.
+    
+    Args:
+        compression: Blosc compressor name (e.g. 'zstd', 'lz4')
+        compression_level: Compression level
+        
+    Returns:
+        BloscCodec with bitshuffle enabled
+    """
+    return zarr.codecs.BloscCodec(
+        cname=compression, clevel=compression_level, shuffle='bitshuffle'
+    )
+
 
 def create_expandable_zarr_from_base_raster(
     base_raster_path: Union[str, Path],
     zarr_path: Union[str, Path],
     max_species: int = 350,
     chunk_size: Tuple[int, int, int] = (1, 1000, 1000),
-    compression: str = 'lz4',
-    compression_level: int = 5
+    compression: str = 'zstd',
+    compression_level: int = 3
 ) -> zarr.Group:
     """
     Create an expandable Zarr store from a base raster file.
@@ -52,9 +72,6 @@ def create_expandable_zarr_from_base_raster(
         transform = src.transform
         bounds = src.bounds
         dtype = src.dtypes[0]
-        
-        # Read the data
-        base_data = src.read(1)
     
     # Create Zarr store (Zarr v3 API)
     store = zarr.storage.LocalStore(zarr_path)
@@ -62,10 +79,7 @@ def create_expandable_zarr_from_base_raster(
     
     # Create the main data array
     # Use Zarr v3 codec instead of numcodecs
-    if compression == 'lz4':
-        codec = zarr.codecs.BloscCodec(cname='lz4', clevel=compression_level, shuffle='shuffle')
-    else:
-        codec = zarr.codecs.BloscCodec(cname=compression, clevel=compression_level, shuffle='shuffle')
+    codec = _blosc_codec(compression, compression_level)
     
     # Initialize with zeros
     data_array = root.create_array(
@@ -77,16 +91,23 @@ def create_expandable_zarr_from_base_raster(
         fill_value=0
     )
     
-    # Add the base data as the first layer (index 0 for total biomass)
-    data_array[0, :, :] = base_data
-    
-    # Store metadata
-    root.attrs['crs'] = crs.to_string()
-    root.attrs['transform'] = list(transform)
-    root.attrs['bounds'] = list(bounds)
-    root.attrs['width'] = width
-    root.attrs['height'] = height
-    root.attrs['num_species'] = 1  # Will be updated as species are added
+    # Add the base data as the first layer (index 0 for total biomass),
+    # copied in chunk-aligned row bands so memory stays bounded by one band
+    band_height = chunk_size[1]
+    with rasterio.open(base_raster_path) as src:
+        for r0 in range(0, height, band_height):
+            window = Window(0, r0, width, min(band_height, height - r0))
+            data_array[0, r0:r0 + window.height, :] = src.read(1, window=window)
+    
+    # Store metadata in one attribute write
+    root.attrs.update({
+        'crs': crs.to_string(),
+        'transform': list(transform),
+        'bounds': list(bounds),
+        'width': width,
+        'height': height,
+        'num_species': 1,  # Will be updated as species are added
+    })
     
     # Create species metadata arrays
     root.create_array(
@@ -114,6 +135,52 @@ def create_expandable_zarr_from_base_raster(
     return root
 
 
+def gdal_read_env(concurrency: int) -> rasterio.Env:
+    """
+    Get a rasterio environment for reads running on ``concurrency`` threads.
+    
+    GDAL decodes the blocks of a single read on ``GDAL_NUM_THREADS`` threads.
+    Each concurrent reader gets an equal share of the CPUs so readers and
+    GDAL's decode threads together do not oversubscribe them.
+    
+    GDAL is also told not to list the containing directory for sidecar
+    files when a raster is opened; species rasters usually share one
+    directory with hundreds of siblings, and every raster is opened at least
+    once per ingestion run. The block cache is left alone, as its size is
+    process-wide and fixed when GDAL first uses it.
+    
+    Args:
+        concurrency: Number of concurrent reader threads
+    """
+    return rasterio.Env(
+        GDAL_NUM_THREADS=max(1, (os.cpu_count() or 1) // concurrency),
+        GDAL_DISABLE_READDIR_ON_OPEN='EMPTY_DIR'
+    )
+
+
+def _validate_alignment(src, attrs, species_code: str) -> None:
+    """
+    Validate that an open raster is spatially aligned with a Zarr store.
+    
+    Args:
+        src: Open rasterio dataset
+        attrs: Attributes of the Zarr store root group
+        species_code: Species code used in error messages
+    """
+    zarr_transform = Affine(*attrs['transform'])
+    zarr_bounds = attrs['bounds']
+    zarr_crs = CRS.from_string(attrs['crs'])
+    
+    if not np.allclose(src.transform, zarr_transform, rtol=1e-5):
+        raise ValueError(f"Transform mismatch for species {species_code}")
+    
+    if not np.allclose(src.bounds, zarr_bounds, rtol=1e-5):
+        raise ValueError(f"Bounds mismatch for species {species_code}")
+    
+    if src.crs != zarr_crs:
+        console.print(f"[yellow]Warning: CRS mismatch. Expected {zarr_crs}, got {src.crs}")
+
+
 def append_species_to_zarr(
     zarr_path: Union[str, Path],
     species_raster_path: Union[str, Path],
@@ -124,6 +191,11 @@ def append_species_to_zarr(
     """
     Append a species raster to an existing Zarr store.
     
+    The raster is written into the next free layer, ``num_species``, of the
+    pre-sized ``biomass`` array. The array is never resized, so the store must
+    have been created with room for the new layer (see
+    ``create_expandable_zarr_from_base_raster``).
+    
     Args:
         zarr_path: Path to the existing Zarr store
         species_raster_path: Path to the species raster file
@@ -143,27 +215,18 @@ def append_species_to_zarr(
     # Get current number of species
     current_num = root.attrs['num_species']
     
-    # Read species raster
+    biomass = root['biomass']
+    
+    # Read species raster, validating before decoding any pixels. GDAL
+    # converts straight into the store dtype so no cast copy is made.
     with rasterio.open(species_raster_path) as src:
-        species_data = src.read(1)
-        
         if validate_alignment:
-            # Validate spatial alignment
-            zarr_transform = Affine(*root.attrs['transform'])
-            zarr_bounds = root.attrs['bounds']
-            zarr_crs = CRS.from_string(root.attrs['crs'])
-            
-            if not np.allclose(src.transform, zarr_transform, rtol=1e-5):
-                raise ValueError(f"Transform mismatch for species {species_code}")
-            
-            if not np.allclose(src.bounds, zarr_bounds, rtol=1e-5):
-                raise ValueError(f"Bounds mismatch for species {species_code}")
-            
-            if src.crs != zarr_crs:
-                console.print(f"[yellow]Warning: CRS mismatch. Expected {zarr_crs}, got {src.crs}")
+            _validate_alignment(src, root.attrs, species_code)
+        
+        species_data = src.read(1, out_dtype=biomass.dtype)
     
     # Add species data
-    root['biomass'][current_num, :, :] = species_data
+    biomass[current_num, :, :] = species_data
     
     # Update metadata
     root['species_codes'][current_num] = species_code
@@ -180,17 +243,23 @@ def batch_append_species_from_dir(
     raster_dir: Union[str, Path],
     species_mapping: Dict[str, str],
     pattern: str = "*.tif",
-    validate_alignment: bool = True
+    validate_alignment: bool = True,
+    max_workers: Optional[int] = None
 ) -> None:
     """
     Batch append multiple species rasters from a directory.
     
+    Rasters are validated and then read and written concurrently, each into
+    its own layer. Layers are assigned in sorted filename order and the
+    species metadata is written once at the end.
+    
     Args:
         zarr_path: Path to the existing Zarr store
         raster_dir: Directory containing species raster files
         species_mapping: Dictionary mapping species codes to names
         pattern: File pattern to match
         validate_alignment: Whether to validate spatial alignment
+        max_workers: Number of worker threads (None = CPU count)
     """
     raster_dir = Path(raster_dir)
     raster_files = sorted(raster_dir.glob(pattern))
@@ -201,6 +270,27 @@ def batch_append_species_from_dir(
     
     console.print(f"[cyan]Found {len(raster_files)} raster files to process")
     
+    store = zarr.storage.LocalStore(zarr_path)
+    root = zarr.open_group(store=store, mode='r+')
+    attrs = dict(root.attrs)
+    biomass = root['biomass']
+    start = attrs['num_species']
+    
+    def validate(raster_file: Path, species_code: str) -> None:
+        with gdal_read_env(n_workers), rasterio.open(raster_file) as src:
+            if validate_alignment:
+                _validate_alignment(src, attrs, species_code)
+    
+    def write(index: int, raster_file: Path) -> None:
+        if index >= biomass.shape[0]:
+            raise ValueError(f"Zarr store is full ({biomass.shape[0]} layers)")
+        with gdal_read_env(write_workers), rasterio.open(raster_file) as src:
+            biomass[index, :, :] = src.read(1, out_dtype=biomass.dtype)
+    
+    n_workers = max(1, min(max_workers or os.cpu_count() or 1, len(raster_files)))
+    # Concurrent layer writes only touch disjoint chunks when chunked one layer deep
+    write_workers = n_workers if biomass.chunks[0] == 1 else 1
+    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -210,33 +300,71 @@ def batch_append_species_from_dir(
     ) as progress:
         task = progress.add_task("Adding species to Zarr", total=len(raster_files))
         
+        # Match files to species codes
+        matched = []
         for raster_file in raster_files:
-            # Extract species code from filename
             filename = raster_file.stem
-            species_code = None
-            
-            # Try to find species code in filename
-            for code in species_mapping:
-                if code in filename:
-                    species_code = code
-                    break
+            species_code = next((code for code in species_mapping if code in filename), None)
             
             if species_code:
-                species_name = species_mapping[species_code]
+                matched.append((raster_file, species_code, species_mapping[species_code]))
+            else:
+                console.print(f"[yellow]Warning: Could not find species code in {filename}")
+                progress.update(task, advance=1)
+        
+        # Validate headers first so layers are only assigned to usable rasters
+        valid = []
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(validate, raster_file, code) for raster_file, code, _ in matched]
+            for (raster_file, species_code, species_name), future in zip(matched, futures):
                 try:
-                    append_species_to_zarr(
-                        zarr_path,
-                        raster_file,
-                        species_code,
-                        species_name,
-                        validate_alignment
-                    )
+                    future.result()
+                    valid.append((raster_file, species_code, species_name))
                 except Exception as e:
                     console.print(f"[red]Error adding {species_code}: {e}")
-            else:
-                console.print(f"[yellow]Warning: Could not find species code in {filename}")
-            
-            progress.update(task, advance=1)
+                    progress.update(task, advance=1)
+        
+        # Read and write each species into its layer
+        added = []
+        with ThreadPoolExecutor(max_workers=write_workers) as executor:
+            futures = {
+                executor.submit(write, start + offset, raster_file): offset
+                for offset, (raster_file, _, _) in enumerate(valid)
+            }
+            failed = set()
+            for future in as_completed(futures):
+                offset = futures[future]
+                species_code = valid[offset][1]
+                try:
+                    future.result()
+                except Exception as e:
+                    console.print(f"[red]Error adding {species_code}: {e}")
+                    failed.add(offset)
+                progress.update(task, advance=1)
+        
+        # Close gaps left by failed writes, keeping filename order
+        for offset, (raster_file, species_code, species_name) in enumerate(valid):
+            if offset in failed:
+                continue
+            index = start + len(added)
+            if index != start + offset:
+                biomass[index, :, :] = biomass[start + offset, :, :]
+            added.append((species_code, species_name))
+        
+        # Reset the vacated tail so no unlabelled species data is left behind
+        end = min(start + len(valid), biomass.shape[0])
+        if start + len(added) < end:
+            biomass[start + len(added):end, :, :] = biomass.fill_value or 0
+    
+    # Update metadata once for the whole batch
+    if added:
+        codes, names = zip(*added)
+        root['species_codes'][start:start + len(added)] = np.array(codes)
+        root['species_names'][start:start + len(added)] = np.array(names)
+        root.attrs['num_species'] = start + len(added)
+    
+    console.print(f"[green]✓ Added {len(added)} species at indices {start}-{start + len(added) - 1}"
+                  if added else "[yellow]No species were added")
 
 
 def create_zarr_from_geotiffs(
@@ -245,13 +373,19 @@ def create_zarr_from_geotiffs(
     species_codes: List[str],
     species_names: List[str],
     chunk_size: Tuple[int, int, int] = (1, 1000, 1000),
-    compression: str = 'lz4',
-    compression_level: int = 5,
-    include_total: bool = True
+    compression: str = 'zstd',
+    compression_level: int = 3,
+    include_total: bool = True,
+    max_workers: Optional[int] = None
 ) -> None:
     """
     Create a Zarr store from multiple GeoTIFF files.
     
+    GeoTIFFs are independent, so they are validated, then read and written
+    to their layers concurrently in chunk-aligned row bands. The total is
+    accumulated one band at a time, so memory use does not scale with the
+    full raster extent.
+    
     Args:
         output_zarr_path: Path for the output Zarr store
         geotiff_paths: List of paths to GeoTIFF files
@@ -261,6 +395,7 @@ def create_zarr_from_geotiffs(
         compression: Compression algorithm
         compression_level: Compression level
         include_total: Whether to calculate and include total biomass as first layer
+        max_workers: Number of worker threads (None = CPU count)
     """
     if len(geotiff_paths) != len(species_codes) or len(geotiff_paths) != len(species_names):
         raise ValueError("Number of paths, codes, and names must match")
@@ -285,10 +420,7 @@ def create_zarr_from_geotiffs(
     
     # Create main data array
     # Use Zarr v3 codec
-    if compression == 'lz4':
-        codec = zarr.codecs.BloscCodec(cname='lz4', clevel=compression_level, shuffle='shuffle')
-    else:
-        codec = zarr.codecs.BloscCodec(cname=compression, clevel=compression_level, shuffle='shuffle')
+    codec = _blosc_codec(compression, compression_level)
     
     data_array = root.create_array(
         'biomass',
@@ -314,51 +446,93 @@ def create_zarr_from_geotiffs(
         fill_value=''
     )
     
-    # Store spatial metadata
-    root.attrs['crs'] = crs.to_string()
-    root.attrs['transform'] = list(transform)
-    root.attrs['bounds'] = list(bounds)
-    root.attrs['width'] = width
-    root.attrs['height'] = height
+    # Store spatial metadata in one attribute write
+    root.attrs.update({
+        'crs': crs.to_string(),
+        'transform': list(transform),
+        'bounds': list(bounds),
+        'width': width,
+        'height': height,
+    })
     
     # Process each species
     start_idx = 1 if include_total else 0
-    total_biomass = np.zeros((height, width), dtype=dtype)
+    # Layers only map to disjoint chunks when chunked one layer deep
+    write_in_worker = chunk_size[0] == 1
+    n_workers = max(1, min(max_workers or os.cpu_count() or 1, len(geotiff_paths)))
+    
+    def load(idx: int, src, window: Window) -> np.ndarray:
+        # GDAL releases the GIL while reading
+        with gdal_read_env(n_workers):
+            data = src.read(1, window=window)
+        
+        if write_in_worker:
+            data_array[idx, window.row_off:window.row_off + window.height, :] = data
+        return data
     
-    with Progress(
+    # Stream row bands aligned to the chunks so only one band per in-flight
+    # raster and one band of the total are held in memory
+    band_height = chunk_size[1]
+    
+    with ExitStack() as datasets, Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         TimeRemainingColumn(),
         console=console
-    ) as progress:
-        task = progress.add_task("Processing species", total=len(geotiff_paths))
-        
-        for i, (path, code, name) in enumerate(zip(geotiff_paths, species_codes, species_names)):
-            with rasterio.open(path) as src:
-                data = src.read(1)
-                
-                # Validate alignment
+    ) as progress, ThreadPoolExecutor(max_workers=n_workers) as executor:
+        # Open each raster once and validate its alignment before writing
+        # anything. Within a band every raster is read by a single task and
+        # bands run one after another, so no handle is used by two threads
+        # at once.
+        handles = []
+        with gdal_read_env(n_workers):
+            for path, name in zip(geotiff_paths, species_names):
+                src = datasets.enter_context(rasterio.open(path))
                 if src.height != height or src.width != width:
                     raise ValueError(f"Dimension mismatch for {name}")
                 if not np.allclose(src.transform, transform, rtol=1e-5):
                     raise ValueError(f"Transform mismatch for {name}")
-                
-                # Add to zarr
-                idx = start_idx + i
-                data_array[idx, :, :] = data
-                codes_array[idx] = code
-                names_array[idx] = name
-                
-                # Accumulate for total
-                if include_total:
-                    total_biomass += data
-                
-                progress.update(task, advance=1)
+                handles.append(src)
+        
+        task = progress.add_task("Processing species", total=(height + band_height - 1) // band_height)
+        
+        for r0 in range(0, height, band_height):
+            r1 = min(r0 + band_height, height)
+            window = Window(0, r0, width, r1 - r0)
+            band_total = np.zeros((r1 - r0, width), dtype=dtype)
+            
+            futures = [
+                executor.submit(load, start_idx + i, src, window)
+                for i, src in enumerate(handles)
+            ]
+            try:
+                # Results are taken in layer order so the float total is
+                # summed in the same order on every run
+                for i, future in enumerate(futures):
+                    data = future.result()
+                    
+                    # Add to zarr
+                    if not write_in_worker:
+                        data_array[start_idx + i, r0:r1, :] = data
+                    
+                    # Accumulate for total
+                    if include_total:
+                        band_total += data
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            
+            if include_total:
+                data_array[0, r0:r1, :] = band_total
+            progress.update(task, advance=1)
+    
+    codes_array[start_idx:] = np.array(species_codes)
+    names_array[start_idx:] = np.array(species_names)
     
-    # Add total biomass if requested
+    # Label total biomass if requested
     if include_total:
-        data_array[0, :, :] = total_biomass
         codes_array[0] = '0000'
         names_array[0] = 'Total Biomass'
     
@@ -381,24 +555,27 @@ def validate_zarr_store(zarr_path: Union[str, Path]) -> Dict:
     """
     store = zarr.storage.LocalStore(zarr_path)
     root = zarr.open_group(store=store, mode='r')
+    # Open the array and read attributes once; each lookup re-reads the store
+    biomass = root['biomass']
+    attrs = dict(root.attrs)
     
     info = {
         'path': str(zarr_path),
-        'shape': root['biomass'].shape,
-        'chunks': root['biomass'].chunks,
-        'dtype': str(root['biomass'].dtype),
-        'compression': 'blosc' if hasattr(root['biomass'], 'codecs') else None,
-        'num_species': root.attrs.get('num_species', 0),
-        'crs': root.attrs.get('crs'),
-        'bounds': root.attrs.get('bounds'),
+        'shape': biomass.shape,
+        'chunks': biomass.chunks,
+        'dtype': str(biomass.dtype),
+        'compression': 'blosc' if hasattr(biomass, 'codecs') else None,
+        'num_species': attrs.get('num_species', 0),
+        'crs': attrs.get('crs'),
+        'bounds': attrs.get('bounds'),
         'species': []
     }
     
-    # Get species information
+    # Get species information, reading each metadata array with one slice
     if 'species_codes' in root and 'species_names' in root:
-        for i in range(info['num_species']):
-            code = root['species_codes'][i]
-            name = root['species_names'][i]
+        codes = root['species_codes'][:info['num_species']]
+        names = root['species_names'][:info['num_species']]
+        for i, (code, name) in enumerate(zip(codes, names)):
             if code:  # Skip empty entries
                 info['species'].append({
                     'index': i,
@@ -2,6 +2,7 @@
 Utilities for loading and plotting geographic boundaries.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 import warnings
@@ -134,6 +135,7 @@ def download_boundaries(boundary_type: str = 'states', force: bool = False) -> P
             
             # Save as GeoPackage for faster access
             gdf.to_file(cache_path, driver='GPKG')
+            _clear_boundary_caches(boundary_type)
 
             console.print(f"[green]✓ Downloaded and cached boundaries[/green]")
             return cache_path
@@ -151,6 +153,63 @@ def download_boundaries(boundary_type: str = 'states', force: bool = False) -> P
         raise
 
 
+def _clear_boundary_caches(boundary_type: str) -> None:
+    """
+    Drop cached subsets derived from a boundary file that was replaced.
+    
+    Removes the per-subset files on disk and clears the in-process caches
+    of projected boundaries.
+    
+    Args:
+        boundary_type: Type of boundaries whose national file changed
+    """
+    stem = Path(BOUNDARY_SOURCES[boundary_type]['cache_name']).stem
+    for subset_path in BOUNDARY_CACHE_DIR.glob(f"{stem}_*.gpkg"):
+        try:
+            subset_path.unlink()
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not remove stale boundary subset: {e}[/yellow]")
+    _load_state_projected.cache_clear()
+    _load_counties_projected.cache_clear()
+
+
+def _load_cached_subset(
+    boundary_type: str,
+    key: str,
+    select
+) -> gpd.GeoDataFrame:
+    """
+    Load a subset of a boundary file, cached on disk as its own file.
+    
+    The national boundary files are read in full only the first time a
+    subset is requested; later calls read the small per-subset file. A
+    subset is refreshed when the national file is newer than it.
+    
+    Args:
+        boundary_type: Type of boundaries to use
+        key: Name identifying the subset (e.g. state abbreviation)
+        select: Function selecting the subset rows from the full GeoDataFrame
+        
+    Returns:
+        GeoDataFrame with the selected features
+    """
+    boundary_path = download_boundaries(boundary_type)
+    stem = Path(BOUNDARY_SOURCES[boundary_type]['cache_name']).stem
+    slug = key.lower().replace(' ', '_')
+    subset_path = BOUNDARY_CACHE_DIR / f"{stem}_{slug}.gpkg"
+    
+    if subset_path.exists() and subset_path.stat().st_mtime >= boundary_path.stat().st_mtime:
+        return gpd.read_file(subset_path)
+    
+    subset = select(gpd.read_file(boundary_path)).copy()
+    if not subset.empty:
+        try:
+            subset.to_file(subset_path, driver='GPKG')
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not cache boundary subset: {e}[/yellow]")
+    return subset
+
+
 def load_state_boundary(
     state: str,
     crs: Optional[Union[str, CRS]] = None,
@@ -183,34 +242,65 @@ def load_state_boundary(
                 state_name = name.title()
                 break
     
-    # Download/load boundaries
-    boundary_path = download_boundaries(boundary_type)
-    gdf = gpd.read_file(boundary_path)
+    if crs is not None:
+        crs = CRS.from_user_input(crs).to_string()
+    
+    state_gdf = _load_state_projected(state_abbr, state_name, boundary_type,
+                                      simplify_tolerance, crs)
+    if state_gdf.empty:
+        raise ValueError(f"State not found: {state}")
+    
+    # Callers may modify the result, so hand out a copy of the cached frame
+    return state_gdf.copy()
+
+
+@lru_cache(maxsize=32)
+def _load_state_projected(
+    state_abbr: str,
+    state_name: Optional[str],
+    boundary_type: str,
+    simplify_tolerance: Optional[float],
+    crs: Optional[str]
+) -> gpd.GeoDataFrame:
+    """
+    Load, simplify and reproject one state's boundary, memoized per process.
     
+    Repeated maps of the same state in the same CRS reuse the projected
+    geometry instead of rebuilding the transformation for every call.
+    """
     # Filter for state
     source = BOUNDARY_SOURCES[boundary_type]
-    if state_name:
-        state_gdf = gdf[
-            (gdf[source['name_field']].str.lower() == state_name.lower()) |
-            (gdf[source['abbr_field']] == state_abbr)
-        ].copy()
-    else:
-        state_gdf = gdf[gdf[source['abbr_field']] == state_abbr].copy()
     
+    def select(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        if state_name:
+            return gdf[
+                (gdf[source['name_field']].str.lower() == state_name.lower()) |
+                (gdf[source['abbr_field']] == state_abbr)
+            ]
+        return gdf[gdf[source['abbr_field']] == state_abbr]
+    
+    state_gdf = _load_cached_subset(boundary_type, state_abbr, select)
     if state_gdf.empty:
-        raise ValueError(f"State not found: {state}")
+        return state_gdf
     
+    return _simplify_and_project(state_gdf, simplify_tolerance, crs)
+
+
+def _simplify_and_project(
+    gdf: gpd.GeoDataFrame,
+    simplify_tolerance: Optional[float],
+    crs: Optional[str]
+) -> gpd.GeoDataFrame:
+    """Simplify geometries and reproject them unless already in ``crs``."""
     # Simplify if requested
     if simplify_tolerance is not None:
-        state_gdf['geometry'] = state_gdf['geometry'].simplify(simplify_tolerance)
+        gdf['geometry'] = gdf['geometry'].simplify(simplify_tolerance)
     
     # Reproject if needed
-    if crs is not None:
-        if isinstance(crs, str):
-            crs = CRS.from_string(crs)
-        state_gdf = state_gdf.to_crs(crs.to_string())
+    if crs is not None and gdf.crs != crs:
+        gdf = gdf.to_crs(crs)
     
-    return state_gdf
+    return gdf
 
 
 def load_counties_for_state(
@@ -245,28 +335,34 @@ def load_counties_for_state(
     if not state_name:
         raise ValueError(f"State not found: {state}")
     
-    # Download/load boundaries
-    boundary_path = download_boundaries('counties')
-    gdf = gpd.read_file(boundary_path)
-    
-    # Filter for state
-    source = BOUNDARY_SOURCES['counties']
-    counties_gdf = gdf[gdf[source['state_field']].str.lower() == state_name.lower()].copy()
+    if crs is not None:
+        crs = CRS.from_user_input(crs).to_string()
     
+    counties_gdf = _load_counties_projected(state_name, simplify_tolerance, crs)
     if counties_gdf.empty:
         raise ValueError(f"No counties found for state: {state}")
     
-    # Simplify if requested
-    if simplify_tolerance is not None:
-        counties_gdf['geometry'] = counties_gdf['geometry'].simplify(simplify_tolerance)
-    
-    # Reproject if needed
-    if crs is not None:
-        if isinstance(crs, str):
-            crs = CRS.from_string(crs)
-        counties_gdf = counties_gdf.to_crs(crs.to_string())
+    return counties_gdf.copy()
+
+
+@lru_cache(maxsize=32)
+def _load_counties_projected(
+    state_name: str,
+    simplify_tolerance: Optional[float],
+    crs: Optional[str]
+) -> gpd.GeoDataFrame:
+    """Load, simplify and reproject one state's counties, memoized per process."""
+    # Filter for state
+    source = BOUNDARY_SOURCES['counties']
+    counties_gdf = _load_cached_subset(
+        'counties',
+        state_name,
+        lambda gdf: gdf[gdf[source['state_field']].str.lower() == state_name.lower()]
+    )
+    if counties_gdf.empty:
+        return counties_gdf
     
-    return counties_gdf
+    return _simplify_and_project(counties_gdf, simplify_tolerance, crs)
 
 
 def plot_boundaries(
@@ -415,9 +511,16 @@ def clip_boundaries_to_extent(
         ymax + buffer
     )
     
+    # Drop geometries whose bounding box misses the clip box using the
+    # spatial index, so the exact intersection only runs on candidates
+    candidates = boundaries.cx[
+        xmin - buffer:xmax + buffer,
+        ymin - buffer:ymax + buffer
+    ]
+    
     # Clip boundaries
-    clipped = boundaries.copy()
-    clipped['geometry'] = boundaries.intersection(clip_box)
+    clipped = candidates.copy()
+    clipped['geometry'] = candidates.intersection(clip_box)
     
     # Remove empty geometries
     clipped = clipped[~clipped['geometry'].is_empty]
@@ -24,6 +24,11 @@ from .boundaries import (
 
 console = Console()
 
+# Longest raster edge passed to imshow. A 12x10 inch map saved at 300 DPI is
+# 3600x3000 pixels, so larger rasters are reduced before plotting instead of
+# being decimated by matplotlib at far higher cost.
+MAX_DISPLAY_PIXELS = 4000
+
 
 class ZarrMapper:
     """Main class for creating maps from Zarr stores."""
@@ -48,15 +53,22 @@ class ZarrMapper:
         self.species_codes = self.root.get('species_codes', [])
         self.species_names = self.root.get('species_names', [])
         
-        # Get metadata
-        self.crs = CRS.from_string(self.root.attrs.get('crs', 'EPSG:3857'))
-        self.transform = Affine(*self.root.attrs.get('transform', [1, 0, 0, 0, -1, 0]))
-        self.bounds = self.root.attrs.get('bounds', [0, 0, 1, 1])
-        self.num_species = self.root.attrs.get('num_species', self.biomass.shape[0])
+        # Get metadata (snapshot attrs once; each attrs lookup re-reads the store)
+        self.attrs = dict(self.root.attrs)
+        self.crs = CRS.from_string(self.attrs.get('crs', 'EPSG:3857'))
+        self.transform = Affine(*self.attrs.get('transform', [1, 0, 0, 0, -1, 0]))
+        self.bounds = self.attrs.get('bounds', [0, 0, 1, 1])
+        self.num_species = self.attrs.get('num_species', self.biomass.shape[0])
         
         # Cache for computed indices
         self._diversity_cache = {}
         
+        # Cache for state boundaries projected and clipped to this grid
+        self._boundary_cache = {}
+        
+        # Species codes as a NumPy array, read on first code lookup
+        self._species_code_array = None
+        
         console.print(f"[green]Loaded Zarr store:[/green] {self.zarr_path}")
         console.print(f"  Shape: {self.biomass.shape}")
         console.print(f"  CRS: {self.crs}")
@@ -64,11 +76,14 @@ class ZarrMapper:
     
     def get_species_info(self) -> List[Dict[str, Any]]:
         """Get information about all species in the store."""
+        # Read each metadata array with one slice instead of per element
+        codes = self.species_codes[:self.num_species]
+        names = self.species_names[:self.num_species]
         species_info = []
         for i in range(self.num_species):
             try:
-                code = str(self.species_codes[i])
-                name = str(self.species_names[i])
+                code = str(codes[i])
+                name = str(names[i])
             except (IndexError, KeyError):
                 code = f"{i:04d}"
                 name = f"Species {i}"
@@ -79,6 +94,23 @@ class ZarrMapper:
             })
         return species_info
     
+    def _find_species_index(self, code: str) -> Optional[int]:
+        """
+        Find the layer index of a species code.
+        
+        Args:
+            code: Species code to look up
+            
+        Returns:
+            Index of the first layer with this code, or None if absent
+        """
+        if self._species_code_array is None:
+            self._species_code_array = np.asarray(
+                self.species_codes[:self.num_species]
+            ).astype(str)
+        matches = np.flatnonzero(self._species_code_array == code)
+        return int(matches[0]) if matches.size else None
+    
     def _get_extent(self, transform: Optional[Affine] = None) -> Tuple[float, float, float, float]:
         """Get the extent for matplotlib plotting."""
         if transform is None:
@@ -94,26 +126,121 @@ class ZarrMapper:
         
         return (left, right, bottom, top)
     
+    def _get_tile_shape(self, target: int = 1024) -> Tuple[int, int]:
+        """
+        Get a processing tile shape aligned to the biomass chunk grid.
+
+        Tiles are the largest multiple of the on-disk chunk size not exceeding
+        ``target`` (but at least one chunk), so each tile read decompresses
+        whole chunks only once.
+
+        Args:
+            target: Desired tile edge length in pixels
+
+        Returns:
+            Tuple of (tile_height, tile_width)
+        """
+        _, chunk_y, chunk_x = self.biomass.chunks
+        tile_y = max(chunk_y, (target // chunk_y) * chunk_y)
+        tile_x = max(chunk_x, (target // chunk_x) * chunk_x)
+        return tile_y, tile_x
+    
+    def _get_state_boundary(self, state: str,
+                            extent: Tuple[float, float, float, float]):
+        """
+        Load a state boundary in the store CRS, clipped to the map extent.
+        
+        Every map of this store shares the same grid, so the reprojected and
+        clipped boundary is computed once per state and extent and reused.
+        
+        Args:
+            state: State name or abbreviation
+            extent: Map extent (left, right, bottom, top)
+            
+        Returns:
+            GeoDataFrame with the clipped boundary
+        """
+        key = (state, tuple(extent))
+        if key not in self._boundary_cache:
+            state_gdf = load_state_boundary(
+                state,
+                crs=self.crs,
+                boundary_type='states',
+                simplify_tolerance=1000  # Simplify for performance
+            )
+            self._boundary_cache[key] = clip_boundaries_to_extent(
+                state_gdf,
+                (extent[0], extent[1], extent[2], extent[3]),
+                buffer=50000  # 50km buffer
+            )
+        return self._boundary_cache[key]
+    
+    @staticmethod
+    def _downsample_for_display(data: np.ndarray, method: str = 'mean') -> np.ndarray:
+        """
+        Reduce a raster to at most ``MAX_DISPLAY_PIXELS`` along each edge.
+        
+        Args:
+            data: 2D array to display
+            method: 'mean' for block means (continuous data) or 'nearest'
+                to take every n-th pixel (class data such as richness)
+            
+        Returns:
+            The input array if it already fits, otherwise the reduced array
+        """
+        height, width = data.shape
+        factor_y = -(-height // MAX_DISPLAY_PIXELS)
+        factor_x = -(-width // MAX_DISPLAY_PIXELS)
+        if factor_y == 1 and factor_x == 1:
+            return data
+        
+        if method == 'nearest':
+            return data[::factor_y, ::factor_x]
+        
+        # Pad ragged edges with NaN so every block has the same shape; the
+        # NaN-aware mean then averages only the real pixels of edge blocks
+        out_h = -(-height // factor_y)
+        out_w = -(-width // factor_x)
+        if out_h * factor_y != height or out_w * factor_x != width:
+            padded = np.full((out_h * factor_y, out_w * factor_x), np.nan, dtype=np.float32)
+            padded[:height, :width] = data
+            data = padded
+        blocks = data.reshape(out_h, factor_y, out_w, factor_x)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.nanmean(blocks, axis=(1, 3), dtype=np.float32)
+    
+    @staticmethod
+    def _finite_values(data: np.ndarray) -> np.ndarray:
+        """Get the finite values of an array, without a copy if all are finite."""
+        valid_mask = np.isfinite(data)
+        if valid_mask.all():
+            return data.ravel()
+        return data[valid_mask]
+    
     def _normalize_data(self, data: np.ndarray, vmin: Optional[float] = None, 
                        vmax: Optional[float] = None, percentile: Tuple[float, float] = (2, 98)) -> np.ndarray:
         """Normalize data for visualization."""
-        # Handle NaN and infinite values
-        valid_mask = np.isfinite(data)
-        
         if vmin is None or vmax is None:
-            valid_data = data[valid_mask]
+            # Handle NaN and infinite values; both bounds come from one
+            # percentile call, so the valid data is partitioned only once
+            valid_data = self._finite_values(data)
             if len(valid_data) > 0:
+                low, high = np.percentile(valid_data, percentile)
                 if vmin is None:
-                    vmin = np.percentile(valid_data, percentile[0])
+                    vmin = low
                 if vmax is None:
-                    vmax = np.percentile(valid_data, percentile[1])
+                    vmax = high
             else:
                 vmin, vmax = 0, 1
         
-        # Clip and normalize
+        # Clip and normalize in place on the clipped copy
         normalized = np.clip(data, vmin, vmax)
         if vmax > vmin:
-            normalized = (normalized - vmin) / (vmax - vmin)
+            if not np.issubdtype(normalized.dtype, np.floating):
+                normalized = normalized.astype(np.float64)
+            normalized -= vmin
+            normalized /= vmax - vmin
         else:
             normalized = np.zeros_like(data)
         
@@ -154,11 +281,7 @@ class ZarrMapper:
         """
         # Find species index
         if isinstance(species, str):
-            species_idx = None
-            for i in range(self.num_species):
-                if str(self.species_codes[i]) == species:
-                    species_idx = i
-                    break
+            species_idx = self._find_species_index(species)
             if species_idx is None:
                 raise ValueError(f"Species code '{species}' not found")
         else:
@@ -185,8 +308,8 @@ class ZarrMapper:
         console.print(f"Loading data for {species_name}...")
         data = self.biomass[species_idx, :, :]
         
-        # Normalize data
-        data_norm = self._normalize_data(data, vmin, vmax)
+        # Normalize data, then reduce it to the resolution the figure can show
+        data_norm = self._downsample_for_display(self._normalize_data(data, vmin, vmax))
         
         # Get extent
         extent = self._get_extent()
@@ -209,20 +332,7 @@ class ZarrMapper:
         # Add state boundary if requested
         if state_boundary:
             try:
-                # Load boundary
-                state_gdf = load_state_boundary(
-                    state_boundary, 
-                    crs=self.crs,
-                    boundary_type='states',
-                    simplify_tolerance=1000  # Simplify for performance
-                )
-                
-                # Clip to extent with buffer
-                state_gdf = clip_boundaries_to_extent(
-                    state_gdf,
-                    (extent[0], extent[1], extent[2], extent[3]),
-                    buffer=50000  # 50km buffer
-                )
+                state_gdf = self._get_state_boundary(state_boundary, extent)
                 
                 # Plot boundary
                 plot_boundaries(
@@ -309,13 +419,13 @@ class ZarrMapper:
             # Initialize diversity array
             diversity_index = np.zeros((self.biomass.shape[1], self.biomass.shape[2]), dtype=np.float32)
             
-            # Process in chunks for memory efficiency
-            chunk_size = 1000
-            for i in range(0, self.biomass.shape[1], chunk_size):
-                for j in range(0, self.biomass.shape[2], chunk_size):
+            # Process in chunk-aligned tiles for memory efficiency
+            tile_y, tile_x = self._get_tile_shape()
+            for i in range(0, self.biomass.shape[1], tile_y):
+                for j in range(0, self.biomass.shape[2], tile_x):
                     # Get chunk bounds
-                    i_end = min(i + chunk_size, self.biomass.shape[1])
-                    j_end = min(j + chunk_size, self.biomass.shape[2])
+                    i_end = min(i + tile_y, self.biomass.shape[1])
+                    j_end = min(j + tile_x, self.biomass.shape[2])
                     
                     # Load chunk data for all species
                     chunk_data = self.biomass[start_idx:self.num_species, i:i_end, j:j_end]
@@ -351,8 +461,8 @@ class ZarrMapper:
         else:
             fig, ax = fig_ax
         
-        # Normalize data
-        data_norm = self._normalize_data(diversity_index, vmin, vmax)
+        # Normalize data, then reduce it to the resolution the figure can show
+        data_norm = self._downsample_for_display(self._normalize_data(diversity_index, vmin, vmax))
         
         # Get extent
         extent = self._get_extent()
@@ -372,17 +482,7 @@ class ZarrMapper:
         # Add state boundary if requested
         if state_boundary:
             try:
-                state_gdf = load_state_boundary(
-                    state_boundary, 
-                    crs=self.crs,
-                    boundary_type='states',
-                    simplify_tolerance=1000
-                )
-                state_gdf = clip_boundaries_to_extent(
-                    state_gdf,
-                    (extent[0], extent[1], extent[2], extent[3]),
-                    buffer=50000
-                )
+                state_gdf = self._get_state_boundary(state_boundary, extent)
                 plot_boundaries(
                     ax, state_gdf,
                     color='black',
@@ -451,16 +551,17 @@ class ZarrMapper:
         # Calculate richness
         richness = np.zeros((self.biomass.shape[1], self.biomass.shape[2]), dtype=np.uint8)
         
-        # Process in chunks
-        chunk_size = 1000
-        for i in range(0, self.biomass.shape[1], chunk_size):
-            for j in range(0, self.biomass.shape[2], chunk_size):
-                i_end = min(i + chunk_size, self.biomass.shape[1])
-                j_end = min(j + chunk_size, self.biomass.shape[2])
+        # Process in chunk-aligned tiles
+        tile_y, tile_x = self._get_tile_shape()
+        for i in range(0, self.biomass.shape[1], tile_y):
+            for j in range(0, self.biomass.shape[2], tile_x):
+                i_end = min(i + tile_y, self.biomass.shape[1])
+                j_end = min(j + tile_x, self.biomass.shape[2])
                 
                 # Count species above threshold
                 chunk_data = self.biomass[start_idx:self.num_species, i:i_end, j:j_end]
-                richness[i:i_end, j:j_end] = np.sum(chunk_data > threshold, axis=0)
+                np.add.reduce(chunk_data > threshold, axis=0, dtype=np.uint8,
+                              out=richness[i:i_end, j:j_end])
         
         # Create figure if not provided
         if fig_ax is None:
@@ -479,25 +580,17 @@ class ZarrMapper:
         else:
             alpha = 1.0
         
-        # Create the map
-        im = ax.imshow(richness, cmap=cmap, extent=extent, origin='upper',
+        # Create the map; richness is a count, so it is subsampled rather
+        # than averaged when the raster exceeds the display resolution
+        display = self._downsample_for_display(richness, method='nearest')
+        im = ax.imshow(display, cmap=cmap, extent=extent, origin='upper',
                       interpolation='nearest', aspect='equal',
                       vmin=vmin, vmax=vmax, alpha=alpha)
         
         # Add state boundary if requested
         if state_boundary:
             try:
-                state_gdf = load_state_boundary(
-                    state_boundary, 
-                    crs=self.crs,
-                    boundary_type='states',
-                    simplify_tolerance=1000
-                )
-                state_gdf = clip_boundaries_to_extent(
-                    state_gdf,
-                    (extent[0], extent[1], extent[2], extent[3]),
-                    buffer=50000
-                )
+                state_gdf = self._get_state_boundary(state_boundary, extent)
                 plot_boundaries(
                     ax, state_gdf,
                     color='black',
@@ -572,18 +665,16 @@ class ZarrMapper:
             
             for species in species_list:
                 if isinstance(species, str):
-                    for i in range(self.num_species):
-                        if str(self.species_codes[i]) == species:
-                            species_idx = i
-                            break
+                    species_idx = self._find_species_index(species)
                 else:
                     species_idx = species
                 
                 data = self.biomass[species_idx, :, :]
-                valid_data = data[np.isfinite(data)]
+                valid_data = self._finite_values(data)
                 if len(valid_data) > 0:
-                    global_min = min(global_min, np.percentile(valid_data, 2))
-                    global_max = max(global_max, np.percentile(valid_data, 98))
+                    low, high = np.percentile(valid_data, [2, 98])
+                    global_min = min(global_min, low)
+                    global_max = max(global_max, high)
         else:
             global_min = None
             global_max = None
@@ -74,19 +74,20 @@ def analyze_species_proportions(zarr_path: Path):
         console.print("[red]No forest pixels found[/red]")
         return
 
-    # Calculate proportions for each species
+    # Calculate proportions for each species over the forest pixels only,
+    # compacting the total once instead of per species and statistic
+    forest_total = total_biomass[forest_mask]
     species_stats = []
     for i in range(1, len(species_codes)):  # Skip TOTAL
         species_biomass = sample[i]
 
         if np.sum(species_biomass) > 0:
             # Calculate proportion
-            proportions = np.zeros_like(total_biomass)
-            proportions[forest_mask] = species_biomass[forest_mask] / total_biomass[forest_mask]
+            proportions = species_biomass[forest_mask] / forest_total
 
             # Statistics
-            mean_prop = np.mean(proportions[forest_mask])
-            max_prop = np.max(proportions[forest_mask])
+            mean_prop = np.mean(proportions)
+            max_prop = np.max(proportions)
             coverage = np.sum(species_biomass > 0) / forest_pixels * 100
 
             species_stats.append({
@@ -317,8 +318,11 @@ def identify_diversity_hotspots(zarr_path: Path):
             mask = (p > 0) & forest_mask
             shannon[mask] -= p[mask] * np.log(p[mask])
 
+        # Forest values are reused for the threshold and the statistics
+        forest_shannon = shannon[forest_mask]
+
         # Find hotspots (top 10%)
-        threshold = np.percentile(shannon[forest_mask], 90)
+        threshold = np.percentile(forest_shannon, 90)
         hotspots = shannon > threshold
         hotspot_pixels = np.sum(hotspots)
 
@@ -329,9 +333,9 @@ def identify_diversity_hotspots(zarr_path: Path):
 
         # Stats
         console.print(f"\n[yellow]Shannon Diversity Statistics:[/yellow]")
-        console.print(f"  Mean: {np.mean(shannon[forest_mask]):.3f}")
+        console.print(f"  Mean: {np.mean(forest_shannon):.3f}")
         console.print(f"  Max: {np.max(shannon):.3f}")
-        console.print(f"  Std: {np.std(shannon[forest_mask]):.3f}")
+        console.print(f"  Std: {np.std(forest_shannon):.3f}")
 
 
 def run_comprehensive_analysis(zarr_path: Path):
@@ -16,6 +16,14 @@ import zarr
 from bigmap.config import BigMapSettings, CalculationConfig
 
 
+@pytest.fixture(autouse=True)
+def isolated_service_cache(tmp_path: Path, monkeypatch) -> Path:
+    """Keep the REST client's disk cache out of the user's home directory."""
+    cache_dir = tmp_path / "service_cache"
+    monkeypatch.setattr("bigmap.external.fia_client.SERVICE_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
     """Create a temporary directory for test files."""
@@ -274,7 +274,7 @@ class TestExampleIntegration:
         # Test default config
         config = AnalysisConfig()
         assert config.biomass_threshold == 1.0
-        assert config.chunk_size == (1, 1000, 1000)
+        assert config.chunk_size == (1, 2048, 2048)
 
         # Test custom config
         custom_config = AnalysisConfig(
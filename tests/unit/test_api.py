@@ -57,6 +57,36 @@ calculations:
         assert len(api.settings.calculations) == 1
         assert api.settings.calculations[0].name == "species_richness"
 
+    def test_settings_create_directories_on_request(self, temp_dir):
+        """Test settings only create their directories when asked to."""
+        settings = BigMapSettings(
+            data_dir=temp_dir / "data",
+            output_dir=temp_dir / "output",
+            cache_dir=temp_dir / "cache"
+        )
+        assert not settings.output_dir.exists()
+
+        settings.ensure_directories()
+
+        assert settings.data_dir.is_dir()
+        assert settings.output_dir.is_dir()
+        assert settings.cache_dir.is_dir()
+
+    def test_api_and_temp_paths_create_directories(self, temp_dir):
+        """Test the API and temp paths guarantee the directories they use exist."""
+        settings = BigMapSettings(
+            data_dir=temp_dir / "data",
+            output_dir=temp_dir / "output",
+            cache_dir=temp_dir / "cache"
+        )
+        BigMapAPI(config=settings)
+        assert settings.output_dir.is_dir()
+
+        settings.cache_dir.rmdir()
+        path = settings.get_temp_path("scratch.tif")
+        assert path.parent == settings.cache_dir
+        assert settings.cache_dir.is_dir()
+
     def test_lazy_loading_rest_client(self):
         """Test lazy loading of REST client."""
         api = BigMapAPI()
@@ -913,6 +943,14 @@ class TestBigMapAPIEdgeCasesAndMissingCoverage:
         assert len(species_codes) == 4
         assert len(species_names) == 4
 
+    def test_parse_species_filename(self):
+        """Test the regex filename parser used by create_zarr."""
+        from bigmap.api import _parse_species_filename
+
+        assert _parse_species_filename("species_1234_common_name") == ("1234", "Common Name")
+        assert _parse_species_filename("0999_short") == ("0999", "Short")
+        assert _parse_species_filename("no_code_file") == ("no_c", "No_Code_File")
+
     def test_calculate_metrics_with_settings_object_config(self, temp_dir):
         """Test calculate_metrics with BigMapSettings object as config."""
         api = BigMapAPI()
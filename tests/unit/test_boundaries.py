@@ -0,0 +1,90 @@
+"""
+Tests for the boundary loading caches in bigmap.visualization.boundaries.
+"""
+
+import io
+import zipfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from bigmap.visualization import boundaries
+
+
+def make_states(nc_size: float = 1.0) -> gpd.GeoDataFrame:
+    """Create a two-state boundary frame shaped like the Natural Earth file."""
+    return gpd.GeoDataFrame(
+        {
+            'name': ['North Carolina', 'Virginia'],
+            'postal': ['NC', 'VA'],
+            'admin': ['United States of America'] * 2,
+        },
+        geometry=[box(0, 0, nc_size, nc_size), box(0, 2, 1, 3)],
+        crs='EPSG:4326'
+    )
+
+
+@pytest.fixture
+def boundary_cache(tmp_path: Path, monkeypatch) -> Path:
+    """Point the boundary cache at a temporary directory with a states file."""
+    cache_dir = tmp_path / "boundaries"
+    cache_dir.mkdir()
+    monkeypatch.setattr(boundaries, 'BOUNDARY_CACHE_DIR', cache_dir)
+    make_states().to_file(cache_dir / "us_states_50m.gpkg", driver='GPKG')
+
+    boundaries._load_state_projected.cache_clear()
+    boundaries._load_counties_projected.cache_clear()
+    yield cache_dir
+    boundaries._load_state_projected.cache_clear()
+    boundaries._load_counties_projected.cache_clear()
+
+
+class TestBoundarySubsetCache:
+    """Test the on-disk per-state subsets and the in-process caches above them."""
+
+    def test_subset_written_and_reused(self, boundary_cache: Path):
+        """Test a state subset is cached on disk and read instead of the national file."""
+        state = boundaries.load_state_boundary('NC')
+        subset_path = boundary_cache / "us_states_50m_nc.gpkg"
+
+        assert list(state['postal']) == ['NC']
+        assert subset_path.exists()
+
+        boundaries._load_state_projected.cache_clear()
+        with patch.object(boundaries.gpd, 'read_file', wraps=gpd.read_file) as read_file:
+            again = boundaries.load_state_boundary('North Carolina')
+
+        assert [Path(call.args[0]) for call in read_file.call_args_list] == [subset_path]
+        assert again.geometry.iloc[0].equals(state.geometry.iloc[0])
+
+    def test_results_are_copies_of_the_cached_frame(self, boundary_cache: Path):
+        """Test callers modifying a result do not corrupt the cache."""
+        first = boundaries.load_state_boundary('NC')
+        first['postal'] = 'XX'
+
+        assert list(boundaries.load_state_boundary('NC')['postal']) == ['NC']
+
+    def test_force_download_refreshes_subsets(self, boundary_cache: Path, tmp_path: Path):
+        """Test re-downloading the national file invalidates disk and memory caches."""
+        old = boundaries.load_state_boundary('NC')
+        assert old.geometry.iloc[0].area == pytest.approx(1.0)
+
+        # Serve a zipped shapefile whose North Carolina is four times larger
+        shp_dir = tmp_path / "shp"
+        shp_dir.mkdir()
+        make_states(nc_size=2.0).to_file(shp_dir / "states.shp")
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for path in shp_dir.iterdir():
+                zf.write(path, path.name)
+        response = Mock(content=archive.getvalue())
+
+        with patch.object(boundaries.requests.Session, 'get', return_value=response):
+            boundaries.download_boundaries('states', force=True)
+
+        assert not (boundary_cache / "us_states_50m_nc.gpkg").exists()
+        new = boundaries.load_state_boundary('NC')
+        assert new.geometry.iloc[0].area == pytest.approx(4.0)
@@ -6,6 +6,7 @@ Tests the Shannon diversity bug fix (Issue #2) and other diversity metrics.
 
 import pytest
 import numpy as np
+import zarr
 from bigmap.core.calculations.diversity import (
     ShannonDiversity,
     SimpsonDiversity,
@@ -84,6 +85,21 @@ class TestShannonDiversity:
         # Single species has 0 diversity
         np.testing.assert_almost_equal(result[0, 0], 0.0, decimal=6)
 
+    def test_shannon_diversity_zero_is_unsigned(self, monkeypatch):
+        """Test the NumPy path writes +0.0, not -0.0, where the index is zero."""
+        from bigmap.core.calculations import _kernels
+        monkeypatch.setattr(_kernels, 'HAS_NUMBA', False)
+        data = np.array([
+            [[0, 100]],  # Species 1
+            [[0, 0]],    # Species 2
+            [[0, 0]]     # Species 3
+        ], dtype=np.float32)
+
+        result = ShannonDiversity(exclude_total_layer=False).calculate(data)
+
+        np.testing.assert_array_equal(result, 0.0)
+        assert not np.signbit(result).any()
+
     def test_shannon_diversity_base2(self):
         """Test Shannon diversity with base 2 logarithm."""
         # Two species with equal abundance
@@ -377,4 +393,64 @@ class TestDiversityValidation:
         data = np.zeros((0, 10, 10))
 
         calc = ShannonDiversity()
-        assert calc.validate_data(data) is False
\ No newline at end of file
+        assert calc.validate_data(data) is False
+
+
+class TestCompiledKernels:
+    """Test that compiled kernels match the NumPy code paths."""
+
+    @pytest.fixture
+    def biomass(self):
+        rng = np.random.default_rng(0)
+        data = (rng.random((6, 40, 40)) * 50).astype(np.float32)
+        data[data < 20] = 0
+        data[1:, :5, :5] = 0  # Pixels without forest
+        data[0] = data[1:].sum(axis=0)
+        return data
+
+    @pytest.mark.parametrize("calc", [
+        SpeciesRichness(biomass_threshold=5.0),
+        ShannonDiversity(),
+        ShannonDiversity(base='2'),
+        SimpsonDiversity(),
+        SimpsonDiversity(inverse=False),
+        Evenness(),
+    ])
+    def test_kernel_matches_numpy(self, calc, biomass, monkeypatch):
+        from bigmap.core.calculations import _kernels
+        if not _kernels.HAS_NUMBA:
+            pytest.skip("numba not installed")
+
+        compiled = calc.calculate(biomass)
+        monkeypatch.setattr(_kernels, 'HAS_NUMBA', False)
+        reference = calc.calculate(biomass)
+
+        assert compiled.dtype == reference.dtype
+        np.testing.assert_allclose(compiled, reference, rtol=1e-5, atol=1e-6)
+
+    def test_precompile_covers_processor_signatures(self, tmp_path):
+        from bigmap.config import BigMapSettings, CalculationConfig
+        from bigmap.core.calculations import _kernels, precompile
+        from bigmap.core.processors.forest_metrics import ForestMetricsProcessor
+        if not _kernels.HAS_NUMBA:
+            pytest.skip("numba not installed")
+
+        assert precompile() is True
+        kernels = (_kernels.total_biomass, _kernels.species_count, _kernels.shannon,
+                   _kernels.simpson, _kernels.fused_reductions)
+        compiled = [len(kernel.signatures) for kernel in kernels]
+
+        # Partial-width tiles hand the kernels strided output views
+        z = zarr.open_array(str(tmp_path / "tiles.zarr"), mode='w', shape=(4, 60, 90),
+                            chunks=(1, 30, 30), dtype='f4')
+        z[:] = np.random.rand(4, 60, 90)
+        for names in (['total_biomass', 'species_richness', 'shannon_diversity'],
+                      ['total_biomass', 'species_richness', 'simpson_diversity', 'dominant_species']):
+            settings = BigMapSettings(output_dir=tmp_path,
+                                      calculations=[CalculationConfig(name=n) for n in names])
+            processor = ForestMetricsProcessor(settings)
+            processor.chunk_size = (1, 30, 30)
+            calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+            processor._process_in_chunks(z, calcs)
+
+        assert [len(kernel.signatures) for kernel in kernels] == compiled
@@ -0,0 +1,287 @@
+"""
+Tests for the shared helpers in bigmap.examples.utils.
+"""
+
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_bounds
+import zarr
+
+
+def write_raster(path: Path, data: np.ndarray) -> None:
+    """Write a single-band float32 GeoTIFF covering a 600 m square in EPSG:5070."""
+    height, width = data.shape
+    with rasterio.open(
+        str(path), 'w', driver='GTiff', height=height, width=width, count=1,
+        dtype='float32', crs='EPSG:5070', transform=from_bounds(0, 0, 600, 600, width, height)
+    ) as dst:
+        dst.write(data, 1)
+
+
+class TestCalculateBasicStats:
+    """Test the calculate_basic_stats utility function from examples.utils."""
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_chunked_stats_match_full_array(self, temp_dir: Path, use_numba, monkeypatch):
+        """Test chunk-by-chunk statistics match those computed on the loaded array."""
+        from bigmap.core.calculations import _kernels
+        from bigmap.examples.utils import calculate_basic_stats, create_sample_zarr
+
+        if use_numba and not _kernels.HAS_NUMBA:
+            pytest.skip("numba not installed")
+        monkeypatch.setattr(_kernels, 'HAS_NUMBA', use_numba)
+
+        zarr_path = create_sample_zarr(temp_dir / "sample.zarr", n_species=3)
+        stats = calculate_basic_stats(zarr_path)
+
+        data = zarr.open_group(str(zarr_path), mode='r')['biomass'][:]
+        total = data[0]
+        forest = total > 0
+        richness = np.sum(data[1:] > 0, axis=0)
+
+        assert stats['total_pixels'] == total.size
+        assert stats['forest_pixels'] == int(forest.sum())
+        assert stats['mean_biomass'] == pytest.approx(float(total[forest].mean()), rel=1e-5)
+        assert stats['max_biomass'] == pytest.approx(float(total.max()))
+        assert stats['total_biomass_mg'] == pytest.approx(float(total.sum()), rel=1e-5)
+        assert stats['mean_richness'] == pytest.approx(float(richness[forest].mean()))
+        assert stats['max_richness'] == int(richness.max())
+
+    def test_sample_size_limits_scanned_area(self, temp_dir: Path):
+        """Test only the leading sample window is summarized when sampling."""
+        from bigmap.examples.utils import calculate_basic_stats, create_sample_zarr
+
+        zarr_path = create_sample_zarr(temp_dir / "sample.zarr", n_species=3)
+        stats = calculate_basic_stats(zarr_path, sample_size=30)
+
+        total = zarr.open_group(str(zarr_path), mode='r')['biomass'][0, :30, :30]
+        assert stats['total_pixels'] == 900
+        assert stats['forest_pixels'] == int((total > 0).sum())
+        assert stats['total_biomass_mg'] == pytest.approx(float(total.sum()), rel=1e-5)
+
+    def test_workers_limited_by_available_memory(self, temp_dir: Path):
+        """Test no more chunk columns are read at once than fit in memory."""
+        from bigmap.examples import utils
+        from bigmap.examples.utils import calculate_basic_stats, create_sample_zarr
+
+        zarr_path = create_sample_zarr(temp_dir / "sample.zarr", n_species=3)
+        memory = MagicMock(available=1)
+        with patch.object(utils.psutil, 'virtual_memory', return_value=memory), \
+                patch.object(utils, 'ThreadPoolExecutor', wraps=utils.ThreadPoolExecutor) as pool:
+            stats = calculate_basic_stats(zarr_path, sample_size=None)
+
+        assert pool.call_args.kwargs['max_workers'] == 1
+        assert stats['total_pixels'] == 100 * 100
+
+
+    def test_workers_limited_by_config(self, temp_dir: Path):
+        """Test the chunk worker pool never exceeds config.max_workers."""
+        from bigmap.examples import utils
+        from bigmap.examples.utils import AnalysisConfig, calculate_basic_stats, create_sample_zarr
+
+        zarr_path = create_sample_zarr(temp_dir / "sample.zarr", n_species=3)
+        memory = MagicMock(available=2**40)
+        with patch.object(utils.psutil, 'virtual_memory', return_value=memory), \
+                patch.object(utils, 'ThreadPoolExecutor', wraps=utils.ThreadPoolExecutor) as pool:
+            calculate_basic_stats(zarr_path, sample_size=None, config=AnalysisConfig(max_workers=1))
+
+        assert pool.call_args.kwargs['max_workers'] == 1
+
+class TestSafeLoadZarrWithMemoryCheck:
+    """Test the safe_load_zarr_with_memory_check utility function from examples.utils."""
+
+    def test_large_array_is_block_averaged(self, temp_dir: Path):
+        """Test oversized arrays are downsampled by averaging blocks, not striding."""
+        from bigmap.examples.utils import (
+            AnalysisConfig, create_sample_zarr, safe_load_zarr_with_memory_check
+        )
+
+        zarr_path = create_sample_zarr(temp_dir / "sample.zarr", n_species=2)
+        sample = safe_load_zarr_with_memory_check(zarr_path, AnalysisConfig(max_pixels=2500))
+
+        data = zarr.open_group(str(zarr_path), mode='r')['biomass'][:]
+        expected = data.reshape(3, 50, 2, 50, 2).mean(axis=(2, 4))
+
+        assert sample.shape == (3, 50, 50)
+        np.testing.assert_allclose(sample, expected, rtol=1e-5)
+
+    def test_viz_dtype_reduces_precision(self, temp_dir: Path):
+        """Test arrays are returned in the configured visualization dtype."""
+        from bigmap.examples.utils import (
+            AnalysisConfig, create_sample_zarr, safe_load_zarr_with_memory_check
+        )
+
+        zarr_path = create_sample_zarr(temp_dir / "sample.zarr", n_species=2)
+        full = safe_load_zarr_with_memory_check(zarr_path, AnalysisConfig(viz_dtype='float16'))
+        sampled = safe_load_zarr_with_memory_check(
+            zarr_path, AnalysisConfig(max_pixels=2500, viz_dtype='float16')
+        )
+
+        assert full.dtype == np.float16
+        assert sampled.dtype == np.float16
+        assert sampled.shape == (3, 50, 50)
+
+
+class TestCreateZarrFromRasters:
+    """Test the create_zarr_from_rasters utility function from examples.utils."""
+
+    def test_layers_total_and_codec(self, temp_dir: Path):
+        """Test species layers, streamed total and the zstd/bitshuffle codec."""
+        from bigmap.examples.utils import AnalysisConfig, create_zarr_from_rasters
+
+        raster_dir = temp_dir / "rasters"
+        raster_dir.mkdir()
+        layers = []
+        for i in range(3):
+            data = np.arange(50 * 70, dtype=np.float32).reshape(50, 70) * (i + 1)
+            data[0, 0] = -9999.0
+            data[0, 1] = np.nan
+            write_raster(raster_dir / f"species_{i}.tif", data)
+            layers.append(np.fmax(data, 0))
+
+        zarr_path = create_zarr_from_rasters(
+            raster_dir, temp_dir / "species.zarr", AnalysisConfig(chunk_size=(1, 16, 32))
+        )
+
+        z = zarr.open_array(str(zarr_path), mode='r')
+        assert z.shape == (4, 50, 70)
+        np.testing.assert_array_equal(z[1:], np.stack(layers))
+
+        # The total is summed in raster order, so it matches bit for bit
+        total = np.zeros((50, 70), dtype=np.float32)
+        for layer in layers:
+            total += layer
+        np.testing.assert_array_equal(z[0], total)
+
+        codec = z.compressors[0]
+        assert codec.cname.value == 'zstd'
+        assert codec.shuffle.value == 'bitshuffle'
+
+    def test_codec_from_config(self, temp_dir: Path):
+        """Test the Blosc codec settings come from AnalysisConfig."""
+        from bigmap.examples.utils import AnalysisConfig, create_zarr_from_rasters
+
+        raster_dir = temp_dir / "rasters"
+        raster_dir.mkdir()
+        write_raster(raster_dir / "species_0.tif", np.ones((20, 20), dtype=np.float32))
+
+        config = AnalysisConfig(compression='lz4', compression_level=5, shuffle='shuffle')
+        zarr_path = create_zarr_from_rasters(raster_dir, temp_dir / "lz4.zarr", config)
+
+        codec = zarr.open_array(str(zarr_path), mode='r').compressors[0]
+        assert codec.cname.value == 'lz4'
+        assert codec.clevel == 5
+        assert codec.shuffle.value == 'shuffle'
+
+    def test_storage_scale_stores_uint16(self, temp_dir: Path):
+        """Test scaled uint16 storage reads back as float32 within one step."""
+        from bigmap.examples.utils import AnalysisConfig, create_zarr_from_rasters
+
+        raster_dir = temp_dir / "rasters"
+        raster_dir.mkdir()
+        data = np.linspace(0, 500, 20 * 20, dtype=np.float32).reshape(20, 20)
+        data[0, 0] = 7000.0  # Beyond the uint16 range at 0.1 steps
+        for i in range(2):
+            write_raster(raster_dir / f"species_{i}.tif", data)
+
+        config = AnalysisConfig(chunk_size=(1, 8, 20), storage_scale=10)
+        zarr_path = create_zarr_from_rasters(raster_dir, temp_dir / "scaled.zarr", config)
+
+        z = zarr.open_array(str(zarr_path), mode='r')
+        assert z.dtype == np.float32
+        assert z.filters[0].codec_config['astype'] == '<u2'
+        expected = np.minimum(data, 6553.5)
+        np.testing.assert_allclose(z[1], expected, atol=0.05)
+        np.testing.assert_allclose(z[0], np.minimum(2 * expected, 6553.5), atol=0.05)
+
+    def test_rasters_opened_once_and_unreadable_skipped(self, temp_dir: Path):
+        """Test each raster is opened once for all bands and bad files are skipped."""
+        from bigmap.examples.utils import AnalysisConfig, create_zarr_from_rasters
+
+        raster_dir = temp_dir / "rasters"
+        raster_dir.mkdir()
+        write_raster(raster_dir / "species_0.tif", np.full((20, 20), 3.0, dtype=np.float32))
+        (raster_dir / "species_1.tif").write_bytes(b"not a raster")
+
+        real_open = rasterio.open
+        with patch('bigmap.examples.utils.rasterio.open', side_effect=real_open) as mock_open:
+            zarr_path = create_zarr_from_rasters(
+                raster_dir, temp_dir / "species.zarr", AnalysisConfig(chunk_size=(1, 5, 20))
+            )
+
+        # Four bands, but one open per raster
+        assert mock_open.call_count == 2
+        z = zarr.open_array(str(zarr_path), mode='r')
+        np.testing.assert_array_equal(z[1], 3.0)
+        np.testing.assert_array_equal(z[2], -9999.0)  # Left at the nodata fill
+        np.testing.assert_array_equal(z[0], 3.0)
+
+    def test_mismatched_raster_skipped(self, temp_dir: Path):
+        """Test rasters on a different grid are skipped rather than cropped."""
+        from bigmap.examples.utils import AnalysisConfig, create_zarr_from_rasters
+
+        raster_dir = temp_dir / "rasters"
+        raster_dir.mkdir()
+        for name, size in (("species_0.tif", 20), ("species_1.tif", 30)):
+            write_raster(raster_dir / name, np.full((size, size), 2.0, dtype=np.float32))
+
+        zarr_path = create_zarr_from_rasters(
+            raster_dir, temp_dir / "species.zarr", AnalysisConfig(chunk_size=(1, 5, 20))
+        )
+
+        z = zarr.open_array(str(zarr_path), mode='r')
+        np.testing.assert_array_equal(z[2], -9999.0)
+        np.testing.assert_array_equal(z[0], 2.0)
+
+    def test_read_failure_after_first_band_aborts(self, temp_dir: Path):
+        """Test a raster failing mid-stream raises instead of leaving a half-written layer."""
+        from bigmap.examples.utils import AnalysisConfig, create_zarr_from_rasters
+
+        raster_dir = temp_dir / "rasters"
+        raster_dir.mkdir()
+        for name in ("species_0.tif", "species_1.tif"):
+            write_raster(raster_dir / name, np.full((20, 20), 1.0, dtype=np.float32))
+
+        real_open = rasterio.open
+
+        def flaky_open(path, *args, **kwargs):
+            src = real_open(path, *args, **kwargs)
+            if Path(path).name == "species_1.tif":
+                real_read = src.read
+
+                def read(*read_args, window=None, **read_kwargs):
+                    if window is not None and window.row_off >= 5:
+                        raise rasterio.RasterioIOError("corrupt block")
+                    return real_read(*read_args, window=window, **read_kwargs)
+
+                src.read = read
+            return src
+
+        with patch('bigmap.examples.utils.rasterio.open', side_effect=flaky_open):
+            with pytest.raises(IOError, match="rows 5-10 of species_1.tif"):
+                create_zarr_from_rasters(
+                    raster_dir, temp_dir / "species.zarr", AnalysisConfig(chunk_size=(1, 5, 20))
+                )
+
+
+class TestValidateSpeciesCodes:
+    """Test the validate_species_codes utility function from examples.utils."""
+
+    def test_species_list_fetched_once_per_api(self):
+        """Test repeated validations reuse the species list of the same API."""
+        from bigmap.examples.utils import validate_species_codes
+
+        api = MagicMock()
+        api.list_species.return_value = [MagicMock(species_code='0131'), MagicMock(species_code='0068')]
+
+        assert validate_species_codes(api, ['0131', '9999']) == ['0131']
+        assert validate_species_codes(api, ['0068']) == ['0068']
+        api.list_species.assert_called_once()
+
+        other_api = MagicMock()
+        other_api.list_species.return_value = []
+        assert validate_species_codes(other_api, ['0131']) == []
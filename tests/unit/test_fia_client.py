@@ -9,6 +9,7 @@ Tests use real API calls as specified in project requirements.
 """
 
 import json
+import threading
 import time
 import tempfile
 from pathlib import Path
@@ -317,6 +318,37 @@ class TestBigMapRestClientSpeciesFunctions:
             assert result == []
             assert client._species_functions == []
 
+    def test_get_species_functions_disk_cache(self, isolated_service_cache):
+        """Test raster functions are reused from disk by a new client."""
+        expected_functions = [
+            {'name': 'SPCD_0131_Abies_balsamea', 'description': 'Balsam fir'}
+        ]
+        service_info = {'rasterFunctionInfos': expected_functions}
+
+        with patch.object(BigMapRestClient, 'get_service_info', return_value=service_info) as mock_info:
+            assert BigMapRestClient().get_species_functions() == expected_functions
+            assert BigMapRestClient().get_species_functions() == expected_functions
+            mock_info.assert_called_once()
+
+        assert len(list(isolated_service_cache.glob("functions_*.json"))) == 1
+
+    def test_get_species_functions_expired_disk_cache(self):
+        """Test a disk cache older than the TTL is refetched."""
+        service_info = {'rasterFunctionInfos': [{'name': 'SPCD_0131_Abies_balsamea'}]}
+
+        with patch.object(BigMapRestClient, 'get_service_info', return_value=service_info) as mock_info:
+            BigMapRestClient().get_species_functions()
+            with patch('bigmap.external.fia_client.SERVICE_CACHE_TTL', -1):
+                BigMapRestClient().get_species_functions()
+            assert mock_info.call_count == 2
+
+    def test_empty_service_info_not_cached(self, isolated_service_cache):
+        """Test a failed catalog fetch is not written to the disk cache."""
+        with patch.object(BigMapRestClient, 'get_service_info', return_value={}):
+            assert BigMapRestClient().get_species_functions() == []
+
+        assert not isolated_service_cache.exists()
+
 
 class TestBigMapRestClientListSpecies:
     """Test list_available_species method."""
@@ -909,12 +941,13 @@ class TestBigMapRestClientBatchExport:
         location_name = "Montana"
 
         with patch.object(client, 'export_species_raster') as mock_export:
-            # Mock successful exports
+            # Mock successful exports; species run concurrently, so the
+            # result is keyed by the requested output path, not call order
             expected_files = [
                 temp_dir / "Montana_species_0131.tif",
                 temp_dir / "Montana_species_0202.tif"
             ]
-            mock_export.side_effect = expected_files
+            mock_export.side_effect = lambda **kwargs: kwargs['output_path']
 
             with patch('rich.progress.Progress'):  # Mock progress bar
                 result = client.batch_export_location_species(
@@ -1038,6 +1071,28 @@ class TestBigMapRestClientBatchExport:
                 assert result == []
                 assert mock_export.call_count == 2
 
+    def test_batch_export_runs_concurrently(self, temp_dir):
+        """Test species exports overlap and results keep species order."""
+        client = BigMapRestClient(max_workers=3)
+        species_codes = ['0131', '0202', '0068']
+        barrier = threading.Barrier(3, timeout=5)
+
+        def export(**kwargs):
+            # Only returns if all three exports are in flight together
+            barrier.wait()
+            return kwargs['output_path']
+
+        with patch.object(client, 'export_species_raster', side_effect=export):
+            with patch('rich.progress.Progress'):
+                result = client.batch_export_location_species(
+                    bbox=(-12000000, 5000000, -11000000, 6000000),
+                    output_dir=temp_dir,
+                    species_codes=species_codes,
+                    location_name="Montana"
+                )
+
+        assert result == [temp_dir / f"Montana_species_{code}.tif" for code in species_codes]
+
 
 class TestBigMapRestClientUtilityMethods:
     """Test utility methods _get_function_name and _calculate_image_size."""
@@ -255,6 +255,18 @@ class TestCoordinateTransformations:
             else:
                 raise
 
+    def test_setup_bounding_boxes_match_projected_geometry(self, mock_state_gdf):
+        """Test transformed bounds match the extent of the reprojected geometry."""
+        config = LocationConfig()
+        config._setup_bounding_boxes(mock_state_gdf)
+
+        expected = mock_state_gdf.to_crs("EPSG:3857").total_bounds
+        mercator_bbox = config._config['bounding_boxes']['web_mercator']
+        np.testing.assert_allclose(
+            [mercator_bbox['xmin'], mercator_bbox['ymin'], mercator_bbox['xmax'], mercator_bbox['ymax']],
+            expected, rtol=1e-9
+        )
+
     def test_convert_bounding_boxes_from_wgs84(self):
         """Test converting bounding boxes from WGS84 to other CRS."""
         config = LocationConfig()
@@ -2,6 +2,7 @@
 Unit tests for forest metrics processors.
 """
 
+import logging
 import pytest
 import numpy as np
 import zarr
@@ -13,6 +14,14 @@ from bigmap.config import BigMapSettings, CalculationConfig
 from bigmap.core.calculations import registry
 
 
+@pytest.fixture
+def output_metadata() -> dict:
+    """Spatial metadata for writing outputs on a 30 m Albers grid."""
+    from rasterio.transform import Affine
+
+    return {'crs': 'ESRI:102039', 'transform': Affine(30, 0, -2000000, 0, -30, -900000)}
+
+
 class TestForestMetricsProcessor:
     """Test suite for ForestMetricsProcessor."""
     
@@ -54,6 +63,39 @@ class TestForestMetricsProcessor:
         with pytest.raises(ValueError, match="Expected 3D array"):
             processor._validate_zarr_array(z)
     
+    def test_load_zarr_group_wraps_biomass_array(self, temp_dir):
+        """Test group stores return a wrapper with bound attributes and merged metadata."""
+        root = zarr.open_group(str(temp_dir / "group.zarr"), mode='w')
+        root.attrs['crs'] = 'ESRI:102039'
+        biomass = root.create_array('biomass', shape=(2, 20, 20), chunks=(1, 10, 10), dtype='f4')
+        biomass[:] = np.arange(800, dtype='f4').reshape(2, 20, 20)
+
+        processor = ForestMetricsProcessor()
+        wrapper, group = processor._load_zarr_array(str(temp_dir / "group.zarr"))
+
+        assert group is not None
+        assert wrapper.attrs['crs'] == 'ESRI:102039'
+        for name in ('shape', 'chunks', 'dtype', 'store', 'fill_value'):
+            assert name in vars(wrapper)
+        np.testing.assert_array_equal(wrapper[1, :2, :2], biomass[1, :2, :2])
+
+    def test_load_zarr_group_caches_species_arrays(self, temp_dir):
+        """Test species code/name arrays are read once per store."""
+        root = zarr.open_group(str(temp_dir / "group.zarr"), mode='w')
+        root.create_array('biomass', shape=(2, 20, 20), chunks=(1, 10, 10), dtype='f4')
+        codes = root.create_array('species_codes', shape=(2,), dtype=str)
+        codes[:] = np.array(['0000', '0131'])
+
+        processor = ForestMetricsProcessor()
+        first, _ = processor._load_zarr_array(str(temp_dir / "group.zarr"))
+        codes[:] = np.array(['XXXX', 'XXXX'])  # Not re-read while cached
+        second, _ = processor._load_zarr_array(str(temp_dir / "group.zarr"))
+
+        assert first.attrs['species_codes'] == ['0000', '0131']
+        assert second.attrs['species_codes'] == ['0000', '0131']
+        assert second.attrs['species_codes'] is not first.attrs['species_codes']
+        assert len(processor._meta_cache) == 1
+
     def test_get_enabled_calculations(self, test_settings):
         """Test getting enabled calculations from settings."""
         processor = ForestMetricsProcessor(test_settings)
@@ -102,6 +144,246 @@ class TestForestMetricsProcessor:
         assert result["test_calc"].shape == (50, 50)
         mock_calc.calculate.assert_called_once()
     
+    def test_process_chunk_writes_into_out(self, test_settings, sample_zarr_array):
+        """Test that results land in the preallocated output views."""
+        processor = ForestMetricsProcessor(test_settings)
+        calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+        chunk_data = sample_zarr_array[:, :50, :50]
+
+        expected = processor._process_chunk(chunk_data, calcs)
+        full = {calc.name: np.zeros((100, 100), dtype=calc.get_output_dtype()) for calc in calcs}
+        out = {name: array[:50, :50] for name, array in full.items()}
+        result = processor._process_chunk(chunk_data, calcs, out=out)
+
+        for name in expected:
+            assert result[name] is out[name]
+            np.testing.assert_array_equal(full[name][:50, :50], expected[name])
+            assert not full[name][50:, :].any()
+
+    def test_process_chunk_shares_preprocessing(self, sample_zarr_array):
+        """Test calculations with the same preprocessing key preprocess once."""
+        from bigmap.core.calculations import TotalBiomass
+
+        class NanSafeTotal(TotalBiomass):
+            calls = 0
+
+            def preprocess_data(self, biomass_data):
+                NanSafeTotal.calls += 1
+                return np.nan_to_num(biomass_data)
+
+            def get_preprocessing_key(self):
+                return 'nan_to_zero'
+
+        processor = ForestMetricsProcessor()
+        calcs = [NanSafeTotal(), NanSafeTotal()]
+        calcs[1].name = "total_biomass_copy"
+        chunk_data = sample_zarr_array[:, :50, :50]
+
+        result = processor._process_chunk(chunk_data, calcs)
+
+        assert NanSafeTotal.calls == 1
+        np.testing.assert_array_equal(result["total_biomass"], result["total_biomass_copy"])
+        assert TotalBiomass().get_preprocessing_key() == 'identity'
+
+    def test_process_chunk_casts_once_to_required_dtype(self, test_settings):
+        """Test integer chunks are cast once to the dtype calculations require."""
+        processor = ForestMetricsProcessor(test_settings)
+        calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+        chunk_data = np.random.randint(0, 50, (4, 20, 20)).astype(np.int16)
+
+        seen = []
+        for calc in calcs:
+            original = calc.calculate
+            calc.calculate = lambda data, _orig=original, **kw: seen.append(data.dtype) or _orig(data, **kw)
+
+        with patch.object(processor, '_get_fused_plan', return_value=None):
+            result = processor._process_chunk(chunk_data, calcs)
+
+        assert set(seen) == {np.dtype(np.float32)}
+        np.testing.assert_allclose(result["total_biomass"], chunk_data[1:].sum(axis=0))
+
+    def test_process_chunk_fused_matches_separate(self, sample_zarr_array):
+        """Test the single-pass fused kernel gives the per-calculation results."""
+        from bigmap.core.calculations import (
+            _kernels, TotalBiomass, SpeciesRichness, ShannonDiversity, SimpsonDiversity, Evenness
+        )
+        if not _kernels.HAS_NUMBA:
+            pytest.skip("numba not installed")
+
+        processor = ForestMetricsProcessor()
+        calcs = [TotalBiomass(), SpeciesRichness(biomass_threshold=5.0),
+                 ShannonDiversity(base='2'), SimpsonDiversity(), Evenness()]
+        chunk_data = sample_zarr_array[:, :50, :50]
+
+        assert processor._get_fused_plan(calcs) is not None
+        fused = processor._process_chunk(chunk_data, calcs)
+        with patch.object(processor, '_get_fused_plan', return_value=None):
+            separate = processor._process_chunk(chunk_data, calcs)
+
+        for name in separate:
+            assert fused[name].dtype == separate[name].dtype
+            np.testing.assert_allclose(fused[name], separate[name], rtol=1e-5, atol=1e-6)
+
+        class CustomTotal(TotalBiomass):
+            pass
+
+        assert processor._get_fused_plan([CustomTotal()]) is None
+        assert processor._get_fused_plan([TotalBiomass(), TotalBiomass()]) is None
+        assert processor._get_fused_plan([TotalBiomass(), Evenness(exclude_total_layer=False)]) is None
+
+    def test_process_in_chunks_parallel_matches_serial(self, test_settings, sample_zarr_array):
+        """Test that threaded chunk processing gives the same results as serial."""
+        processor = ForestMetricsProcessor(test_settings)
+        processor.chunk_size = (1, 30, 30)
+        calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+
+        test_settings.processing.max_workers = 1
+        serial = processor._process_in_chunks(sample_zarr_array, calcs)
+        test_settings.processing.max_workers = 4
+        parallel = processor._process_in_chunks(sample_zarr_array, calcs)
+
+        assert serial.keys() == parallel.keys()
+        for name in serial:
+            np.testing.assert_array_equal(serial[name], parallel[name])
+
+    def test_process_in_chunks_groups_results_by_dtype(self, test_settings, sample_zarr_array):
+        """Test results sharing a dtype are views into one 3D buffer."""
+        processor = ForestMetricsProcessor(test_settings)
+        calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+
+        results = processor._process_in_chunks(sample_zarr_array, calcs)
+
+        assert list(results) == [calc.name for calc in calcs]
+        assert results["species_richness"].dtype == np.uint8
+        float_base = results["total_biomass"].base
+        assert float_base is not None and float_base.shape == (2, 100, 100)
+        assert results["shannon_diversity"].base is float_base
+
+    def test_prefetch_tiles_preserves_order_and_errors(self):
+        """Test the read-ahead pipeline yields every tile and re-raises read errors."""
+        processor = ForestMetricsProcessor()
+        processor.prefetch_tiles = 2
+        tiles = [(i, i + 1, 0, 1) for i in range(10)]
+
+        pairs = list(processor._prefetch_tiles(tiles, lambda tile: tile[0] * 10))
+        assert pairs == [(tile, tile[0] * 10) for tile in tiles]
+
+        def failing_read(tile):
+            if tile[0] == 5:
+                raise IOError("corrupt chunk")
+            return tile[0]
+
+        with pytest.raises(IOError, match="corrupt chunk"):
+            list(processor._prefetch_tiles(tiles, failing_read))
+
+    def test_workers_capped_by_memory_limit(self, test_settings):
+        """Test tile workers and read-ahead fit within memory_limit_gb."""
+        processor = ForestMetricsProcessor(test_settings)
+        test_settings.processing.max_workers = 64
+        tile_bytes = 300 * 1000 * 1000 * 4  # 300 float32 species, 1000x1000 tile
+
+        test_settings.processing.memory_limit_gb = 8.0
+        assert processor._get_max_workers(1000) == 64
+        assert processor._get_max_workers(1000, tile_bytes) == int(8 * 1024 ** 3 // tile_bytes)
+        assert processor._get_prefetch_depth(tile_bytes) == processor.prefetch_tiles
+
+        test_settings.processing.memory_limit_gb = 2.0
+        assert processor._get_max_workers(1000, tile_bytes) == 1
+        assert processor._get_prefetch_depth(tile_bytes) == 0
+
+    def test_process_in_chunks_skips_unwritten_tiles(self, test_settings, temp_dir):
+        """Test tiles with no stored chunks are skipped but still filled correctly."""
+        z = zarr.open_array(str(temp_dir / "sparse.zarr"), mode='w', shape=(3, 100, 100),
+                            chunks=(1, 50, 50), dtype='f4', fill_value=0.0)
+        z[:, :50, :50] = np.random.rand(3, 50, 50) * 10
+
+        processor = ForestMetricsProcessor(test_settings)
+        processor.chunk_size = (1, 50, 50)
+        calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+        tiles = [(ys, ys + 50, xs, xs + 50) for ys in (0, 50) for xs in (0, 50)]
+
+        assert processor._find_empty_tiles(z, tiles) == set(tiles[1:])
+
+        with patch.object(processor, '_prefetch_tiles', wraps=processor._prefetch_tiles) as prefetch:
+            test_settings.processing.max_workers = 1
+            results = processor._process_in_chunks(z, calcs)
+            assert prefetch.call_args[0][0] == tiles[:1]
+
+        expected = processor._process_chunk(z[:], calcs)
+        for name in expected:
+            np.testing.assert_allclose(results[name], expected[name], rtol=1e-6)
+
+    def test_find_empty_tiles_falls_back_when_listing_fails(self, test_settings, temp_dir, caplog):
+        """Test a failing chunk listing processes every tile and says so."""
+        z = zarr.open_array(str(temp_dir / "sparse.zarr"), mode='w', shape=(2, 100, 100),
+                            chunks=(1, 50, 50), dtype='f4', fill_value=0.0)
+        z[:, :50, :50] = np.random.rand(2, 50, 50) * 10
+        tiles = [(ys, ys + 50, xs, xs + 50) for ys in (0, 50) for xs in (0, 50)]
+
+        processor = ForestMetricsProcessor(test_settings)
+        processor.chunk_size = (1, 50, 50)
+        with patch('zarr.core.sync.sync', side_effect=RuntimeError("no event loop")):
+            assert processor._find_empty_tiles(z, tiles) == set()
+            calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+            results = processor._process_in_chunks(z, calcs)
+        assert "processing all tiles" in caplog.text
+
+        expected = processor._process_chunk(z[:], calcs)
+        for name in expected:
+            np.testing.assert_allclose(results[name], expected[name], rtol=1e-6)
+
+    def test_find_empty_tiles_warns_when_sync_bridge_moves(self, test_settings, temp_dir, caplog):
+        """Test a zarr release without zarr.core.sync falls back with a warning."""
+        z = zarr.open_array(str(temp_dir / "sparse.zarr"), mode='w', shape=(2, 100, 100),
+                            chunks=(1, 50, 50), dtype='f4', fill_value=0.0)
+        tiles = [(ys, ys + 50, xs, xs + 50) for ys in (0, 50) for xs in (0, 50)]
+
+        processor = ForestMetricsProcessor(test_settings)
+        with patch.dict('sys.modules', {'zarr.core.sync': None}), \
+                caplog.at_level(logging.WARNING, logger='bigmap.core.processors.forest_metrics'):
+            assert processor._find_empty_tiles(z, tiles) == set()
+        assert any(
+            record.levelno == logging.WARNING and "processing all tiles" in record.getMessage()
+            for record in caplog.records
+        )
+
+    def test_block_shape_divides_tile(self):
+        """Test GeoTIFF blocks are multiples of 16 that evenly divide the tile."""
+        processor = ForestMetricsProcessor()
+
+        assert processor._get_block_shape((1024, 2048)) == (1024, 1024)
+        assert processor._get_block_shape((1536, 800)) == (768, 800)
+        assert processor._get_block_shape((2000, 16)) == (400, 16)
+        with pytest.raises(ValueError, match="multiple of 16"):
+            processor._get_block_shape((1000, 1000))
+
+    def test_tile_shape_snaps_to_store_chunks(self, sample_zarr_array):
+        """Test processing tiles are whole multiples of the zarr chunks."""
+        processor = ForestMetricsProcessor()
+
+        # Fixture chunks are (1, 50, 50)
+        processor.chunk_size = (1, 120, 120)
+        assert processor._get_tile_shape(sample_zarr_array) == (100, 100)
+
+        processor.chunk_size = (1, 25, 25)
+        assert processor._get_tile_shape(sample_zarr_array) == (50, 50)
+
+    def test_tile_shape_fits_geotiff_blocks(self, sample_zarr_array):
+        """Test streamed tiles match both the store chunks and whole GeoTIFF blocks."""
+        processor = ForestMetricsProcessor()
+
+        # Fixture chunks are 50 px, so tiles step in lcm(50, 16) = 400 px
+        processor.chunk_size = (1, 1000, 1000)
+        tile = processor._get_tile_shape(sample_zarr_array, 16)
+        assert tile == (800, 800)
+        assert processor._get_block_shape(tile) == (800, 800)
+
+        # Default 1000 px target over 1000 px store chunks
+        store = Mock(chunks=(1, 1000, 1000))
+        tile = processor._get_tile_shape(store, 16)
+        assert tile == (2000, 2000)
+        assert processor._get_block_shape(tile) == (400, 400)
+
     def test_save_results_geotiff(self, test_settings, temp_dir):
         """Test saving results as GeoTIFF."""
         processor = ForestMetricsProcessor(test_settings)
@@ -125,7 +407,166 @@ class TestForestMetricsProcessor:
         assert len(output_paths) == 2
         assert all(Path(p).exists() for p in output_paths.values())
         assert str(output_paths["species_richness"]).endswith(".tif")
-    
+
+    def test_save_geotiff_tiled_with_predictor(self, test_settings, temp_dir, output_metadata):
+        """Test GeoTIFF output is tiled, ZSTD-compressed and uses a predictor."""
+        import rasterio
+
+        processor = ForestMetricsProcessor(test_settings)
+        data = (np.random.rand(600, 600) * 100).astype(np.float32)
+
+        output_path = temp_dir / "biomass.tif"
+        processor._save_geotiff(data, output_path, output_metadata)
+
+        with rasterio.open(output_path) as src:
+            assert src.profile['tiled']
+            assert src.block_shapes[0] == (512, 512)
+            assert src.compression.value == 'ZSTD'
+            assert src.tags(ns='IMAGE_STRUCTURE').get('PREDICTOR') == '3'
+            np.testing.assert_array_equal(src.read(1), data)
+
+    def test_save_results_quantized_outputs(self, test_settings, temp_dir, output_metadata):
+        """Test int16 quantization with scale/offset for GeoTIFF and NetCDF."""
+        import rasterio
+        import xarray as xr
+
+        test_settings.calculations = [
+            CalculationConfig(name="biomass_tif", output_dtype="int16", scale_factor=0.01),
+            CalculationConfig(name="biomass_nc", output_format="netcdf", output_dtype="int16",
+                              scale_factor=0.01, add_offset=100.0),
+        ]
+        processor = ForestMetricsProcessor(test_settings)
+        data = (np.random.rand(40, 40) * 200).astype(np.float32)
+        data[0, 0] = np.nan
+
+        paths = processor._save_results({"biomass_tif": data, "biomass_nc": data}, output_metadata,
+                                        test_settings.output_dir)
+
+        with rasterio.open(paths["biomass_tif"]) as src:
+            assert src.dtypes[0] == 'int16'
+            assert src.nodata == -32768
+            assert src.scales == (0.01,)
+            stored = src.read(1)
+            assert stored[0, 0] == -32768
+            np.testing.assert_allclose(stored[1:] * 0.01, data[1:], atol=0.005 + 1e-4)
+
+        with xr.open_dataset(paths["biomass_nc"], mask_and_scale=False) as ds:
+            assert ds["biomass_nc"].dtype == np.int16
+        with xr.open_dataset(paths["biomass_nc"]) as ds:
+            decoded = ds["biomass_nc"].values
+            assert np.isnan(decoded[0, 0])
+            np.testing.assert_allclose(decoded[1:], data[1:], atol=0.005 + 1e-4)
+
+    def test_calc_config_index_tracks_settings(self, test_settings):
+        """Test config lookups use a name index rebuilt when calculations change."""
+        processor = ForestMetricsProcessor(test_settings)
+
+        assert processor._get_calc_config("total_biomass") is test_settings.calculations[1]
+        assert processor._get_calc_config("missing") is None
+
+        test_settings.calculations.append(CalculationConfig(name="evenness", output_format="zarr"))
+        assert processor._get_output_config("evenness") == ("zarr", "evenness")
+
+        test_settings.calculations = [CalculationConfig(name="total_biomass", output_name="agb")]
+        assert processor._get_output_config("total_biomass") == ("geotiff", "agb")
+        assert processor._get_calc_config("species_richness") is None
+
+    def test_calculation_config_rejects_float_output_dtype(self):
+        """Test output_dtype must be an integer type."""
+        with pytest.raises(ValueError, match="integer type"):
+            CalculationConfig(name="total_biomass", output_dtype="float32")
+
+    def test_save_results_mixed_formats_concurrently(self, test_settings, temp_dir, output_metadata):
+        """Test outputs in every format are written when saved in parallel."""
+        test_settings.calculations = [
+            CalculationConfig(name="richness_tif", output_format="geotiff"),
+            CalculationConfig(name="richness_zarr", output_format="zarr"),
+            CalculationConfig(name="richness_nc", output_format="netcdf"),
+            CalculationConfig(name="richness_nc2", output_format="netcdf"),
+        ]
+        test_settings.processing.max_workers = 4
+        processor = ForestMetricsProcessor(test_settings)
+        data = np.random.rand(50, 50).astype(np.float32)
+        results = {config.name: data for config in test_settings.calculations}
+
+        output_paths = processor._save_results(results, output_metadata, test_settings.output_dir)
+
+        assert list(output_paths) == list(results)
+        assert all(Path(p).exists() for p in output_paths.values())
+        assert output_paths["richness_nc"].endswith(".nc")
+
+    def test_save_geotiff_bitpacks_small_counts(self, test_settings, temp_dir, output_metadata):
+        """Test that uint8 counts from at most 15 layers are written with NBITS=4."""
+        import rasterio
+
+        processor = ForestMetricsProcessor(test_settings)
+        data = np.random.randint(0, 16, (100, 100)).astype(np.uint8)
+
+        output_path = temp_dir / "richness.tif"
+        processor._save_geotiff(data, output_path, {**output_metadata, 'num_layers': 15})
+
+        with rasterio.open(output_path) as src:
+            assert src.tags(1, 'IMAGE_STRUCTURE').get('NBITS') == '4'
+            assert src.dtypes[0] == 'uint8'
+            np.testing.assert_array_equal(src.read(1), data)
+
+    def test_save_geotiff_bitpacking_ignores_data_values(self, test_settings, temp_dir, output_metadata):
+        """Test the NBITS decision follows the layer count, not the data maximum."""
+        import rasterio
+
+        processor = ForestMetricsProcessor(test_settings)
+        data = np.zeros((100, 100), dtype=np.uint8)
+
+        output_path = temp_dir / "richness.tif"
+        processor._save_geotiff(data, output_path, {**output_metadata, 'num_layers': 40})
+
+        with rasterio.open(output_path) as src:
+            assert src.tags(1, 'IMAGE_STRUCTURE').get('NBITS') is None
+
+    def test_save_geotiff_quantized_output_not_bitpacked(self, test_settings, temp_dir, output_metadata):
+        """Test quantized uint8 outputs keep 8 bits so their nodata value fits."""
+        import rasterio
+
+        test_settings.calculations = [
+            CalculationConfig(name="richness", output_dtype="uint8", scale_factor=1.0)
+        ]
+        processor = ForestMetricsProcessor(test_settings)
+        quantization = processor._get_quantization("richness")
+        data = np.random.randint(0, 16, (100, 100)).astype(np.float32)
+        data[0, 0] = np.nan
+
+        output_path = temp_dir / "richness.tif"
+        processor._save_geotiff(data, output_path, {**output_metadata, 'num_layers': 15},
+                                quantization)
+
+        with rasterio.open(output_path) as src:
+            assert src.tags(1, 'IMAGE_STRUCTURE').get('NBITS') is None
+            assert src.nodata == 255
+            stored = src.read(1)
+            assert stored[0, 0] == 255
+            np.testing.assert_array_equal(stored.ravel()[1:], data.ravel()[1:])
+
+    def test_save_netcdf_coordinates(self, test_settings, temp_dir, output_metadata):
+        """Test NetCDF x/y coordinates follow the affine transform."""
+        import xarray as xr
+
+        processor = ForestMetricsProcessor(test_settings)
+        output_path = temp_dir / "richness.nc"
+        processor._save_netcdf(np.ones((4, 5), dtype=np.float32), output_path,
+                               output_metadata, 'richness')
+
+        with xr.open_dataset(output_path) as ds:
+            np.testing.assert_array_equal(ds.x.values, -2000000 + 30 * np.arange(5))
+            np.testing.assert_array_equal(ds.y.values, -900000 - 30 * np.arange(4))
+
+    def test_extract_metadata_affine_coeffs(self, sample_zarr_array):
+        """Test metadata carries the transform as six plain floats."""
+        processor = ForestMetricsProcessor()
+        metadata = processor._extract_metadata(sample_zarr_array)
+
+        assert metadata['affine_coeffs'] == tuple(metadata['transform'])[:6]
+        assert all(type(v) is float for v in metadata['affine_coeffs'])
+
     def test_run_calculations_full_pipeline(self, test_settings, sample_zarr_array):
         """Test the full calculation pipeline."""
         
@@ -154,6 +595,27 @@ class TestForestMetricsProcessor:
                     assert "species_richness" in results
                     assert "total_biomass" in results
     
+    def test_run_calculations_streams_geotiff_over_memory_limit(self, test_settings, sample_zarr_array):
+        """Test results are written tile by tile when they exceed the memory limit."""
+        import rasterio
+
+        # Buffered run for reference
+        processor = ForestMetricsProcessor(test_settings)
+        processor.chunk_size = (1, 50, 50)
+        calcs = processor._initialize_calculations(processor._get_enabled_calculations())
+        expected = processor._process_in_chunks(sample_zarr_array, calcs)
+
+        test_settings.processing.memory_limit_gb = 1e-6
+        with patch.object(processor, '_load_zarr_array', return_value=(sample_zarr_array, None)):
+            with patch.object(processor, '_save_results', wraps=processor._save_results) as save:
+                output_paths = processor.run_calculations("test.zarr")
+
+        assert save.call_args[0][0] == {}
+        assert set(output_paths) == set(expected)
+        for name, path in output_paths.items():
+            with rasterio.open(path) as src:
+                np.testing.assert_array_equal(src.read(1), expected[name])
+
     def test_run_calculations_no_enabled_calculations(self, test_settings):
         """Test run_calculations with no enabled calculations."""
         # Disable all calculations
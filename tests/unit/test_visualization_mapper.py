@@ -329,6 +329,67 @@ class TestDataNormalization:
         assert normalized.max() <= 1
 
 
+class TestTileShape:
+    """Test suite for chunk-aligned tile selection."""
+
+    def test_tile_shape_is_multiple_of_chunks(self, complete_zarr_store):
+        """Test tiles are whole multiples of the on-disk chunk shape."""
+        mapper = ZarrMapper(complete_zarr_store)
+        tile_y, tile_x = mapper._get_tile_shape(target=120)
+
+        # Fixture chunks are (1, 50, 50)
+        assert (tile_y, tile_x) == (100, 100)
+
+    def test_tile_shape_never_smaller_than_chunk(self, complete_zarr_store):
+        """Test a target below the chunk size still yields one whole chunk."""
+        mapper = ZarrMapper(complete_zarr_store)
+        assert mapper._get_tile_shape(target=10) == (50, 50)
+
+
+class TestDisplayDownsampling:
+    """Test suite for reducing rasters to the display resolution."""
+
+    def test_small_raster_unchanged(self):
+        """Test rasters within the display limit are passed through."""
+        data = np.ones((10, 10), dtype=np.float32)
+        assert ZarrMapper._downsample_for_display(data) is data
+
+    @patch('bigmap.visualization.mapper.MAX_DISPLAY_PIXELS', 2)
+    def test_block_mean_with_ragged_edge(self):
+        """Test block means average only real pixels in edge blocks."""
+        data = np.arange(15, dtype=np.float32).reshape(3, 5)
+        reduced = ZarrMapper._downsample_for_display(data)
+
+        assert reduced.shape == (2, 2)
+        np.testing.assert_allclose(reduced, [[3.5, 6.0], [11.0, 13.5]])
+
+    @patch('bigmap.visualization.mapper.MAX_DISPLAY_PIXELS', 2)
+    def test_nearest_keeps_values(self):
+        """Test nearest subsampling keeps original class values."""
+        data = np.arange(16, dtype=np.uint8).reshape(4, 4)
+        reduced = ZarrMapper._downsample_for_display(data, method='nearest')
+
+        np.testing.assert_array_equal(reduced, [[0, 2], [8, 10]])
+        assert reduced.dtype == np.uint8
+
+    @patch('bigmap.visualization.mapper.MAX_DISPLAY_PIXELS', 30)
+    @patch('matplotlib.pyplot.subplots')
+    @patch('matplotlib.pyplot.colorbar')
+    @patch('matplotlib.pyplot.tight_layout')
+    def test_species_map_plots_reduced_raster(self, mock_tight_layout, mock_colorbar,
+                                              mock_subplots, complete_zarr_store):
+        """Test species maps pass the reduced raster to imshow."""
+        mock_ax = setup_mock_axes()
+        mock_subplots.return_value = (Mock(spec=Figure), mock_ax)
+
+        mapper = ZarrMapper(complete_zarr_store)
+        mapper.create_species_map(species=1)
+
+        # 100x100 fixture reduced by a factor of 4 per edge
+        args, _ = mock_ax.imshow.call_args
+        assert args[0].shape == (25, 25)
+
+
 class TestExtentCalculation:
     """Test suite for extent calculation functionality."""
 
@@ -526,6 +587,29 @@ class TestSpeciesMapCreation:
         mock_clip.assert_called_once()
         mock_plot.assert_called_once()
 
+    @patch('bigmap.visualization.mapper.load_state_boundary')
+    @patch('bigmap.visualization.mapper.plot_boundaries')
+    @patch('bigmap.visualization.mapper.clip_boundaries_to_extent')
+    def test_state_boundary_reused_across_maps(self, mock_clip, mock_plot, mock_load,
+                                               mock_tight_layout, mock_colorbar, mock_subplots, complete_zarr_store):
+        """Test that the clipped state boundary is loaded once per mapper."""
+        mock_fig = Mock(spec=Figure)
+        mock_ax = setup_mock_axes()
+        mock_subplots.return_value = (mock_fig, mock_ax)
+        mock_ax.imshow.return_value = Mock()
+
+        mock_boundary_gdf = Mock()
+        mock_load.return_value = mock_boundary_gdf
+        mock_clip.return_value = mock_boundary_gdf
+
+        mapper = ZarrMapper(complete_zarr_store)
+        mapper.create_species_map(species=1, state_boundary='California')
+        mapper.create_species_map(species=2, state_boundary='California')
+
+        mock_load.assert_called_once()
+        mock_clip.assert_called_once()
+        assert mock_plot.call_count == 2
+
     @patch('bigmap.visualization.mapper.get_basemap_zoom_level')
     @patch('bigmap.visualization.mapper.add_basemap')
     def test_create_species_map_with_basemap(self, mock_add_basemap, mock_get_zoom,
@@ -18,7 +18,8 @@ from bigmap.utils.zarr_utils import (
     append_species_to_zarr,
     batch_append_species_from_dir,
     create_zarr_from_geotiffs,
-    validate_zarr_store
+    validate_zarr_store,
+    gdal_read_env
 )
 
 
@@ -87,6 +88,32 @@ class TestCreateExpandableZarrFromBaseRaster:
         assert result['species_codes'].shape == (5,)
         assert result['species_names'].shape == (5,)
 
+    def test_base_layer_copied_in_bands(self, temp_dir: Path, sample_raster: Path):
+        """Test the base layer matches the raster when bands do not divide its height."""
+        result = create_expandable_zarr_from_base_raster(
+            base_raster_path=sample_raster,
+            zarr_path=temp_dir / "banded.zarr",
+            max_species=2,
+            chunk_size=(1, 30, 40)
+        )
+
+        with rasterio.open(sample_raster) as src:
+            expected = src.read(1)
+        np.testing.assert_array_equal(result['biomass'][0], expected)
+
+    def test_default_codec_is_bitshuffled_zstd(self, temp_dir: Path, sample_raster: Path):
+        """Test that the default codec is Blosc zstd with bitshuffle."""
+        result = create_expandable_zarr_from_base_raster(
+            base_raster_path=sample_raster,
+            zarr_path=temp_dir / "default.zarr",
+            max_species=2
+        )
+
+        codec = result['biomass'].compressors[0]
+        assert codec.cname.value == 'zstd'
+        assert codec.clevel == 3
+        assert codec.shuffle.value == 'bitshuffle'
+
     def test_create_zarr_different_compression(self, temp_dir: Path, sample_raster: Path):
         """Test zarr creation with different compression algorithms."""
         zarr_path = temp_dir / "compressed.zarr"
@@ -225,6 +252,25 @@ class TestAppendSpeciesToZarr:
         root = zarr.open_group(store=store, mode='r')
         assert root['species_codes'][1] == 'SP002'
 
+    def test_append_species_casts_to_store_dtype(self, base_zarr, temp_dir: Path):
+        """Test that integer rasters are stored in the store's float32 layer."""
+        root, zarr_path = base_zarr
+        raster_path = temp_dir / "species_int.tif"
+        data = np.arange(100 * 100, dtype=np.uint16).reshape(100, 100)
+        transform = from_bounds(-2000000, -1000000, -1900000, -900000, 100, 100)
+
+        with rasterio.open(
+            str(raster_path), 'w', driver='GTiff', height=100, width=100, count=1,
+            dtype=np.uint16, crs='ESRI:102039', transform=transform
+        ) as dst:
+            dst.write(data, 1)
+
+        index = append_species_to_zarr(zarr_path, raster_path, 'SP010', 'Int Species')
+
+        root = zarr.open_group(store=zarr.storage.LocalStore(zarr_path), mode='r')
+        assert root['biomass'].dtype == np.float32
+        np.testing.assert_array_equal(root['biomass'][index], data.astype(np.float32))
+
     def test_append_species_transform_mismatch(self, base_zarr, temp_dir: Path):
         """Test error handling with transform mismatch."""
         root, zarr_path = base_zarr
@@ -441,6 +487,63 @@ class TestBatchAppendSpeciesFromDir:
         assert len(added_codes) == 3
         assert all(code in species_mapping.keys() for code in added_codes)
 
+    def test_batch_append_keeps_filename_order(self, base_zarr_for_batch, species_directory):
+        """Test concurrent appends land in sorted filename order with matching data."""
+        root, zarr_path = base_zarr_for_batch
+        species_dir, species_mapping = species_directory
+
+        batch_append_species_from_dir(zarr_path, species_dir, species_mapping, max_workers=3)
+
+        root = zarr.open_group(str(zarr_path), mode='r')
+        for index, code in enumerate(sorted(species_mapping), start=1):
+            assert root['species_codes'][index] == code
+            assert root['species_names'][index] == species_mapping[code]
+            with rasterio.open(species_dir / f"biomass_{code}.tif") as src:
+                np.testing.assert_array_equal(root['biomass'][index], src.read(1))
+
+    def test_batch_append_closes_gap_after_failed_write(self, base_zarr_for_batch, species_directory):
+        """Test a raster failing after validation leaves no empty layer behind."""
+        root, zarr_path = base_zarr_for_batch
+        species_dir, species_mapping = species_directory
+        opens = {}
+        real_open = rasterio.open
+
+        def flaky_open(path, *args, **kwargs):
+            opens[str(path)] = opens.get(str(path), 0) + 1
+            if 'SP002' in str(path) and opens[str(path)] == 2:  # The read after validation
+                raise rasterio.errors.RasterioIOError("read failed")
+            return real_open(path, *args, **kwargs)
+
+        with patch('bigmap.utils.zarr_utils.rasterio.open', side_effect=flaky_open):
+            batch_append_species_from_dir(zarr_path, species_dir, species_mapping)
+
+        root = zarr.open_group(str(zarr_path), mode='r')
+        assert root.attrs['num_species'] == 3
+        assert list(root['species_codes'][1:3]) == ['SP001', 'SP003']
+        with rasterio.open(species_dir / "biomass_SP003.tif") as src:
+            np.testing.assert_array_equal(root['biomass'][2], src.read(1))
+
+    def test_batch_append_clears_vacated_layers(self, base_zarr_for_batch, species_directory):
+        """Test layers vacated by closing a gap are reset to the fill value."""
+        root, zarr_path = base_zarr_for_batch
+        species_dir, species_mapping = species_directory
+        opens = {}
+        real_open = rasterio.open
+
+        def flaky_open(path, *args, **kwargs):
+            opens[str(path)] = opens.get(str(path), 0) + 1
+            if 'SP001' in str(path) and opens[str(path)] == 2:  # The read after validation
+                raise rasterio.errors.RasterioIOError("read failed")
+            return real_open(path, *args, **kwargs)
+
+        with patch('bigmap.utils.zarr_utils.rasterio.open', side_effect=flaky_open):
+            batch_append_species_from_dir(zarr_path, species_dir, species_mapping)
+
+        root = zarr.open_group(str(zarr_path), mode='r')
+        assert root.attrs['num_species'] == 3
+        assert list(root['species_codes'][1:3]) == ['SP002', 'SP003']
+        assert not root['biomass'][3:].any()
+
     def test_batch_append_no_files_found(self, base_zarr_for_batch, temp_dir: Path):
         """Test batch append with no matching files."""
         root, zarr_path = base_zarr_for_batch
@@ -631,6 +734,53 @@ class TestCreateZarrFromGeotiffs:
         species_sum = np.sum([np.array(root['biomass'][i, :, :]) for i in range(1, 4)], axis=0)
         np.testing.assert_array_almost_equal(total_layer, species_sum)
 
+    @pytest.mark.parametrize("chunk_size", [(1, 24, 80), (2, 24, 40)])
+    def test_create_zarr_from_geotiffs_streams_bands(self, temp_dir: Path, geotiff_files, chunk_size):
+        """Test band-by-band streaming reproduces every layer and the total."""
+        files, codes, names = geotiff_files
+        zarr_path = temp_dir / "banded.zarr"
+
+        create_zarr_from_geotiffs(
+            output_zarr_path=zarr_path,
+            geotiff_paths=files,
+            species_codes=codes,
+            species_names=names,
+            chunk_size=chunk_size,
+            max_workers=2
+        )
+
+        root = zarr.open_group(str(zarr_path), mode='r')
+        expected = []
+        for path in files:
+            with rasterio.open(path) as src:
+                expected.append(src.read(1))
+
+        np.testing.assert_array_equal(root['biomass'][1:], np.stack(expected))
+
+        # The total is summed in layer order, so it matches bit for bit
+        total = np.zeros_like(root['biomass'][0])
+        for layer in expected:
+            total += layer
+        np.testing.assert_array_equal(root['biomass'][0], total)
+
+    def test_create_zarr_from_geotiffs_opens_each_raster_once(self, temp_dir: Path, geotiff_files):
+        """Test every GeoTIFF is opened once for validation and all bands."""
+        files, codes, names = geotiff_files
+
+        real_open = rasterio.open
+        with patch('bigmap.utils.zarr_utils.rasterio.open', side_effect=real_open) as mock_open:
+            create_zarr_from_geotiffs(
+                output_zarr_path=temp_dir / "once.zarr",
+                geotiff_paths=files,
+                species_codes=codes,
+                species_names=names,
+                chunk_size=(1, 24, 80),
+                max_workers=2
+            )
+
+        # One open for the reference metadata, then one per raster
+        assert mock_open.call_count == len(files) + 1
+
     def test_create_zarr_from_geotiffs_without_total(self, temp_dir: Path, geotiff_files):
         """Test creating zarr from geotiffs without total biomass."""
         files, codes, names = geotiff_files
@@ -762,6 +912,22 @@ class TestCreateZarrFromGeotiffs:
             )
 
 
+class TestGdalReadEnv:
+    """Test the GDAL environment used for ingestion reads."""
+
+    def test_env_options(self):
+        """Test threads are shared between readers, sidecar scans are disabled and the cache is left alone."""
+        from rasterio.env import getenv
+
+        with patch('bigmap.utils.zarr_utils.os.cpu_count', return_value=8):
+            with gdal_read_env(4):
+                options = getenv()
+
+        assert options['GDAL_NUM_THREADS'] == 2
+        assert options['GDAL_DISABLE_READDIR_ON_OPEN'] == 'EMPTY_DIR'
+        assert 'GDAL_CACHEMAX' not in options
+
+
 class TestValidateZarrStore:
     """Test the validate_zarr_store function."""
 
@@ -1131,4 +1297,4 @@ class TestSafeOpenZarrBiomass:
 
         # Should raise ValueError
         with pytest.raises(ValueError, match="Cannot open zarr store"):
-            safe_open_zarr_biomass(nonexistent_path)
\ No newline at end of file
+            safe_open_zarr_biomass(nonexistent_path)